@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark of the generation flow against the local fake chat UI.
+
+Starts benchmarks/fake_chat_server.py in a thread, runs the real main.py flow
+(ClaudeClient, pipeline, rendering) for a batch of keywords in a temporary
+workspace, and reports:
+
+- articles/hour over the whole batch
+- completion-detection latency: from the server closing the answer stream
+  to the client's generation span ending
+- time to first token as seen by the client
+- CPU and memory of the browser processes per tab (needs psutil, see
+  benchmarks/requirements.txt)
+
+for each browser mode given with --modes, side by side. By default all modes
+are compared when a display is available; without one the windowed
+"headed" mode (today's default) cannot run and is left out with a note.
+
+Usage:
+    python benchmarks/bench_end_to_end.py [--keywords 5] [--concurrency 1]
+        [--tokens-per-second 400] [--article-words 1500]
+        [--modes headed headless lean] [--capture-stream]
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+import main as blog_main
+from fake_chat_server import FakeChatServer
+from tracing import percentile
+
+console = Console()
+
+class BrowserSampler:
+    """Samples CPU and RSS of the browser processes started by this process."""
+
+    def __init__(self, interval: float = 0.5):
+        """
+        Initialize the sampler; it is inactive if psutil is not installed.
+
+        Args:
+            interval (float): Seconds between samples
+        """
+        self.interval = interval
+        self.rss_samples = []
+        self.cpu_samples = []
+        self._stop = threading.Event()
+        self._thread = None
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        self.psutil = psutil
+
+    def _browser_processes(self, known: dict):
+        """Return the browser child processes, reusing Process objects for CPU deltas."""
+        current = {}
+        for child in self.psutil.Process().children(recursive=True):
+            try:
+                if "chrom" in child.name().lower() or "headless_shell" in child.name().lower():
+                    current[child.pid] = known.get(child.pid, child)
+            except self.psutil.Error:
+                continue
+        return current
+
+    def _run(self):
+        """Sampling loop."""
+        known = {}
+        while not self._stop.wait(self.interval):
+            known = self._browser_processes(known)
+            rss = cpu = 0.0
+            for process in known.values():
+                try:
+                    rss += process.memory_info().rss
+                    cpu += process.cpu_percent(None)
+                except self.psutil.Error:
+                    continue
+            if known:
+                self.rss_samples.append(rss)
+                self.cpu_samples.append(cpu)
+
+    def start(self):
+        """Start sampling in a background thread."""
+        if self.psutil:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+def prepare_workspace(workspace: Path, keyword_count: int):
+    """Create the content folders main.py expects, with benchmark keywords."""
+    (workspace / "content" / "keywords").mkdir(parents=True)
+    (workspace / "content" / "keywords" / "keywords.txt").write_text(
+        "\n".join(f"benchmark keyword {i}" for i in range(1, keyword_count + 1)) + "\n", encoding="utf-8"
+    )
+    shutil.copytree(REPO_ROOT / "content" / "prompts", workspace / "content" / "prompts")
+    shutil.copytree(REPO_ROOT / "content" / "templates", workspace / "content" / "templates")
+
+def read_spans(trace_file: Path):
+    """Load the span records of the run."""
+    if not trace_file.exists():
+        return []
+    with open(trace_file, "r", encoding="utf-8") as f:
+        return [record for record in map(json.loads, f) if record.get("type") == "span"]
+
+# Browser modes that can be compared: today's windowed browser, plain headless, and lean
+MODES = {
+    "headed": [],
+    "headless": ["--headless"],
+    "lean": ["--lean"],
+}
+
+def has_display() -> bool:
+    """Whether a windowed browser can be opened (always on macOS and Windows)."""
+    if sys.platform in ("darwin", "win32"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+def default_modes() -> list:
+    """All modes, without headed when there is no display to open its window on."""
+    if has_display():
+        return list(MODES)
+    console.print("[yellow]No display found: leaving out the headed mode (today's default). "
+                  "Run under a display or xvfb-run to include it.[/yellow]")
+    return [mode for mode in MODES if mode != "headed"]
+
+def run_mode(args, mode: str) -> dict:
+    """Run the batch once in a fresh workspace and server, and collect the metrics."""
+    server = FakeChatServer(tokens_per_second=args.tokens_per_second, article_words=args.article_words)
+    server.start()
+    sampler = BrowserSampler()
+    original_cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(tmp)
+        prepare_workspace(workspace, args.keywords)
+        # main.py works with paths relative to the repository root
+        os.chdir(workspace)
+        try:
+            run_args = [
+                "--count", str(args.keywords),
+                "--concurrency", str(args.concurrency),
+                "--claude-url", server.project_url,
+                "--screenshots", "off",
+                "--trace-dir", str(workspace / "trace"),
+                "--no-generation-cache",
+            ] + MODES[mode]
+            if args.capture_stream:
+                run_args.append("--capture-stream")
+
+            console.print(f"[bold]Benchmarking mode: {mode}[/bold]")
+            sampler.start()
+            started = time.time()
+            asyncio.run(blog_main.main(blog_main.parse_args(run_args)))
+            wall = time.time() - started
+            sampler.stop()
+
+            spans = read_spans(workspace / "trace" / "spans.jsonl")
+            articles = len(list((workspace / "content" / "completed").glob("*/*.md")))
+        finally:
+            os.chdir(original_cwd)
+            server.stop()
+
+    finished_at = {
+        conversation.keyword: conversation.finished_at
+        for conversation in server.conversations.values() if conversation.finished_at
+    }
+    tabs = max(1, args.concurrency)
+    return {
+        "articles": articles,
+        "wall": wall,
+        "detection": [
+            span["start"] + span["seconds"] - finished_at[span["keyword"]]
+            for span in spans
+            if span["name"] == "generation" and span.get("keyword") in finished_at
+        ],
+        "ttft": [span["seconds"] for span in spans if span["name"] == "ttft"],
+        "rss_per_tab": max(sampler.rss_samples) / tabs if sampler.rss_samples else None,
+        "cpu_per_tab": sum(sampler.cpu_samples) / len(sampler.cpu_samples) / tabs if sampler.cpu_samples else None,
+        "psutil": sampler.psutil is not None,
+    }
+
+def main():
+    """Run the benchmark for each mode and print the results table."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--tokens-per-second", type=float, default=400)
+    parser.add_argument("--article-words", type=int, default=1500)
+    parser.add_argument(
+        "--modes", nargs="+", choices=list(MODES),
+        help="Browser modes to compare (default: all; headed needs a display)"
+    )
+    parser.add_argument("--capture-stream", action="store_true")
+    args = parser.parse_args()
+    if not args.modes:
+        args.modes = default_modes()
+    if "headed" in args.modes and not has_display():
+        console.print("[yellow]No display found; the headed mode will likely fail to start.[/yellow]")
+
+    results = {mode: run_mode(args, mode) for mode in args.modes}
+
+    def row(label, value):
+        table.add_row(label, *[value(result) for result in results.values()])
+
+    def seconds(values, fraction):
+        return f"{percentile(values, fraction):.2f}" if values else "-"
+
+    table = Table(title=f"End-to-end benchmark (fake chat UI, {args.keywords} keywords, "
+                        f"{args.concurrency} tabs, {args.tokens_per_second:.0f} tokens/s)")
+    table.add_column("Metric")
+    for mode in results:
+        table.add_column(mode, justify="right")
+    row("Articles saved", lambda r: str(r["articles"]))
+    row("Wall time (s)", lambda r: f"{r['wall']:.1f}")
+    row("Articles/hour", lambda r: f"{r['articles'] / r['wall'] * 3600:.1f}" if r["wall"] > 0 else "-")
+    row("Completion detection p50 (s)", lambda r: seconds(r["detection"], 0.5))
+    row("Completion detection p95 (s)", lambda r: seconds(r["detection"], 0.95))
+    row("Time to first token p50 (s)", lambda r: seconds(r["ttft"], 0.5))
+    sampled = all(result["psutil"] for result in results.values())
+    if sampled:
+        row("Browser RSS per tab, peak (MB)",
+            lambda r: f"{r['rss_per_tab'] / 1024 / 1024:.0f}" if r["rss_per_tab"] is not None else "-")
+        row("Browser CPU per tab, mean (%)",
+            lambda r: f"{r['cpu_per_tab']:.1f}" if r["cpu_per_tab"] is not None else "-")
+    else:
+        row("Browser CPU/RSS", lambda r: "needs psutil")
+    console.print(table)
+    if not sampled:
+        console.print("[yellow]Install the benchmark requirements for per-tab CPU and RSS: "
+                      "pip install -r benchmarks/requirements.txt[/yellow]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Check and benchmark the extraction of the newest assistant message.
+
+Loads the HTML fixtures in benchmarks/fixtures/chats/ (multi-turn chats saved
+in the chat UI's markup, each with a <name>.expected.txt holding the text of
+the newest answer) into Chromium with the page helpers installed, and compares
+the scoped lastAssistantMessage() helper and the previous lookup (the last
+non-empty response element on the page) against the expected text.
+
+It then loads synthetic conversations of growing length and times both
+lookups in the page, to show that the scoped one does not get slower as the
+conversation grows.
+
+Usage:
+    python benchmarks/bench_extraction.py [--turns 10 100 1000] [--repeat 200]
+"""
+import argparse
+import asyncio
+import html
+import sys
+import tempfile
+from pathlib import Path
+from playwright.async_api import async_playwright
+from rich.console import Console
+from rich.table import Table
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+from page_helpers import PAGE_HELPERS_JS
+
+console = Console()
+
+FIXTURES_DIR = REPO_ROOT / "benchmarks" / "fixtures" / "chats"
+
+# The lookup used before turns were scoped
+LEGACY_LOOKUP_JS = """
+() => {
+    const elements = document.querySelectorAll('.prose, .message-content, .claude-response');
+    for (let i = elements.length - 1; i >= 0; i--) {
+        if (elements[i].textContent.trim().length > 0) return elements[i].innerText;
+    }
+    return '';
+}
+"""
+
+# Mean milliseconds per call of a lookup, timed inside the page
+TIME_LOOKUP_JS = """
+([lookup, repeat]) => {
+    const fn = lookup === 'scoped'
+        ? () => window.__blogAutomation.lastAssistantMessage(true).text
+        : LEGACY;
+    fn();
+    const start = performance.now();
+    for (let i = 0; i < repeat; i++) fn();
+    return (performance.now() - start) / repeat;
+}
+""".replace("LEGACY", LEGACY_LOOKUP_JS.strip())
+
+# Appends one finished assistant turn, as the chat UI does after a reply
+APPEND_TURN_JS = """
+(text) => {
+    const turn = document.createElement('div');
+    turn.className = 'assistant-turn';
+    turn.setAttribute('data-is-streaming', 'false');
+    turn.innerHTML = '<div class="font-claude-message"><div class="prose"><p></p></div></div>';
+    turn.querySelector('p').textContent = text;
+    document.querySelector('.conversation').appendChild(turn);
+}
+"""
+
+def normalize(text: str) -> str:
+    """Collapse whitespace so innerText layout differences do not count."""
+    return " ".join((text or "").split())
+
+def synthetic_conversation(turns: int) -> str:
+    """A chat page with `turns` user/assistant exchanges and an artifact panel."""
+    parts = ['<!DOCTYPE html><html><head><meta charset="utf-8"></head><body><main><div class="conversation">']
+    for i in range(turns):
+        paragraphs = "".join(
+            f"<p>Absatz {j} der Antwort {i} über Immobilien und Finanzierung.</p>" for j in range(20)
+        )
+        parts.append(
+            f'<div class="user-turn" data-testid="user-message"><div class="font-user-message">'
+            f"<p>Frage {i}</p></div></div>"
+            f'<div class="assistant-turn" data-is-streaming="false"><div class="font-claude-message">'
+            f'<div class="prose"><h1>Antwort {i}</h1>{paragraphs}</div></div>'
+            f'<button data-testid="action-bar-copy" aria-label="Copy">Copy</button></div>'
+        )
+    parts.append(
+        f'</div><aside class="artifact-panel"><div class="prose"><p>{html.escape("Entwurf & Notizen")}</p>'
+        "</div></aside></main></body></html>"
+    )
+    return "".join(parts)
+
+async def check_fixtures(page) -> bool:
+    """Compare both lookups with each fixture's expected text; True if the scoped one is always right."""
+    table = Table(title="Extraction fixtures")
+    table.add_column("Fixture")
+    table.add_column("Scope")
+    table.add_column("Streaming")
+    table.add_column("Scoped", justify="center")
+    table.add_column("Previous lookup", justify="center")
+    all_ok = True
+    for fixture in sorted(FIXTURES_DIR.glob("*.html")):
+        expected = normalize(fixture.with_suffix(".expected.txt").read_text(encoding="utf-8"))
+        await page.goto(fixture.as_uri())
+        message = await page.evaluate("() => window.__blogAutomation.lastAssistantMessage(true)")
+        legacy = await page.evaluate(LEGACY_LOOKUP_JS)
+        scoped_ok = normalize(message["text"]) == expected
+        legacy_ok = normalize(legacy) == expected
+        all_ok = all_ok and scoped_ok
+        table.add_row(
+            fixture.stem, message["scope"], str(message["streaming"]),
+            "[green]ok[/green]" if scoped_ok else "[red]wrong[/red]",
+            "[green]ok[/green]" if legacy_ok else "[red]wrong[/red]",
+        )
+        if not scoped_ok:
+            console.print(f"[red]{fixture.stem}: got {normalize(message['text'])!r}, expected {expected!r}[/red]")
+    console.print(table)
+    return all_ok
+
+async def bench_scaling(page, turn_counts, repeat: int, workdir: Path):
+    """Time both lookups on conversations of growing length."""
+    table = Table(title=f"Newest-message lookup, mean of {repeat} calls")
+    table.add_column("Turns", justify="right")
+    table.add_column("Scoped (ms)", justify="right")
+    table.add_column("Previous (ms)", justify="right")
+    table.add_column("Page scans", justify="right")
+    table.add_column("Sees appended turn", justify="center")
+    for turns in turn_counts:
+        path = workdir / f"conversation_{turns}.html"
+        path.write_text(synthetic_conversation(turns), encoding="utf-8")
+        await page.goto(path.as_uri())
+        scoped = await page.evaluate(TIME_LOOKUP_JS, ["scoped", repeat])
+        legacy = await page.evaluate(TIME_LOOKUP_JS, ["legacy", repeat])
+        # A reply added after load must be picked up without another scan
+        await page.evaluate(APPEND_TURN_JS, "Neueste Antwort")
+        message = await page.evaluate("() => window.__blogAutomation.lastAssistantMessage(true)")
+        table.add_row(
+            str(turns), f"{scoped:.4f}", f"{legacy:.4f}", str(message["scans"]),
+            "yes" if normalize(message["text"]) == "Neueste Antwort" else "[red]no[/red]",
+        )
+    console.print(table)
+
+async def run(args) -> bool:
+    """Run the fixture check and the scaling benchmark in one headless browser."""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=True)
+        page = await browser.new_page()
+        await page.add_init_script(PAGE_HELPERS_JS)
+        try:
+            ok = await check_fixtures(page)
+            with tempfile.TemporaryDirectory() as workdir:
+                await bench_scaling(page, args.turns, args.repeat, Path(workdir))
+        finally:
+            await browser.close()
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark newest-message extraction")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Conversation lengths for the scaling benchmark")
+    parser.add_argument("--repeat", type=int, default=200, help="Lookups per measurement")
+    args = parser.parse_args()
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
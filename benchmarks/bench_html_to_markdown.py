@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the offline HTML-to-Markdown converter on the saved articles.
+
+The content/completed/*/*_temp.html files are the HTML shells the old PDF
+path wrote, with the article's Markdown as their body text. For each one the
+Markdown is rendered the way the chat UI shows an answer, placed in a chat
+page snapshot after an earlier turn, and converted back with:
+
+- html_to_markdown() with every available parser (lxml when installed,
+  html.parser always)
+- the previous fallback: the last `.prose` element's get_text(strip=True)
+
+It reports the time per conversion and how much of the article survives:
+the share of source lines reproduced and the headings, list items and table
+rows kept.
+
+Usage:
+    python benchmarks/bench_html_to_markdown.py [--repeat 50]
+"""
+import argparse
+import difflib
+import re
+import sys
+import time
+from pathlib import Path
+import markdown
+from bs4 import BeautifulSoup
+from rich.console import Console
+from rich.table import Table
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+import html_to_markdown as converter
+from article_renderer import MARKDOWN_EXTENSIONS
+
+console = Console()
+
+COMPLETED_DIR = REPO_ROOT / "content" / "completed"
+
+PAGE_TEMPLATE = """<!DOCTYPE html><html><head><meta charset="utf-8"><title>Claude</title></head><body>
+<main><div class="conversation">
+<div data-testid="user-message"><div class="font-user-message"><p>Schreibe einen Artikel.</p></div></div>
+<div data-is-streaming="false"><div class="font-claude-message"><div class="prose">
+<h1>Ein früherer Artikel</h1><p>Dieser Entwurf wurde in einer früheren Runde erzeugt.</p>
+</div></div><button aria-label="Copy">Copy</button></div>
+<div data-testid="user-message"><div class="font-user-message"><p>Und jetzt den nächsten.</p></div></div>
+<div data-is-streaming="false"><div class="font-claude-message"><div class="prose">
+{answer}
+</div></div><button aria-label="Copy">Copy</button></div>
+</div>
+<div contenteditable="true" class="ProseMirror"><p></p></div>
+</main></body></html>"""
+
+TABLE_SEPARATOR = re.compile(r"^:?-+:?$")
+
+def article_markdown(snapshot: Path) -> str:
+    """Markdown held as the body text of a saved _temp.html file."""
+    soup = BeautifulSoup(snapshot.read_text(encoding="utf-8"), "html.parser")
+    return "\n".join(line.strip() for line in soup.body.get_text().strip().split("\n"))
+
+def normalize_line(line: str) -> str:
+    """Compare lines independent of spacing and table separator widths."""
+    line = " ".join(line.split())
+    if line.startswith("|"):
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        cells = ["---" if TABLE_SEPARATOR.match(cell) else cell for cell in cells]
+        line = " | ".join(cells)
+    return line
+
+def lines_kept(source: str, result: str) -> float:
+    """Share of the source's non-empty lines that appear in the result, in order."""
+    expected = [normalize_line(line) for line in source.split("\n") if line.strip()]
+    actual = [normalize_line(line) for line in result.split("\n") if line.strip()]
+    matcher = difflib.SequenceMatcher(None, expected, actual, autojunk=False)
+    return sum(block.size for block in matcher.get_matching_blocks()) / len(expected)
+
+def structure(text: str) -> str:
+    """Headings / list items / table rows found in Markdown."""
+    lines = [line.strip() for line in text.split("\n")]
+    headings = sum(1 for line in lines if re.match(r"#{1,6} ", line))
+    items = sum(1 for line in lines if re.match(r"([-*+]|\d+\.) ", line))
+    rows = sum(1 for line in lines if line.startswith("|"))
+    return f"{headings}/{items}/{rows}"
+
+def legacy_fallback(page: str) -> str:
+    """The previous fallback: text of the last `.prose` element."""
+    soup = BeautifulSoup(page, "html.parser")
+    elements = soup.select(".message.assistant, .claude-response, .prose")
+    return elements[-1].get_text(strip=True) if elements else ""
+
+def time_call(function, repeat: int):
+    """Result of the last call and mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) * 1000 / repeat
+
+def available_parsers():
+    """Parsers html_to_markdown() can use here, the default one first."""
+    parsers = [converter.HTML_PARSER]
+    if converter.HTML_PARSER != "html.parser":
+        parsers.append("html.parser")
+    return parsers
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML-to-Markdown converter")
+    parser.add_argument("--repeat", type=int, default=50, help="Conversions per measurement")
+    args = parser.parse_args()
+
+    snapshots = sorted(COMPLETED_DIR.glob("*/*_temp.html"))
+    if not snapshots:
+        console.print(f"[bold red]No *_temp.html files under {COMPLETED_DIR}[/bold red]")
+        sys.exit(1)
+
+    table = Table(title=f"HTML to Markdown, mean of {args.repeat} conversions")
+    table.add_column("Article")
+    table.add_column("Method")
+    table.add_column("Snapshot (KB)", justify="right")
+    table.add_column("ms/convert", justify="right")
+    table.add_column("Lines kept", justify="right")
+    table.add_column("Headings/items/rows", justify="right")
+    default_parser = converter.HTML_PARSER
+    try:
+        for snapshot in snapshots:
+            source = article_markdown(snapshot)
+            page = PAGE_TEMPLATE.format(answer=markdown.markdown(source, extensions=MARKDOWN_EXTENSIONS))
+            size = f"{len(page.encode('utf-8')) / 1024:.1f}"
+            name = snapshot.parent.name
+            table.add_row(name, "source", size, "", "100.0%", structure(source))
+            for html_parser in available_parsers():
+                converter.HTML_PARSER = html_parser
+                result, ms = time_call(lambda: converter.html_to_markdown(page), args.repeat)
+                table.add_row(
+                    name, f"html_to_markdown ({html_parser})", size, f"{ms:.2f}",
+                    f"{lines_kept(source, result) * 100:.1f}%", structure(result),
+                )
+            result, ms = time_call(lambda: legacy_fallback(page), args.repeat)
+            table.add_row(
+                name, "previous get_text", size, f"{ms:.2f}",
+                f"{lines_kept(source, result) * 100:.1f}%", structure(result),
+            )
+    finally:
+        converter.HTML_PARSER = default_parser
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
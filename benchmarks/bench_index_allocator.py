@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the output index allocator with many existing article folders.
+
+Creates a corpus of empty {index}_{keyword} folders (50k by default), then
+compares the old directory scan of FileManager.get_next_index() with
+IndexAllocator.allocate(). It also starts several processes that allocate
+concurrently and checks that no index was handed out twice.
+
+Usage:
+    python benchmarks/bench_index_allocator.py [--folders 50000] [--processes 4]
+"""
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from index_allocator import IndexAllocator
+
+console = Console()
+
+def legacy_next_index(root: Path) -> int:
+    """The previous implementation: scan every folder and return max + 1."""
+    indices = []
+    for dir_path in [d for d in root.iterdir() if d.is_dir()]:
+        index_str = dir_path.name.split('_')[0]
+        if index_str.isdigit():
+            indices.append(int(index_str))
+    return max(indices, default=0) + 1
+
+def allocate_many(root: str, count: int, results):
+    """Worker process: allocate `count` indices and report them."""
+    allocator = IndexAllocator(Path(root))
+    results.extend([allocator.allocate("concurrent")[0] for _ in range(count)])
+
+def main():
+    """Build the corpus, run the measurements and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folders", type=int, default=50000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--per-process", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        console.print(f"[yellow]Creating {args.folders:,} folders...[/yellow]")
+        for index in range(1, args.folders + 1):
+            (root / f"{index}_keyword_{index}").mkdir()
+
+        start = time.perf_counter()
+        legacy_next_index(root)
+        legacy = time.perf_counter() - start
+
+        allocator = IndexAllocator(root)
+        start = time.perf_counter()
+        first_index, _ = allocator.allocate("seed")
+        seed = time.perf_counter() - start
+
+        repeat = 1000
+        start = time.perf_counter()
+        for _ in range(repeat):
+            allocator.allocate("bench")
+        allocate = (time.perf_counter() - start) / repeat
+
+        with multiprocessing.Manager() as manager:
+            results = manager.list()
+            workers = [
+                multiprocessing.Process(target=allocate_many, args=(tmp, args.per_process, results))
+                for _ in range(args.processes)
+            ]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            concurrent = time.perf_counter() - start
+            indices = list(results)
+
+    table = Table(title=f"Index allocation with {args.folders:,} existing folders")
+    table.add_column("Measurement")
+    table.add_column("Result", justify="right")
+    table.add_row("Legacy directory scan", f"{legacy * 1000:.1f} ms")
+    table.add_row("First allocation (seeds counter)", f"{seed * 1000:.1f} ms (index {first_index})")
+    table.add_row("Allocation", f"{allocate * 1e6:.0f} µs")
+    table.add_row(
+        f"{args.processes} processes x {args.per_process} allocations",
+        f"{concurrent:.2f} s, {len(indices)} indices, {len(indices) - len(set(indices))} duplicates",
+    )
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for KeywordManager at 10k, 100k and 1M keywords.
+
+Half of the keywords are marked as processed up front. The benchmark measures
+the first index load, repeated get_next_keyword() calls and incremental
+mark_processed() calls. For the smallest size it also runs the old list-based
+lookup for comparison.
+
+Usage:
+    python benchmarks/bench_keyword_manager.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from keyword_manager import KeywordManager
+
+console = Console()
+
+def write_corpus(directory: Path, size: int) -> Path:
+    """Create a keywords file with `size` keywords, half of them processed."""
+    keywords = [f"immobilien keyword {i}" for i in range(size)]
+    keywords_file = directory / "keywords.txt"
+    keywords_file.write_text("\n".join(keywords) + "\n", encoding="utf-8")
+    (directory / "processed_keywords.txt").write_text(
+        "\n".join(keywords[: size // 2]) + "\n", encoding="utf-8"
+    )
+    return keywords_file
+
+def legacy_next_keyword(keywords_file: Path):
+    """The previous implementation: re-read both files and scan a list."""
+    with open(keywords_file, "r", encoding="utf-8") as f:
+        all_keywords = [line.strip() for line in f.readlines() if line.strip()]
+    with open(keywords_file.parent / "processed_keywords.txt", "r", encoding="utf-8") as f:
+        processed = [line.strip() for line in f.readlines() if line.strip()]
+    for keyword in all_keywords:
+        if keyword not in processed:
+            return keyword
+    return None
+
+def timed(func, repeat: int = 1) -> float:
+    """Return the average seconds per call of func."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+def bench_size(size: int, table: Table):
+    """Run all measurements for one corpus size and add them to the table."""
+    with tempfile.TemporaryDirectory() as tmp:
+        keywords_file = write_corpus(Path(tmp), size)
+        manager = KeywordManager(keywords_file)
+
+        load = timed(manager.get_next_keyword)
+        next_call = timed(manager.get_next_keyword, repeat=1000)
+
+        def mark_next():
+            manager.mark_processed(manager.get_next_keyword())
+        mark = timed(mark_next, repeat=1000)
+
+        legacy = "-"
+        if size <= 10000:
+            legacy = f"{timed(lambda: legacy_next_keyword(keywords_file)) * 1000:.1f}"
+
+        table.add_row(
+            f"{size:,}", f"{load * 1000:.1f}", f"{next_call * 1e6:.1f}",
+            f"{mark * 1e6:.1f}", legacy,
+        )
+
+def main():
+    """Parse options and print the benchmark table."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    table = Table(title="KeywordManager benchmark")
+    table.add_column("Keywords", justify="right")
+    table.add_column("First load (ms)", justify="right")
+    table.add_column("get_next_keyword (µs)", justify="right")
+    table.add_column("mark_processed + next (µs)", justify="right")
+    table.add_column("Legacy next (ms)", justify="right")
+    for size in args.sizes:
+        bench_size(size, table)
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
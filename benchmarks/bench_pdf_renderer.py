@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for PDF rendering: wkhtmltopdf (pdfkit) versus headless Chromium.
+
+Renders the saved articles in content/completed several times with each
+backend into a temporary directory and reports seconds per article. A backend
+whose dependency is missing (wkhtmltopdf binary or Playwright Chromium) is
+reported as skipped.
+
+Usage:
+    python benchmarks/bench_pdf_renderer.py [--repeat 10]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from file_manager import FileManager
+from pdf_renderer import ChromiumPdfRenderer
+
+console = Console()
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "content" / "completed"
+
+def articles():
+    """Markdown files of the saved articles, excluding checkpoints."""
+    return [path for path in sorted(CORPUS_DIR.glob("*/*.md")) if not path.name.endswith(".partial.md")]
+
+def bench_pdfkit(file_manager: FileManager, jobs):
+    """Render every job with wkhtmltopdf, one process per article."""
+    for markdown_path, output_dir, keyword in jobs:
+        if not file_manager.save_as_pdf(markdown_path, output_dir, keyword):
+            raise RuntimeError("wkhtmltopdf rendering failed")
+
+async def bench_chromium(file_manager: FileManager, jobs):
+    """Render every job in one long-lived headless Chromium page."""
+    file_manager.pdf_renderer = ChromiumPdfRenderer()
+    try:
+        await file_manager.pdf_renderer.start()
+        for markdown_path, output_dir, keyword in jobs:
+            if not await file_manager.render_pdf(markdown_path, output_dir, keyword):
+                raise RuntimeError("Chromium rendering failed")
+    finally:
+        await file_manager.pdf_renderer.close()
+        file_manager.pdf_renderer = None
+
+def main():
+    """Run both backends and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Renders per article and backend")
+    args = parser.parse_args()
+
+    sources = articles()
+    if not sources:
+        console.print(f"[bold red]No articles found in {CORPUS_DIR}[/bold red]")
+        return
+
+    table = Table(title=f"PDF rendering, {len(sources)} article(s) x {args.repeat}")
+    table.add_column("Backend")
+    table.add_column("Total (s)", justify="right")
+    table.add_column("Per article (ms)", justify="right")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        file_manager = FileManager(Path(tmp))
+        jobs = []
+        for round_number in range(args.repeat):
+            for markdown_path in sources:
+                output_dir = Path(tmp) / f"{round_number}_{markdown_path.parent.name}"
+                output_dir.mkdir()
+                jobs.append((markdown_path, output_dir, markdown_path.stem.replace("_", " ")))
+
+        for name, run in (
+            ("pdfkit (wkhtmltopdf)", lambda: bench_pdfkit(file_manager, jobs)),
+            ("Chromium (page.pdf)", lambda: asyncio.run(bench_chromium(file_manager, jobs))),
+        ):
+            start = time.perf_counter()
+            try:
+                run()
+            except Exception as e:
+                table.add_row(name, "skipped", str(e).splitlines()[0][:60])
+                continue
+            total = time.perf_counter() - start
+            table.add_row(name, f"{total:.2f}", f"{total / len(jobs) * 1000:.0f}")
+
+    console.print(table)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Claude chat UI, for offline benchmarks.
+
+Serves the parts of the UI that ClaudeClient relies on: a project page with a
+contenteditable input, conversations under /chat/<id>, an assistant message
+(.prose) streamed token by token from a server-sent completion endpoint at a
+configurable rate, a Stop button and data-is-streaming flag while the answer
+is written, and a Copy button when it is finished. Images and a web font give
+the page some weight, so lean mode's resource blocking shows up in the numbers.
+
+Usage:
+    python benchmarks/fake_chat_server.py [--port 8765] [--tokens-per-second 400]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+PAGE_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<title>Fake Claude</title>
+<style>
+    @font-face { font-family: "Fake Sans"; src: url("/assets/fake-sans.woff2") format("woff2"); }
+    body { font-family: "Fake Sans", sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
+    .user-turn { background: #f2f2f2; padding: 8px; margin: 12px 0; white-space: pre-wrap; max-height: 6em; overflow: hidden; }
+    .prose { white-space: pre-wrap; }
+    .composer [contenteditable] { border: 1px solid #ccc; min-height: 3em; padding: 8px; }
+</style>
+</head>
+<body>
+<img class="banner" src="/assets/banner.png" alt="" width="800" height="120">
+<div id="conversation"></div>
+<div class="composer">
+    <div contenteditable="true" role="textbox" aria-label="Write your prompt to Claude" class="ProseMirror"></div>
+</div>
+<script>
+const conversation = document.getElementById('conversation');
+const input = document.querySelector('.composer [contenteditable]');
+
+function addUserTurn(text) {
+    const turn = document.createElement('div');
+    turn.className = 'user-turn';
+    turn.setAttribute('data-testid', 'user-message');
+    turn.textContent = text;
+    conversation.appendChild(turn);
+}
+
+function addAssistantTurn() {
+    const message = document.createElement('div');
+    message.className = 'assistant-turn';
+    message.setAttribute('data-is-streaming', 'true');
+    const avatar = document.createElement('img');
+    avatar.src = `/assets/avatar.png?${conversation.children.length}`;
+    avatar.width = 32;
+    message.appendChild(avatar);
+    const prose = document.createElement('div');
+    prose.className = 'prose';
+    message.appendChild(prose);
+    const stop = document.createElement('button');
+    stop.setAttribute('aria-label', 'Stop response');
+    stop.textContent = 'Stop';
+    message.appendChild(stop);
+    conversation.appendChild(message);
+    return { message, prose, stop };
+}
+
+function finishAssistantTurn(turn, text) {
+    turn.message.setAttribute('data-is-streaming', 'false');
+    turn.stop.remove();
+    const copy = document.createElement('button');
+    copy.setAttribute('data-testid', 'action-bar-copy');
+    copy.setAttribute('aria-label', 'Copy');
+    copy.textContent = 'Copy';
+    copy.addEventListener('click', () => navigator.clipboard.writeText(text).catch(() => {}));
+    turn.message.appendChild(copy);
+}
+
+async function streamAnswer(id, turn) {
+    const response = await fetch(`/api/organizations/local/chat_conversations/${id}/completion`, { method: 'POST' });
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '', text = '';
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let end;
+        while ((end = buffer.indexOf('\\n\\n')) >= 0) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            for (const line of block.split('\\n')) {
+                if (!line.startsWith('data:')) continue;
+                const event = JSON.parse(line.slice(5));
+                if (event.type === 'content_block_delta') {
+                    text += event.delta.text;
+                    turn.prose.textContent = text;
+                }
+            }
+        }
+    }
+    finishAssistantTurn(turn, text);
+}
+
+async function send() {
+    const prompt = input.innerText.trim();
+    if (!prompt) return;
+    input.innerHTML = '';
+    const response = await fetch('/api/chat_conversations', { method: 'POST', body: JSON.stringify({ prompt }) });
+    const { id } = await response.json();
+    history.pushState({}, '', `/chat/${id}`);
+    addUserTurn(prompt);
+    await streamAnswer(id, addAssistantTurn());
+}
+
+input.addEventListener('keydown', (event) => {
+    if (event.key === 'Enter' && !event.shiftKey) {
+        event.preventDefault();
+        send();
+    }
+});
+
+// Reopened conversation: show the answer, following it until it is finished
+async function loadConversation(id) {
+    let state = await (await fetch(`/api/chat_conversations/${id}`)).json();
+    addUserTurn(state.prompt);
+    const turn = addAssistantTurn();
+    while (true) {
+        turn.prose.textContent = state.text;
+        if (state.finished) break;
+        await new Promise((resolve) => setTimeout(resolve, 500));
+        state = await (await fetch(`/api/chat_conversations/${id}`)).json();
+    }
+    finishAssistantTurn(turn, state.text);
+}
+
+const match = location.pathname.match(/^\\/chat\\/([^/]+)/);
+if (match) loadConversation(match[1]);
+</script>
+</body>
+</html>
+"""
+
+# Keyword line of the default prompt template
+KEYWORD_PATTERN = re.compile(r'Hauptstichwort = "([^"]+)"')
+
+# Static assets giving the page some weight, like the real UI's images and web fonts
+ASSETS = {
+    "banner.png": ("image/png", 300 * 1024),
+    "avatar.png": ("image/png", 40 * 1024),
+    "fake-sans.woff2": ("font/woff2", 120 * 1024),
+}
+
+# Stream granularity: tokens are sent in batches at this interval
+TICK_SECONDS = 0.05
+
+def synthetic_article(keyword: str, words: int) -> str:
+    """Build a markdown article of roughly `words` words with headings and a table."""
+    sentence = f"Dieser Abschnitt beschreibt {keyword} mit Zahlen, Beispielen und Hinweisen für Anleger."
+    sentence_words = len(sentence.split())
+    parts = [f"# {keyword.title()}: Ein Überblick\n"]
+    written = 0
+    section = 1
+    while written < words:
+        parts.append(f"\n## Abschnitt {section}\n")
+        paragraph = " ".join([sentence] * 6)
+        parts.append(f"\n{paragraph}\n")
+        written += sentence_words * 6
+        if section % 3 == 0:
+            parts.append("\n| Kennzahl | Wert |\n|---|---|\n| Rendite | 3,1 % |\n| Laufzeit | 10 Jahre |\n")
+        section += 1
+    return "".join(parts)
+
+def tokenize(text: str):
+    """Split text into word-sized tokens that keep their whitespace."""
+    return re.findall(r"\s*\S+\s*", text) or [text]
+
+class Conversation:
+    """One chat: the prompt, the answer and when it was streamed."""
+
+    def __init__(self, prompt: str, answer: str):
+        self.id = str(uuid.uuid4())
+        self.prompt = prompt
+        self.keyword = (KEYWORD_PATTERN.search(prompt) or re.match(r"(.*)", prompt)).group(1).strip()
+        self.answer = answer
+        self.streamed = ""
+        self.created_at = time.time()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+class FakeChatServer:
+    """Threaded HTTP server that plays the chat UI."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, tokens_per_second: float = 400,
+                 article_words: int = 1500, article_text: Optional[str] = None):
+        """
+        Initialize the server.
+
+        Args:
+            host (str): Interface to listen on
+            port (int): Port (0 picks a free one)
+            tokens_per_second (float): Streaming rate of the answers
+            article_words (int): Length of the synthetic articles
+            article_text (str, optional): Fixed markdown answer for every prompt
+        """
+        self.tokens_per_second = tokens_per_second
+        self.article_words = article_words
+        self.article_text = article_text
+        self.conversations: Dict[str, Conversation] = {}
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def project_url(self) -> str:
+        """URL to pass to ClaudeClient as the project page."""
+        return f"{self.base_url}/project/local-benchmark"
+
+    def start(self):
+        """Serve in a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fake-chat-server", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop serving."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def create_conversation(self, prompt: str) -> Conversation:
+        """Start a conversation and decide its answer."""
+        conversation = Conversation(prompt, "")
+        conversation.answer = self.article_text or synthetic_article(conversation.keyword, self.article_words)
+        with self.lock:
+            self.conversations[conversation.id] = conversation
+        return conversation
+
+    def _handler_class(self):
+        """Request handler bound to this server instance."""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, payload: dict, status: int = 200):
+                self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+            def do_GET(self):
+                path = urlsplit(self.path).path
+                if path == "/" or path.startswith("/project/") or path.startswith("/chat/"):
+                    self._send(200, PAGE_HTML.encode("utf-8"), "text/html; charset=utf-8")
+                    return
+                if path.startswith("/assets/") and path[len("/assets/"):] in ASSETS:
+                    content_type, size = ASSETS[path[len("/assets/"):]]
+                    self._send(200, bytes(size), content_type)
+                    return
+                match = re.fullmatch(r"/api/chat_conversations/([^/]+)", path)
+                conversation = server.conversations.get(match.group(1)) if match else None
+                if conversation:
+                    self._json({
+                        "prompt": conversation.prompt,
+                        "text": conversation.streamed,
+                        "finished": conversation.finished_at is not None,
+                    })
+                    return
+                self._send(404, b"not found", "text/plain")
+
+            def do_POST(self):
+                path = urlsplit(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if path == "/api/chat_conversations":
+                    prompt = json.loads(body or b"{}").get("prompt", "")
+                    self._json({"id": server.create_conversation(prompt).id})
+                    return
+                match = re.fullmatch(r"/api/organizations/[^/]+/chat_conversations/([^/]+)/completion", path)
+                conversation = server.conversations.get(match.group(1)) if match else None
+                if conversation:
+                    self._stream(conversation)
+                    return
+                self._send(404, b"not found", "text/plain")
+
+            def _stream(self, conversation: Conversation):
+                """Send the answer as server-sent events at the configured token rate."""
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                tokens = tokenize(conversation.answer)
+                per_tick = max(1, int(server.tokens_per_second * TICK_SECONDS))
+                try:
+                    for start in range(0, len(tokens), per_tick):
+                        text = "".join(tokens[start:start + per_tick])
+                        event = {"type": "content_block_delta", "index": 0,
+                                 "delta": {"type": "text_delta", "text": text}}
+                        self.wfile.write(f"event: content_block_delta\ndata: {json.dumps(event)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                        conversation.streamed += text
+                        if conversation.first_token_at is None:
+                            conversation.first_token_at = time.time()
+                        time.sleep(TICK_SECONDS)
+                    self.wfile.write(b'event: message_stop\ndata: {"type": "message_stop"}\n\n')
+                    self.wfile.flush()
+                finally:
+                    conversation.finished_at = time.time()
+                self.close_connection = True
+
+        return Handler
+
+def main():
+    """Run the server in the foreground."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tokens-per-second", type=float, default=400)
+    parser.add_argument("--article-words", type=int, default=1500)
+    args = parser.parse_args()
+
+    server = FakeChatServer(args.host, args.port, args.tokens_per_second, args.article_words)
+    print(f"Fake chat UI at {server.project_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
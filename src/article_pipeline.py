@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Article pipeline for the BlogAutomation2 project.
+Moves downloaded articles through persistence, PDF rendering and bookkeeping
+stages connected by bounded queues, so the browser can start the next keyword
+while earlier articles are still being rendered.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+from batch_stats import BatchStats
+from file_manager import FileManager, render_pdf_in_worker
+from generation_cache import GenerationCache
+from job_checkpoint import JobCheckpoint
+from keyword_manager import KeywordManager
+from tracing import tracer
+from rich.console import Console
+
+console = Console()
+
+# A queued article: its checkpoint and the markdown file that was saved
+PipelineItem = Tuple[JobCheckpoint, Path]
+
+class ArticlePipeline:
+    """Staged, back-pressured post-processing of generated articles."""
+
+    def __init__(self, file_manager: FileManager, keyword_manager: KeywordManager, stats: BatchStats,
+                 render_workers: Optional[int] = None, queue_size: Optional[int] = None,
+                 generation_cache: Optional[GenerationCache] = None, project: str = ""):
+        """
+        Initialize the pipeline.
+
+        Args:
+            file_manager (FileManager): Used to render PDFs
+            keyword_manager (KeywordManager): Used to record job states and mark keywords processed
+            stats (BatchStats): Collector for per-phase timings
+            render_workers (int, optional): wkhtmltopdf worker processes (default: CPU count)
+            queue_size (int, optional): Capacity of each stage queue; submit() waits
+                when it is full (default: twice the render workers)
+            generation_cache (GenerationCache, optional): Stores every saved article
+            project (str): Claude project the articles are generated in (part of the cache key)
+        """
+        self.file_manager = file_manager
+        self.keyword_manager = keyword_manager
+        self.stats = stats
+        self.generation_cache = generation_cache
+        self.project = project
+        self.render_workers = max(1, render_workers or os.cpu_count() or 1)
+        self.queue_size = max(1, queue_size or 2 * self.render_workers)
+        self.persist_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.render_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.bookkeeping_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """
+        Start the stage tasks.
+
+        Call after the PDF backend is chosen: wkhtmltopdf renders run in a
+        process pool, the Chromium renderer has a single page and runs in the loop.
+        """
+        if self._tasks:
+            return
+        renderers = 1
+        if not self.file_manager.pdf_renderer:
+            # Spawned rather than forked: the parent runs Playwright threads and an event loop
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.render_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            renderers = self.render_workers
+
+        self._tasks.append(asyncio.create_task(self._persist_stage()))
+        for _ in range(renderers):
+            self._tasks.append(asyncio.create_task(self._render_stage()))
+        self._tasks.append(asyncio.create_task(self._bookkeeping_stage()))
+        console.print(f"[green]Article pipeline ready with {renderers} renderer(s)[/green]")
+
+    async def submit(self, checkpoint: JobCheckpoint, markdown_path: Path):
+        """
+        Hand a downloaded article to the pipeline.
+
+        Waits while the first stage is full, which slows generation down to
+        the speed rendering can keep up with.
+        """
+        await self.persist_queue.put((checkpoint, markdown_path))
+
+    def _fail(self, checkpoint: JobCheckpoint, error: str):
+        """Record an article that was downloaded but could not finish the pipeline."""
+        self.stats.record_pipeline_failure(checkpoint.keyword, error)
+        try:
+            self.keyword_manager.mark_failed(checkpoint.keyword, error)
+        except Exception as e:
+            console.print(f"[yellow]Could not record the failure of '{checkpoint.keyword}': {str(e)}[/yellow]")
+
+    async def _persist_stage(self):
+        """Close the job checkpoint, cache the article and record the download."""
+        while True:
+            checkpoint, markdown_path = await self.persist_queue.get()
+            try:
+                if self.generation_cache and checkpoint.template_hash:
+                    try:
+                        self.generation_cache.put(
+                            checkpoint.keyword, checkpoint.template_hash, self.project,
+                            markdown_path.read_text(encoding="utf-8"),
+                            conversation_url=checkpoint.conversation_url,
+                        )
+                    except Exception as e:
+                        # The saved markdown is what gets rendered; the cache is only an optimization
+                        console.print(f"[yellow]Could not cache '{checkpoint.keyword}': {str(e)}[/yellow]")
+                checkpoint.complete()
+                self.keyword_manager.mark_state(checkpoint.keyword, "downloaded")
+                await self.render_queue.put((checkpoint, markdown_path))
+            except Exception as e:
+                console.print(f"[bold red]Error persisting '{checkpoint.keyword}': {str(e)}[/bold red]")
+                self._fail(checkpoint, f"persist failed: {str(e)}")
+            finally:
+                self.persist_queue.task_done()
+
+    async def _render(self, item: PipelineItem) -> Optional[Path]:
+        """Render one PDF in the process pool or with the Chromium renderer."""
+        checkpoint, markdown_path = item
+        if self.executor:
+            loop = asyncio.get_running_loop()
+            # FileManager.render_pdf() traces itself; the worker process is timed from here
+            with tracer.span("pdf_render"):
+                return await loop.run_in_executor(
+                    self.executor, render_pdf_in_worker,
+                    self.file_manager.output_dir, markdown_path, checkpoint.output_dir, checkpoint.keyword,
+                )
+        return await self.file_manager.render_pdf(markdown_path, checkpoint.output_dir, checkpoint.keyword)
+
+    async def _render_stage(self):
+        """Render PDFs; a failed PDF does not fail the keyword since the markdown is saved."""
+        while True:
+            item = await self.render_queue.get()
+            try:
+                with tracer.keyword(item[0].keyword), self.stats.phase("pdf"):
+                    pdf_path = await self._render(item)
+                if pdf_path:
+                    console.print(f"[bold green]✓[/bold green] PDF saved as: {pdf_path}")
+                else:
+                    console.print("[yellow]PDF generation failed, but markdown was saved successfully.[/yellow]")
+            except Exception as e:
+                console.print(f"[yellow]PDF generation error: {str(e)}. Markdown still saved successfully.[/yellow]")
+            try:
+                await self.bookkeeping_queue.put(item)
+            finally:
+                self.render_queue.task_done()
+
+    async def _bookkeeping_stage(self):
+        """Mark rendered keywords as processed."""
+        while True:
+            checkpoint, _ = await self.bookkeeping_queue.get()
+            keyword = checkpoint.keyword
+            try:
+                self.keyword_manager.mark_state(keyword, "rendered")
+                self.keyword_manager.mark_processed(keyword)
+                console.print(f"[green]Marked keyword '[bold]{keyword}[/bold]' as processed.[/green]")
+            except Exception as e:
+                console.print(f"[bold red]Error marking '{keyword}' as processed: {str(e)}[/bold red]")
+                self._fail(checkpoint, f"bookkeeping failed: {str(e)}")
+            finally:
+                self.bookkeeping_queue.task_done()
+
+    async def close(self):
+        """Finish every queued article, then stop the stages and the process pool."""
+        try:
+            if self._tasks:
+                await self.persist_queue.join()
+                await self.render_queue.join()
+                await self.bookkeeping_queue.join()
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            if self.executor:
+                self.executor.shutdown(wait=True)
+                self.executor = None
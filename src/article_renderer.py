@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Article renderer for the BlogAutomation2 project.
+Turns article markdown into the HTML page used for PDFs and caches the result
+under a hash of everything that affects the output.
+"""
+import hashlib
+import html
+import os
+from pathlib import Path
+from string import Template
+from typing import Optional
+import markdown
+from rich.console import Console
+
+console = Console()
+
+# Bump when the markdown extensions or the rendering code change the output
+RENDERER_VERSION = "1"
+
+MARKDOWN_EXTENSIONS = ["tables", "toc", "fenced_code", "sane_lists"]
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "content" / "templates"
+
+class ArticleRenderer:
+    """Renders markdown articles to HTML through a content-addressed cache."""
+
+    def __init__(self, template_path: Path = TEMPLATES_DIR / "article.html",
+                 css_path: Path = TEMPLATES_DIR / "article.css",
+                 cache_dir: Optional[Path] = Path("cache/render")):
+        """
+        Load the page template and stylesheet.
+
+        Args:
+            template_path (Path): HTML template with $title, $css, $body and
+                optionally $toc placeholders
+            css_path (Path): Stylesheet inlined into the page
+            cache_dir (Path, optional): Where rendered HTML is cached (None disables caching)
+        """
+        self.template_text = template_path.read_text(encoding="utf-8")
+        self.template = Template(self.template_text)
+        self.css = css_path.read_text(encoding="utf-8")
+        self.cache_dir = cache_dir
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def render_key(self, markdown_text: str, title: str) -> str:
+        """
+        Hash every input of a render: markdown, title, template, CSS and renderer version.
+
+        Outputs recorded with this key only need re-rendering when it changes.
+        """
+        digest = hashlib.sha256()
+        for part in (RENDERER_VERSION, self.template_text, self.css, title, markdown_text):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _cache_path(self, key: str) -> Path:
+        """Location of a cached render, sharded by the first two hex digits."""
+        return self.cache_dir / key[:2] / f"{key}.html"
+
+    def _convert(self, markdown_text: str, title: str) -> str:
+        """Convert markdown to a complete HTML page."""
+        converter = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS)
+        body = converter.convert(markdown_text)
+        return self.template.safe_substitute(
+            title=html.escape(title), css=self.css, body=body, toc=converter.toc
+        )
+
+    def render_html(self, markdown_text: str, title: str) -> str:
+        """
+        Render an article to HTML, reusing a cached render when the inputs are unchanged.
+
+        Args:
+            markdown_text (str): Article markdown
+            title (str): Page title (usually the keyword)
+
+        Returns:
+            str: Complete HTML document
+        """
+        if self.cache_dir is None:
+            return self._convert(markdown_text, title)
+
+        key = self.render_key(markdown_text, title)
+        cache_path = self._cache_path(key)
+        try:
+            page = cache_path.read_text(encoding="utf-8")
+            self.cache_hits += 1
+            return page
+        except FileNotFoundError:
+            pass
+
+        self.cache_misses += 1
+        page = self._convert(markdown_text, title)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(page, encoding="utf-8")
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            console.print(f"[yellow]Could not cache rendered HTML: {str(e)}[/yellow]")
+        return page
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Batch statistics for the BlogAutomation2 project.
+Collects per-phase timings and outcomes so a batch run can report throughput.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Set, Tuple
+from tracing import tracer
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+class BatchStats:
+    """Tracks timings and results for every keyword processed in a batch."""
+
+    def __init__(self):
+        """Initialize empty statistics and start the batch clock."""
+        self.started_at = time.time()
+        self.phase_totals: Dict[str, float] = defaultdict(float)
+        self.phase_counts: Dict[str, int] = defaultdict(int)
+        self.succeeded: List[str] = []
+        self.failed: List[Tuple[str, str]] = []
+        # Keywords that failed in the article pipeline after generation finished
+        self.pipeline_failures: Set[str] = set()
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block of work and add it to the totals of the given phase.
+
+        Args:
+            name (str): Phase name (e.g., "generation")
+        """
+        phase_start = time.time()
+        try:
+            with tracer.span(f"main.{name}"):
+                yield
+        finally:
+            self.add_phase_time(name, time.time() - phase_start)
+
+    def add_phase_time(self, name: str, seconds: float):
+        """Add a measured duration to the totals of the given phase."""
+        self.phase_totals[name] += seconds
+        self.phase_counts[name] += 1
+
+    def record_result(self, keyword: str, success: bool, error: Optional[str] = None):
+        """Record whether a keyword was processed successfully."""
+        if success:
+            if keyword not in self.pipeline_failures:
+                self.succeeded.append(keyword)
+        else:
+            self.failed.append((keyword, error or "unknown error"))
+
+    def record_pipeline_failure(self, keyword: str, error: str):
+        """
+        Count a keyword as failed because a pipeline stage failed after its download.
+
+        The pipeline may get there before or after the generating tab records
+        the keyword's success; either way it ends up counted as failed only.
+        """
+        self.pipeline_failures.add(keyword)
+        if keyword in self.succeeded:
+            self.succeeded.remove(keyword)
+        self.failed.append((keyword, error))
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the batch started."""
+        return time.time() - self.started_at
+
+    def articles_per_hour(self) -> float:
+        """Completed articles per hour of wall-clock time."""
+        if self.elapsed <= 0:
+            return 0.0
+        return len(self.succeeded) * 3600 / self.elapsed
+
+    def print_summary(self):
+        """Print a throughput summary and a per-phase timing table."""
+        processed = len(self.succeeded) + len(self.failed)
+        console.print(f"\n[bold blue]Batch summary:[/bold blue] {processed} keyword(s) in {self.elapsed / 60:.1f} min")
+        console.print(f"[green]Succeeded: {len(self.succeeded)}[/green]  [red]Failed: {len(self.failed)}[/red]")
+        console.print(f"[blue]Throughput: {self.articles_per_hour():.1f} articles/hour[/blue]")
+
+        if self.phase_totals:
+            table = Table(title="Time per phase")
+            table.add_column("Phase")
+            table.add_column("Runs", justify="right")
+            table.add_column("Total (s)", justify="right")
+            table.add_column("Average (s)", justify="right")
+            for name, total in self.phase_totals.items():
+                count = self.phase_counts[name]
+                table.add_row(name, str(count), f"{total:.1f}", f"{total / count:.1f}")
+            console.print(table)
+
+        for keyword, error in self.failed:
+            console.print(f"[red]✗ {keyword}: {error}[/red]")
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Browser daemon for the BlogAutomation2 project.
+Keeps one authenticated Chromium (on the persistent browser_data profile)
+running in the background with a CDP port open, restarts it when it dies or
+stops answering, and takes commands over a local control socket. Runs of
+main.py attach to it with connect_over_cdp instead of launching a browser.
+"""
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import Optional
+from playwright.async_api import async_playwright
+from rich.console import Console
+
+console = Console()
+
+# Control socket and log of the daemon
+DAEMON_SOCKET = Path("cache/browser_daemon.sock")
+DAEMON_LOG = Path("cache/browser_daemon.log")
+
+# Local port Chromium serves the DevTools protocol on
+DEFAULT_CDP_PORT = 9333
+
+# Same browser ClaudeClient launches when it is installed, so the profile stays compatible
+CHROME_APP = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+
+# Consecutive failed health checks before the browser is restarted
+MAX_FAILED_CHECKS = 3
+
+def send_command(command: str, socket_path: Path = DAEMON_SOCKET, timeout: float = 2.0) -> Optional[dict]:
+    """
+    Send one command to the daemon's control socket.
+
+    Args:
+        command (str): "status", "restart" or "stop"
+        socket_path (Path): Control socket of the daemon
+        timeout (float): Seconds to wait for the answer
+
+    Returns:
+        dict: The daemon's answer, or None if no daemon is listening
+    """
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(str(socket_path))
+            client.sendall(json.dumps({"command": command}).encode("utf-8") + b"\n")
+            answer = b""
+            while not answer.endswith(b"\n"):
+                chunk = client.recv(4096)
+                if not chunk:
+                    break
+                answer += chunk
+        return json.loads(answer or b"null")
+    except (OSError, ValueError):
+        return None
+
+def daemon_endpoint(socket_path: Path = DAEMON_SOCKET) -> Optional[str]:
+    """CDP endpoint of a running, healthy daemon, or None."""
+    status = send_command("status", socket_path)
+    if status and status.get("healthy"):
+        return status.get("endpoint")
+    return None
+
+def wait_until_healthy(socket_path: Path = DAEMON_SOCKET, timeout: float = 90.0) -> Optional[dict]:
+    """
+    Wait for a daemon that answers on its control socket to report a healthy browser.
+
+    A daemon that is restarting or backing off may still have Chromium running
+    on the profile, so whenever the socket answers the daemon owns browser_data.
+
+    Args:
+        socket_path (Path): Control socket of the daemon
+        timeout (float): Seconds to wait; longer than the daemon's restart backoff
+
+    Returns:
+        dict: The healthy status, the last unhealthy one on timeout, or None if no daemon answers
+    """
+    deadline = time.time() + timeout
+    status = send_command("status", socket_path)
+    while status and not status.get("healthy") and time.time() < deadline:
+        time.sleep(1.0)
+        status = send_command("status", socket_path)
+    return status
+
+def start_detached(argv, socket_path: Path = DAEMON_SOCKET, timeout: float = 30.0) -> bool:
+    """
+    Start `main.py ... daemon run` in the background and wait until it is healthy.
+
+    Args:
+        argv (list): main.py arguments that run the daemon in the foreground
+        socket_path (Path): Control socket the daemon will listen on
+        timeout (float): Seconds to wait for the first healthy check
+
+    Returns:
+        bool: True if the daemon is up
+    """
+    if daemon_endpoint(socket_path):
+        console.print("[green]Browser daemon is already running[/green]")
+        return True
+    DAEMON_LOG.parent.mkdir(parents=True, exist_ok=True)
+    main_script = Path(__file__).resolve().parent / "main.py"
+    with open(DAEMON_LOG, "a", encoding="utf-8") as log:
+        subprocess.Popen(
+            [sys.executable, str(main_script), *argv],
+            stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        endpoint = daemon_endpoint(socket_path)
+        if endpoint:
+            console.print(f"[green]Browser daemon started at {endpoint} (log: {DAEMON_LOG})[/green]")
+            return True
+        time.sleep(0.5)
+    console.print(f"[bold red]Browser daemon did not become healthy; see {DAEMON_LOG}[/bold red]")
+    return False
+
+class BrowserDaemon:
+    """Supervises one Chromium process with an open CDP port."""
+
+    def __init__(self, user_data_dir: Path = Path("browser_data"), port: int = DEFAULT_CDP_PORT,
+                 socket_path: Path = DAEMON_SOCKET, headless: bool = True, start_url: Optional[str] = None,
+                 health_interval: float = 10.0):
+        """
+        Initialize the daemon.
+
+        Args:
+            user_data_dir (Path): Persistent profile holding the Claude login
+            port (int): CDP port on 127.0.0.1
+            socket_path (Path): Control socket path
+            headless (bool): Run Chromium without a window
+            start_url (str, optional): Page to open (and keep warm) after every launch
+            health_interval (float): Seconds between health checks
+        """
+        self.user_data_dir = user_data_dir
+        self.port = port
+        self.socket_path = socket_path
+        self.headless = headless
+        self.start_url = start_url
+        self.health_interval = health_interval
+        self.endpoint = f"http://127.0.0.1:{port}"
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.executable: Optional[str] = None
+        self.healthy = False
+        self.failed_checks = 0
+        self.restarts = 0
+        self.launched_at: Optional[float] = None
+        self.started_at = time.time()
+        self._restart_requested = asyncio.Event()
+        self._stop_requested = asyncio.Event()
+
+    async def _find_executable(self) -> str:
+        """Chrome if installed (as ClaudeClient uses it), otherwise Playwright's Chromium."""
+        if os.path.exists(CHROME_APP):
+            return CHROME_APP
+        async with async_playwright() as playwright:
+            return playwright.chromium.executable_path
+
+    def _command(self):
+        """Command line of the browser process."""
+        command = [
+            self.executable,
+            f"--user-data-dir={self.user_data_dir.resolve()}",
+            f"--remote-debugging-port={self.port}",
+            "--remote-debugging-address=127.0.0.1",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--disable-blink-features=AutomationControlled",
+        ]
+        if self.headless:
+            command.append("--headless=new")
+        if self.start_url:
+            command.append(self.start_url)
+        return command
+
+    async def _launch(self):
+        """Start the browser and wait until its CDP port answers."""
+        self.user_data_dir.mkdir(exist_ok=True)
+        self.process = await asyncio.create_subprocess_exec(
+            *self._command(), stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        self.launched_at = time.time()
+        self.failed_checks = 0
+        for _ in range(60):
+            if await self._check_health():
+                console.print(f"[green]Browser up (pid {self.process.pid}) at {self.endpoint}[/green]")
+                return
+            await asyncio.sleep(0.5)
+        console.print("[yellow]Browser did not open its CDP port in 30 seconds[/yellow]")
+
+    async def _terminate(self):
+        """Stop the browser process, killing it if it does not exit."""
+        process, self.process = self.process, None
+        self.healthy = False
+        if not process or process.returncode is not None:
+            return
+        process.terminate()
+        try:
+            await asyncio.wait_for(process.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    def _probe(self) -> bool:
+        """Ask the CDP port for the browser version (blocking)."""
+        try:
+            with urllib.request.urlopen(f"{self.endpoint}/json/version", timeout=3) as response:
+                return "webSocketDebuggerUrl" in json.load(response)
+        except (OSError, ValueError):
+            return False
+
+    async def _check_health(self) -> bool:
+        """Check that the process is alive and its CDP port answers."""
+        alive = self.process is not None and self.process.returncode is None
+        self.healthy = alive and await asyncio.to_thread(self._probe)
+        return self.healthy
+
+    async def _supervise(self):
+        """Restart the browser when it exits, stops answering or a restart is requested."""
+        backoff = 1.0
+        while not self._stop_requested.is_set():
+            try:
+                await asyncio.wait_for(self._restart_requested.wait(), timeout=self.health_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stop_requested.is_set():
+                break
+
+            restart = self._restart_requested.is_set()
+            self._restart_requested.clear()
+            if not restart:
+                if await self._check_health():
+                    self.failed_checks = 0
+                    backoff = 1.0
+                    continue
+                self.failed_checks += 1
+                exited = self.process is None or self.process.returncode is not None
+                if not exited and self.failed_checks < MAX_FAILED_CHECKS:
+                    console.print(f"[yellow]Health check failed ({self.failed_checks}/{MAX_FAILED_CHECKS})[/yellow]")
+                    continue
+                console.print("[yellow]Browser is down, restarting...[/yellow]")
+                # Crash loops (e.g. a locked profile) back off up to a minute
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+            await self._terminate()
+            await self._launch()
+            self.restarts += 1
+
+    def status(self) -> dict:
+        """State reported to the control socket."""
+        return {
+            "healthy": self.healthy,
+            "endpoint": self.endpoint,
+            "pid": self.process.pid if self.process else None,
+            "daemon_pid": os.getpid(),
+            "headless": self.headless,
+            "restarts": self.restarts,
+            "browser_uptime": round(time.time() - self.launched_at, 1) if self.launched_at else None,
+            "daemon_uptime": round(time.time() - self.started_at, 1),
+        }
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one command from the control socket."""
+        try:
+            request = json.loads(await asyncio.wait_for(reader.readline(), timeout=5) or b"{}")
+            command = request.get("command")
+            if command == "status":
+                answer = self.status()
+            elif command == "restart":
+                self._restart_requested.set()
+                answer = {"ok": True}
+            elif command == "stop":
+                self._stop_requested.set()
+                self._restart_requested.set()
+                answer = {"ok": True}
+            else:
+                answer = {"error": f"unknown command {command!r}"}
+        except (asyncio.TimeoutError, ValueError, AttributeError) as e:
+            answer = {"error": str(e)}
+        try:
+            writer.write(json.dumps(answer).encode("utf-8") + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def run(self):
+        """Launch the browser and serve the control socket until a stop command."""
+        if send_command("status", self.socket_path):
+            console.print(f"[bold red]A browser daemon is already listening on {self.socket_path}[/bold red]")
+            return
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Left over by a daemon that did not shut down cleanly
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+        self.executable = await self._find_executable()
+        server = await asyncio.start_unix_server(self._handle_client, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        console.print(f"[green]Browser daemon listening on {self.socket_path}[/green]")
+        try:
+            await self._launch()
+            await self._supervise()
+        finally:
+            server.close()
+            await server.wait_closed()
+            await self._terminate()
+            try:
+                self.socket_path.unlink()
+            except FileNotFoundError:
+                pass
+            console.print("[yellow]Browser daemon stopped.[/yellow]")
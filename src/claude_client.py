@@ -10,30 +10,250 @@ import json
 import subprocess
 import re
 from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
 from playwright.async_api import async_playwright
+from browser_daemon import send_command
+from response_capture import CompletionStreamCapture
+from html_to_markdown import html_to_markdown
+from page_helpers import LOGIN_TEXTS, VERIFICATION_TEXTS, call_helper, install_page_helpers
+from page_waits import INPUT_EMPTY_JS, PAGE_STATE_JS, RESPONSE_ATTACHED_JS, SUBMISSION_ACCEPTED_JS, PageWaiter
+from screenshot_service import ScreenshotService
+from selector_resolver import SelectorResolver
+from tracing import traced_methods, tracer
 from rich.console import Console
 
 console = Console()
 
+# Project URL of Claude's web interface used for every new chat
+DEFAULT_CLAUDE_URL = "https://claude.ai/project/434990a3-f303-4f35-85cd-490c991139d4"
+
+# Lean mode: resource types the automation never looks at
+LEAN_BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
+# Lean mode: analytics and telemetry hosts (matched as domain suffixes)
+LEAN_BLOCKED_DOMAINS = (
+    "googletagmanager.com",
+    "google-analytics.com",
+    "doubleclick.net",
+    "segment.io",
+    "segment.com",
+    "sentry.io",
+    "intercom.io",
+    "intercomcdn.com",
+    "hotjar.com",
+    "fullstory.com",
+)
+
+# Lean mode: viewport of every tab (still wide enough for the desktop layout)
+LEAN_VIEWPORT = {"width": 1024, "height": 720}
+
+# Lean mode: extra Chromium switches that cut background work
+LEAN_BROWSER_ARGS = [
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--mute-audio",
+    "--blink-settings=imagesEnabled=false",
+]
+
+# Name of the binding the in-page response watcher reports through
+RESPONSE_EVENT_BINDING = "__blogAutomationResponseEvent"
+
+# In-page watcher: observes DOM mutations and pushes small "changed" and
+# "finished" events to Python, so the response text never crosses CDP
+# while Claude is still writing
+RESPONSE_WATCHER_JS = """
+(options) => {
+    if (window.__blogAutomationWatcher) {
+        return window.__blogAutomationWatcher.reset(options);
+    }
+
+    const RESPONSE_SELECTOR = '.prose, .message-content, .claude-response';
+    const GENERATING_SELECTOR = [
+        '[data-is-streaming="true"]',
+        'button[aria-label*="Stop"]',
+        '.loading', '.generating', '.typing-indicator', '[role="progressbar"]'
+    ].join(', ');
+    const SETTLE_MS = 800;
+
+    const state = { lastLength: -1, baseline: 0, sawGenerating: false, finished: false, settleTimer: null, scheduled: false };
+    const send = (payload) => window.__blogAutomationResponseEvent(payload).catch(() => {});
+
+    const responseLength = () => {
+        // Scoped to the newest assistant turn when the page helpers are installed
+        if (window.__blogAutomation) return window.__blogAutomation.lastAssistantMessage(false).length;
+        const elements = document.querySelectorAll(RESPONSE_SELECTOR);
+        for (let i = elements.length - 1; i >= 0; i--) {
+            const length = elements[i].textContent.length;
+            if (length > 0) return length;
+        }
+        return 0;
+    };
+
+    const isGenerating = () => {
+        for (const el of document.querySelectorAll(GENERATING_SELECTOR)) {
+            if (el.matches('[data-is-streaming="true"]') || el.offsetParent !== null) return true;
+        }
+        return false;
+    };
+
+    const check = () => {
+        state.scheduled = false;
+        const length = responseLength();
+        const generating = isGenerating();
+        if (generating) state.sawGenerating = true;
+
+        if (length !== state.lastLength) {
+            state.lastLength = length;
+            state.finished = false;
+            send({ type: 'changed', length, generating });
+        }
+
+        // Ignore text that was already on the page before the prompt was sent
+        const started = state.sawGenerating || length !== state.baseline;
+
+        clearTimeout(state.settleTimer);
+        if (!generating && started && length > 0 && !state.finished) {
+            // Only report the end once the DOM has been quiet for a moment
+            state.settleTimer = setTimeout(() => {
+                if (isGenerating() || responseLength() !== state.lastLength) return;
+                state.finished = true;
+                send({ type: 'finished', length: state.lastLength, sawGenerating: state.sawGenerating });
+            }, SETTLE_MS);
+        }
+    };
+
+    const schedule = () => {
+        if (state.scheduled) return;
+        state.scheduled = true;
+        setTimeout(check, 100);
+    };
+
+    const observer = new MutationObserver(schedule);
+    observer.observe(document.body, { childList: true, subtree: true, characterData: true, attributes: true,
+                                      attributeFilter: ['data-is-streaming', 'aria-label', 'class'] });
+
+    window.__blogAutomationWatcher = {
+        reset: (options) => {
+            state.baseline = options.resume ? -1 : responseLength();
+            state.lastLength = -1;
+            state.sawGenerating = false;
+            state.finished = false;
+            schedule();
+            return true;
+        },
+        stop: () => {
+            observer.disconnect();
+            delete window.__blogAutomationWatcher;
+        },
+    };
+    // When reattaching to a finished conversation the existing text is the answer
+    state.baseline = options.resume ? -1 : responseLength();
+    schedule();
+    return true;
+}
+"""
+
+@traced_methods({
+    "start": "browser_launch",
+    "_handle_login_if_needed": "login_check",
+    "create_new_chat": "new_chat",
+    "open_conversation": "navigation",
+    "_insert_prompt_in_page": "prompt_insertion",
+    "_insert_prompt": "prompt_insertion",
+    "wait_for_response_completion": "generation",
+    "download_content_as_markdown": "download",
+    "extract_response": "extraction",
+})
 class ClaudeClient:
     """Client for interacting with Claude.ai via browser automation."""
     
-    def __init__(self):
-        """Initialize the Claude client."""
+    # Browser, settings and session-wide helpers a worker tab takes from the client that spawned it
+    SHARED_ATTRIBUTES = (
+        "playwright", "browser", "context", "cdp_endpoint", "cdp_browser", "using_existing_browser",
+        "claude_url", "lean", "headless", "screenshot_dir", "screenshots", "user_data_dir",
+        "selectors", "waits", "clipboard_lock",
+    )
+    
+    def __init__(self, name: str = "main", capture_stream: bool = False, screenshot_level: str = "errors",
+                 claude_url: str = DEFAULT_CLAUDE_URL, headless: bool = False, lean: bool = False,
+                 cdp_endpoint: Optional[str] = None, parent: Optional["ClaudeClient"] = None):
+        """
+        Initialize the Claude client.
+        
+        Args:
+            name (str): Worker name, used to keep screenshots of parallel tabs apart
+            capture_stream (bool): Rebuild answers from the completion network stream
+            screenshot_level (str): Debug screenshots to take: "off", "errors" or "full"
+            claude_url (str): Project URL to open chats in (e.g. a local stand-in for benchmarks)
+            headless (bool): Run the browser without a window (needs an existing login)
+            lean (bool): Headless with images, fonts, media and analytics blocked
+                and a small viewport, to lower the cost per tab
+            cdp_endpoint (str, optional): Attach to this running browser (the browser
+                daemon) over CDP instead of launching one
+            parent (ClaudeClient, optional): Started client whose browser and
+                SHARED_ATTRIBUTES this worker tab uses (see spawn_worker); the
+                other settings are then taken from it as well
+        """
+        self.name = name
+        # Screenshots are grouped per job; main.py sets this to the current keyword
+        self.job_name = name
+        self.page = None
+        # Extra tabs spawned from this client that share its browser context
+        self.workers = []
+        # Set for clients created by spawn_worker(); they only own their page
+        self.is_worker = parent is not None
+        # True while the page shows an unused chat ready for a new prompt
+        self.on_fresh_chat = False
+        # Inline progress spinner; disabled for parallel tabs to keep output readable
+        self.show_spinner = parent is None
+        # Queue receiving events from the in-page response watcher
+        self._response_events = None
+        self._response_binding_installed = False
+        # Timing of the last submit_prompt() call (insertion method and seconds)
+        self.last_submission_metrics = {}
+        # Optional capture of the answer straight from the completion stream
+        self.stream_capture = None
+        if parent is not None:
+            capture_stream = parent.stream_capture is not None
+        if capture_stream:
+            self.stream_capture = CompletionStreamCapture(on_complete=self._on_stream_complete)
+        # Requests aborted by the lean mode's route handler
+        self.blocked_requests = 0
+        
+        if parent is not None:
+            for attribute in self.SHARED_ATTRIBUTES:
+                setattr(self, attribute, getattr(parent, attribute))
+            return
+        
         self.playwright = None
         self.browser = None
         self.context = None
-        self.page = None
         # Specific project URL for Claude's web interface
-        self.claude_url = "https://claude.ai/project/434990a3-f303-4f35-85cd-490c991139d4"
+        self.claude_url = claude_url
+        self.lean = lean
+        self.headless = headless or lean
         # Path for storing screenshots
         self.screenshot_dir = Path("screenshots")
         self.screenshot_dir.mkdir(exist_ok=True)
+        self.screenshots = ScreenshotService(self.screenshot_dir, level=screenshot_level)
         # Path for storing persistent session data
         self.user_data_dir = Path("browser_data")
         self.user_data_dir.mkdir(exist_ok=True)
         # Flag to track if we connected to existing browser
         self.using_existing_browser = False
+        # Browser daemon to attach to, and the CDP connection to it
+        self.cdp_endpoint = cdp_endpoint
+        self.cdp_browser = None
+        # Learned selectors for UI elements, shared with worker tabs
+        self.selectors = SelectorResolver(Path("cache/selector_cache.json"))
+        # Readiness waits and their timings, shared with worker tabs
+        self.waits = PageWaiter()
+        # The clipboard belongs to the browser context, so tabs take turns using it
+        self.clipboard_lock = asyncio.Lock()
         
     async def start(self):
         """Start the browser and navigate to Claude using persistent context."""
@@ -42,38 +262,41 @@ class ClaudeClient:
         try:
             self.playwright = await async_playwright().start()
             
-            # Launch browser with persistent context to maintain login between sessions
-            self.browser = await self.playwright.chromium.launch_persistent_context(
-                user_data_dir=str(self.user_data_dir),
-                headless=False,
-                channel="chrome" if self._is_chrome_available() else None,
-                args=[
-                    "--no-sandbox",
-                    "--disable-blink-features=AutomationControlled"  # Hide automation flags
-                ]
-            )
+            if self.cdp_endpoint:
+                await self._attach_to_daemon()
+            else:
+                await self._launch_browser()
+            
+            # Routes on the context also cover the worker tabs opened later
+            if self.lean:
+                await self.browser.route("**/*", self._route_lean)
+            
+            # The Copy button path reads the clipboard; allow it without a prompt
+            try:
+                origin = "{0.scheme}://{0.netloc}".format(urlsplit(self.claude_url))
+                await self.browser.grant_permissions(["clipboard-read", "clipboard-write"], origin=origin)
+            except Exception as e:
+                console.print(f"[yellow]Could not grant clipboard permissions: {str(e)}[/yellow]")
             
-            # Create page from the persistent context
-            if len(self.browser.pages) > 0:
+            # Create page from the persistent context; the daemon's own tab is left alone
+            if len(self.browser.pages) > 0 and not self.using_existing_browser:
                 self.page = self.browser.pages[0]
                 console.print("[green]Using existing browser page[/green]")
             else:
                 self.page = await self.browser.new_page()
                 console.print("[yellow]Created new browser page[/yellow]")
+            if self.lean and self.using_existing_browser:
+                await self.page.set_viewport_size(LEAN_VIEWPORT)
             
-            # Set JavaScript flag to appear as normal browser
-            await self.page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => false,
-                });
-            """)
+            await self._prepare_page(self.page)
             
             # Navigate directly to the project URL
             console.print(f"[yellow]Navigating to project URL: {self.claude_url}...[/yellow]")
-            await self.page.goto(self.claude_url, wait_until="domcontentloaded", timeout=60000)
+            with tracer.span("navigation"):
+                await self.page.goto(self.claude_url, wait_until="domcontentloaded", timeout=60000)
             
-            # Wait a moment for the page to load
-            await asyncio.sleep(5)
+            # Wait until the prompt input is usable (or a login page shows up)
+            await self._wait_for_page_ready("project_ready", replaces=5)
             
             # Take a screenshot
             await self.take_screenshot("project_loaded")
@@ -86,6 +309,9 @@ class ClaudeClient:
                 console.print("[green]Successfully navigated to Claude project![/green]")
             else:
                 console.print("[yellow]Not on project page. Will check if login is needed.[/yellow]")
+                if self.headless and await self.check_login_needed():
+                    raise Exception("Login required, but the browser has no window. "
+                                    "Run once without --headless/--lean to log in.")
                 # Handle CAPTCHA if needed
                 await self._handle_security_verification()
                 # Handle login if needed
@@ -94,15 +320,134 @@ class ClaudeClient:
                 if "/project/" not in self.page.url:
                     console.print("[yellow]Trying to navigate to project URL again...[/yellow]")
                     await self.page.goto(self.claude_url, wait_until="domcontentloaded", timeout=60000)
-                    await asyncio.sleep(5)
+                    await self._wait_for_page_ready("project_ready", replaces=5)
             
             console.print("[green]Successfully connected to Claude[/green]")
+            self.on_fresh_chat = True
             
         except Exception as e:
             console.print(f"[bold red]Failed to start browser: {str(e)}[/bold red]")
             await self.close()
             raise
     
+    async def _launch_browser(self):
+        """Launch Chromium on the persistent profile."""
+        args = [
+            "--no-sandbox",
+            "--disable-blink-features=AutomationControlled"  # Hide automation flags
+        ]
+        launch_options = {}
+        if self.lean:
+            args += LEAN_BROWSER_ARGS
+            launch_options["viewport"] = LEAN_VIEWPORT
+        
+        # Launch browser with persistent context to maintain login between sessions
+        self.browser = await self.playwright.chromium.launch_persistent_context(
+            user_data_dir=str(self.user_data_dir),
+            headless=self.headless,
+            channel="chrome" if self._is_chrome_available() else None,
+            args=args,
+            **launch_options
+        )
+    
+    async def _attach_to_daemon(self):
+        """Connect to the browser daemon; its default context is the persistent profile."""
+        console.print(f"[yellow]Attaching to browser daemon at {self.cdp_endpoint}...[/yellow]")
+        self.cdp_browser = await self.playwright.chromium.connect_over_cdp(self.cdp_endpoint, timeout=10000)
+        if not self.cdp_browser.contexts:
+            raise Exception(f"Browser at {self.cdp_endpoint} has no default context")
+        self.browser = self.cdp_browser.contexts[0]
+        self.using_existing_browser = True
+        # The daemon is headless unless started with --headed; a login page
+        # in a browser nobody can see has to fail instead of waiting
+        status = send_command("status")
+        if status and status.get("endpoint") == self.cdp_endpoint:
+            self.headless = bool(status.get("headless", self.headless))
+    
+    async def _prepare_page(self, page):
+        """Apply the init scripts and listeners every automated page needs."""
+        if self.stream_capture:
+            self.stream_capture.attach(page)
+        
+        # Set JavaScript flag to appear as normal browser
+        await page.add_init_script("""
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => false,
+            });
+        """)
+        # DOM helpers, so each step below is one round trip
+        await install_page_helpers(page)
+    
+    def _input_selectors(self):
+        """Prompt input selectors to check in the page, the learned one first."""
+        learned = self.selectors.current("input")
+        candidates = self.selectors.candidates["input"]
+        return ([learned] if learned else []) + [selector for selector in candidates if selector != learned]
+    
+    async def _page_state(self, login: bool = False, verification: bool = False) -> dict:
+        """
+        Read the page state in one round trip, matching login/verification text in the page.
+        
+        Returns:
+            dict: url, inputReady, loginText, verificationText, generating, responseLength
+        """
+        return await call_helper(self.page, "pageState", {
+            "inputSelectors": self._input_selectors(),
+            "loginTexts": LOGIN_TEXTS if login else [],
+            "verificationTexts": VERIFICATION_TEXTS if verification else [],
+        })
+    
+    async def _wait_for_page_ready(self, name: str, timeout: float = 30000, replaces: float = 0.0):
+        """
+        Wait until the prompt input is editable or a login page has loaded.
+        
+        Returns:
+            str: "ready", "login", or None if neither happened in time
+        """
+        options = {
+            "inputSelectors": self._input_selectors(),
+            "loginTexts": LOGIN_TEXTS,
+            "verificationTexts": VERIFICATION_TEXTS,
+        }
+        return await self.waits.until(
+            self.page, name, PAGE_STATE_JS, options, timeout=timeout, replaces=replaces
+        )
+    
+    async def _route_lean(self, route):
+        """Abort requests for resources the automation does not need (lean mode)."""
+        request = route.request
+        host = urlsplit(request.url).hostname or ""
+        if (request.resource_type in LEAN_BLOCKED_RESOURCE_TYPES
+                or any(host == domain or host.endswith("." + domain) for domain in LEAN_BLOCKED_DOMAINS)):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+    
+    async def spawn_worker(self) -> "ClaudeClient":
+        """
+        Open another tab in the same persistent context and wrap it in a client.
+        
+        The worker shares the login (cookies and storage) of this client but has
+        its own page, so it can generate an article independently.
+        
+        Returns:
+            ClaudeClient: Client bound to the new tab, positioned on the project page
+        """
+        if not self.browser:
+            raise Exception("Browser not initialized. Call start() first.")
+        
+        worker = ClaudeClient(name=f"{self.name}-tab{len(self.workers) + 1}", parent=self)
+        worker.page = await self.browser.new_page()
+        self.workers.append(worker)
+        
+        await worker._prepare_page(worker.page)
+        console.print(f"[yellow]Opening worker tab {worker.name}...[/yellow]")
+        await worker.page.goto(self.claude_url, wait_until="domcontentloaded", timeout=60000)
+        await worker._wait_for_page_ready("project_ready", replaces=5)
+        worker.on_fresh_chat = True
+        return worker
+    
     def _is_chrome_available(self):
         """Check if Chrome is available on the system."""
         try:
@@ -118,17 +463,7 @@ class ClaudeClient:
         await self.take_screenshot("security_check")
         
         # Check for text indicating security verification
-        security_texts = [
-            "verify you are human", 
-            "security verification",
-            "complete the action below", 
-            "captcha", 
-            "security check",
-            "cloudflare"
-        ]
-        
-        page_text = await self.page.evaluate('() => document.body.innerText.toLowerCase()')
-        has_verification = any(text in page_text.lower() for text in security_texts)
+        has_verification = (await self._page_state(verification=True))["verificationText"]
         
         if has_verification:
             console.print("[bold red]Security verification (CAPTCHA) detected![/bold red]")
@@ -145,7 +480,7 @@ class ClaudeClient:
             
             console.print("[green]Security verification appears to be completed. Continuing...[/green]")
             await self.take_screenshot("after_verification")
-            await asyncio.sleep(5)  # Give a moment for everything to load after verification
+            await self._wait_for_page_ready("after_verification", replaces=5)
     
     async def _wait_for_navigation_or_element(self, timeout=60000, selectors=None, url_patterns=None):
         """Wait for either an element to appear or navigation to complete."""
@@ -179,14 +514,15 @@ class ClaudeClient:
         
         return False
         
-    async def take_screenshot(self, name):
-        """Take a screenshot and save it with a given name."""
-        try:
-            screenshot_path = self.screenshot_dir / f"{name}.png"
-            await self.page.screenshot(path=str(screenshot_path))
-            console.print(f"[green]Saved screenshot to {screenshot_path}[/green]")
-        except Exception as e:
-            console.print(f"[yellow]Could not save screenshot: {str(e)}[/yellow]")
+    async def take_screenshot(self, name, error=False):
+        """
+        Schedule a screenshot of the current page for the current job.
+        
+        Args:
+            name (str): Step name used in the file name
+            error (bool): Mark as a failure screenshot (kept at level "errors")
+        """
+        self.screenshots.capture(self.page, name, self.job_name, error=error)
     
     async def _handle_login_if_needed(self):
         """Check if login is needed and handle it."""
@@ -198,10 +534,7 @@ class ClaudeClient:
         await self.take_screenshot("login_check")
         
         # Check for login text indicators
-        login_texts = ["log in", "sign in", "continue with", "log into"]
-        page_text = await self.page.evaluate('() => document.body.innerText.toLowerCase()')
-        
-        needs_login = ("/chats" not in url and "/project/" not in url) or any(text in page_text.lower() for text in login_texts)
+        needs_login = ("/chats" not in url and "/project/" not in url) or (await self._page_state(login=True))["loginText"]
         
         if needs_login:
             console.print("[yellow]Login appears to be required[/yellow]")
@@ -225,7 +558,12 @@ class ClaudeClient:
                             console.print(f"[green]Found login button: {selector}[/green]")
                             await button.click()
                             console.print("[yellow]Clicked login button[/yellow]")
-                            await asyncio.sleep(3)  # Give time for click to register
+                            # Let a navigation started by the click get going
+                            try:
+                                async with self.waits.track("login_click", replaces=3):
+                                    await self.page.wait_for_load_state("domcontentloaded", timeout=5000)
+                            except Exception:
+                                pass
                             break
                     except:
                         continue
@@ -258,17 +596,17 @@ class ClaudeClient:
                 console.print("[green]Login successful![/green]")
                 # Take additional screenshot to validate the successful login state
                 await self.take_screenshot("login_successful")
-                # Wait a bit longer for the UI to fully load
-                await asyncio.sleep(5)
+                # Wait for the UI to finish loading
+                await self._wait_for_page_ready("after_login", replaces=5)
                 
                 # After successful login, navigate directly to the project URL
                 console.print(f"[yellow]Navigating to project URL after login: {self.claude_url}[/yellow]")
                 await self.page.goto(self.claude_url, wait_until="domcontentloaded", timeout=60000)
-                await asyncio.sleep(5)  # Wait for project page to load
+                await self._wait_for_page_ready("project_ready", replaces=5)
                 await self.take_screenshot("project_after_login")
             else:
                 console.print("[bold red]Login may have failed. Taking screenshot for debugging.[/bold red]")
-                await self.take_screenshot("login_failed")
+                await self.take_screenshot("login_failed", error=True)
         else:
             console.print("[green]Already logged in![/green]")
     
@@ -287,10 +625,7 @@ class ClaudeClient:
             
         # Check for login indicators in page text
         try:
-            login_texts = ["log in", "sign in", "continue with", "log into"]
-            page_text = await self.page.evaluate('() => document.body.innerText.toLowerCase()')
-            
-            if any(text in page_text.lower() for text in login_texts):
+            if (await self._page_state(login=True))["loginText"]:
                 console.print("[yellow]Login appears to be required based on page text[/yellow]")
                 return True
         except:
@@ -307,259 +642,524 @@ class ClaudeClient:
         try:
             # Check if we need to log in
             if await self.check_login_needed():
-                await self.login()
+                await self._handle_login_if_needed()
                 
             # Navigate directly to the specific project URL after successful login
-            project_url = "https://claude.ai/project/434990a3-f303-4f35-85cd-490c991139d4"
-            console.print(f"[yellow]Navigating to specific project URL: {project_url}[/yellow]")
+            console.print(f"[yellow]Navigating to specific project URL: {self.claude_url}[/yellow]")
             
-            await self.page.goto(project_url, wait_until="networkidle")
-            await asyncio.sleep(2)  # Give the page a moment to stabilize
+            # The chat UI keeps connections open, so wait for the input rather than network idle
+            await self.page.goto(self.claude_url, wait_until="domcontentloaded", timeout=60000)
+            if await self._wait_for_page_ready("new_chat_ready", replaces=2) != "ready":
+                console.print("[yellow]Prompt input not ready yet; continuing anyway[/yellow]")
             
             await self.take_screenshot("project_loaded")
+            self.on_fresh_chat = True
             
             console.print("[green]Project loaded successfully[/green]")
             return True
             
         except Exception as e:
             console.print(f"[bold red]Error creating new chat: {str(e)}[/bold red]")
-            await self.take_screenshot("create_chat_error")
+            await self.take_screenshot("create_chat_error", error=True)
             return False
     
     async def submit_prompt(self, prompt: str) -> bool:
         """Submit a prompt to Claude."""
+        submit_start = time.time()
+        self.last_submission_metrics = {}
         try:
             console.print("[yellow]Attempting to submit prompt...[/yellow]")
             
-            # Common selector patterns for input fields in Claude UI
-            input_selectors = [
-                "textarea", 
-                "div[contenteditable='true']", 
-                "//textarea", 
-                "//div[@contenteditable='true']",
-                "div[role='textbox']",
-                "//div[@role='textbox']",
-                "[aria-label*='Message']"
-            ]
+            # Find, clear and fill the input inside the page in one round trip,
+            # falling back to element handles and keyboard input step by step
+            insert_start = time.time()
+            insert_method = await self._insert_prompt_in_page(prompt)
+            if not insert_method:
+                insert_method = await self._insert_prompt_stepwise(prompt)
+            if not insert_method:
+                console.print("[bold red]Could not insert the prompt into the input field[/bold red]")
+                return False
+            self.last_submission_metrics = {
+                "method": insert_method,
+                "insert_seconds": time.time() - insert_start,
+            }
             
-            # Find the text input field
-            input_field = None
-            for selector in input_selectors:
-                try:
-                    if selector.startswith('//'):
-                        input_field = await self.page.query_selector(f"xpath={selector}")
-                    else:
-                        input_field = await self.page.query_selector(selector)
-                    
-                    if input_field:
-                        break
-                except Exception:
-                    pass
+            # Take a screenshot before submission
+            await self.take_screenshot("before_submission")
             
-            if not input_field:
-                console.print("[bold red]Could not find input field! Refreshing page...[/bold red]")
-                await self.take_screenshot("no_text_area")
-                
-                # Refresh the page to try to find the input field
-                if await self.refresh_page():
-                    # Try to find the input field again after refresh
-                    for selector in input_selectors:
-                        try:
-                            if selector.startswith('//'):
-                                input_field = await self.page.query_selector(f"xpath={selector}")
-                            else:
-                                input_field = await self.page.query_selector(selector)
-                            
-                            if input_field:
-                                break
-                        except Exception:
-                            pass
-                
-                if not input_field:
-                    console.print("[bold red]Could not find input field even after refresh[/bold red]")
-                    return False
+            # Submit the prompt (press Enter)
+            if self.stream_capture:
+                self.stream_capture.arm()
+            await self.page.keyboard.press("Enter")
+            self.last_submission_metrics["submitted_at"] = time.time()
+            self.on_fresh_chat = False
             
-            # More robust clearing of the input field
-            max_clear_attempts = 3
-            for attempt in range(max_clear_attempts):
+            # Take a screenshot after submission
+            await self.take_screenshot("prompt_submitted")
+            
+            # Wait until the UI has taken the prompt
+            await self.waits.until(
+                self.page, "submission_accepted", SUBMISSION_ACCEPTED_JS, self._input_selectors(),
+                timeout=10000, replaces=2,
+            )
+            
+            self.last_submission_metrics["total_seconds"] = time.time() - submit_start
+            console.print(
+                f"[green]Prompt submitted successfully![/green] "
+                f"[blue](inserted via {insert_method} in {self.last_submission_metrics['insert_seconds']:.2f}s, "
+                f"submission took {self.last_submission_metrics['total_seconds']:.1f}s)[/blue]"
+            )
+            return True
+            
+        except Exception as e:
+            console.print(f"[red]Error submitting prompt: {e}[/red]")
+            await self.take_screenshot("prompt_submission_error", error=True)
+            
+            # Try refreshing as a last resort if there was an error
+            console.print("[yellow]Error occurred. Trying to refresh the page...[/yellow]")
+            await self.refresh_page()
+            
+            return False
+    
+    async def _insert_prompt_in_page(self, prompt: str):
+        """
+        Clear the input and insert the prompt with the in-page helpers (one round trip).
+        
+        Returns:
+            str: Name of the insertion method that worked, or None
+        """
+        try:
+            result = await call_helper(self.page, "clearAndInsert", self._input_selectors(), prompt)
+        except Exception as e:
+            console.print(f"[yellow]In-page prompt insertion failed: {str(e)}[/yellow]")
+            return None
+        if result.get("selector"):
+            self.selectors.learn("input", result["selector"])
+        if not result.get("ok"):
+            console.print(f"[yellow]In-page prompt insertion failed ({result.get('reason')}), inserting step by step...[/yellow]")
+            return None
+        return result["method"]
+    
+    async def _insert_prompt_stepwise(self, prompt: str):
+        """
+        Find and clear the input through element handles, then insert the prompt.
+        
+        Returns:
+            str: Name of the insertion method that worked, or None
+        """
+        # Find the text input field
+        input_field = await self.selectors.query(self.page, "input")
+        
+        if not input_field:
+            console.print("[bold red]Could not find input field! Refreshing page...[/bold red]")
+            await self.take_screenshot("no_text_area", error=True)
+            
+            # Refresh the page to try to find the input field
+            if await self.refresh_page():
+                # Try to find the input field again after refresh
+                input_field = await self.selectors.query(self.page, "input")
+            
+            if not input_field:
+                console.print("[bold red]Could not find input field even after refresh[/bold red]")
+                return None
+        
+        # More robust clearing of the input field
+        max_clear_attempts = 3
+        for attempt in range(max_clear_attempts):
+            try:
+                # Check for existing text - handle both regular and contenteditable inputs
+                existing_text = ""
                 try:
-                    # Check for existing text - handle both regular and contenteditable inputs
-                    existing_text = ""
+                    # Try to get input value (works for standard inputs)
+                    existing_text = await input_field.input_value()
+                except:
                     try:
-                        # Try to get input value (works for standard inputs)
-                        existing_text = await input_field.input_value()
+                        # Try to get inner text (works for contenteditable divs)
+                        existing_text = await input_field.evaluate('el => el.innerText')
                     except:
-                        try:
-                            # Try to get inner text (works for contenteditable divs)
-                            existing_text = await input_field.evaluate('el => el.innerText')
-                        except:
-                            # If both fail, check using inner HTML as fallback
-                            existing_text = await input_field.evaluate('el => el.innerHTML')
-                    
-                    if not existing_text or not existing_text.strip():
-                        # Field is already clear
-                        break
-                    
-                    console.print(f"[yellow]Input field already contains text (attempt {attempt+1}/{max_clear_attempts}): '{existing_text[:30]}...'[/yellow]")
-                    
-                    # Try different clearing methods
-                    if attempt == 0:
-                        # First try: Click + focus + Ctrl+A + Delete
-                        await input_field.click()
-                        await input_field.focus()
-                        await self.page.keyboard.press("Control+A")
-                        await self.page.keyboard.press("Delete")
-                    elif attempt == 1:
-                        # Second try: Clear using JavaScript - handle both input types
-                        try:
-                            await self.page.evaluate('''
-                                (selector) => {
-                                    const el = selector.startsWith('//') 
-                                        ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
-                                        : document.querySelector(selector);
-                                    
-                                    if (el) {
-                                        if (el.tagName === 'TEXTAREA' || el.tagName === 'INPUT') {
-                                            el.value = '';
-                                        } else {
-                                            el.innerText = '';
-                                        }
+                        # If both fail, check using inner HTML as fallback
+                        existing_text = await input_field.evaluate('el => el.innerHTML')
+                
+                if not existing_text or not existing_text.strip():
+                    # Field is already clear
+                    break
+                
+                console.print(f"[yellow]Input field already contains text (attempt {attempt+1}/{max_clear_attempts}): '{existing_text[:30]}...'[/yellow]")
+                
+                # Try different clearing methods
+                if attempt == 0:
+                    # First try: Click + focus + Ctrl+A + Delete
+                    await input_field.click()
+                    await input_field.focus()
+                    await self.page.keyboard.press("Control+A")
+                    await self.page.keyboard.press("Delete")
+                elif attempt == 1:
+                    # Second try: Clear using JavaScript - handle both input types
+                    try:
+                        await self.page.evaluate('''
+                            (selector) => {
+                                const el = selector.startsWith('//') 
+                                    ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+                                    : document.querySelector(selector);
+                                
+                                if (el) {
+                                    if (el.tagName === 'TEXTAREA' || el.tagName === 'INPUT') {
+                                        el.value = '';
+                                    } else {
+                                        el.innerText = '';
                                     }
                                 }
-                            ''', selector)
-                        except Exception as e:
-                            console.print(f"[yellow]JS clearing failed: {e}[/yellow]")
-                    else:
-                        # Last attempt: Refresh page
-                        console.print("[yellow]Multiple clearing attempts failed. Refreshing page...[/yellow]")
-                        if await self.refresh_page():
-                            # Find the input field again after refresh
-                            input_field = None
-                            for selector in input_selectors:
-                                if selector.startswith('//'):
-                                    input_field = await self.page.query_selector(f"xpath={selector}")
-                                else:
-                                    input_field = await self.page.query_selector(selector)
-                                
-                                if input_field:
-                                    break
-                        
-                        if not input_field:
-                            console.print("[bold red]Could not find input field after refresh[/bold red]")
-                            return False
-                    
-                    # Verify if the text was cleared
-                    await asyncio.sleep(0.5)  # Short pause to ensure field updates
-                    
-                    # Check if field is truly cleared now - try both methods
-                    existing_text = ""
-                    try:
-                        # Try input value
-                        existing_text = await input_field.input_value()
-                    except:
-                        try:
-                            # Try inner text
-                            existing_text = await input_field.evaluate('el => el.innerText')
-                        except:
-                            # Last resort - innerHTML
-                            existing_text = await input_field.evaluate('el => el.innerHTML')
-                    
-                    if not existing_text or not existing_text.strip():
-                        console.print("[green]Successfully cleared input field![/green]")
-                        break
+                            }
+                        ''', self.selectors.current("input"))
+                    except Exception as e:
+                        console.print(f"[yellow]JS clearing failed: {e}[/yellow]")
+                else:
+                    # Last attempt: Refresh page
+                    console.print("[yellow]Multiple clearing attempts failed. Refreshing page...[/yellow]")
+                    if await self.refresh_page():
+                        # Find the input field again after refresh
+                        input_field = await self.selectors.query(self.page, "input")
                     
-                    # If on the last attempt and text still exists, try a last resort approach
-                    if attempt == max_clear_attempts - 1:
-                        # Force navigate back to project URL as a last resort
-                        console.print("[yellow]Text clearing failed. Force navigating to fresh project URL...[/yellow]")
-                        # Use the claude_url since project_id might not be available
-                        await self.page.goto(self.claude_url)
-                        await self.page.wait_for_load_state("networkidle")
-                        await self.page.wait_for_timeout(3000)  # Give it time to fully load
-                        
-                        # Find the input field again
-                        input_field = None
-                        for selector in input_selectors:
-                            if selector.startswith('//'):
-                                input_field = await self.page.query_selector(f"xpath={selector}")
-                            else:
-                                input_field = await self.page.query_selector(selector)
-                            
-                            if input_field:
-                                break
-                        
-                        if not input_field:
-                            console.print("[bold red]Could not find input field after direct navigation[/bold red]")
-                            return False
-                except Exception as e:
-                    console.print(f"[red]Error during text clearing attempt {attempt+1}: {e}[/red]")
-                    # Continue to next attempt
-            
-            # Verify the field is actually empty now
-            try:
+                    if not input_field:
+                        console.print("[bold red]Could not find input field after refresh[/bold red]")
+                        return None
+                
+                # Verify if the text was cleared (returns as soon as the field is empty)
+                await self.waits.until(
+                    self.page, "input_cleared", INPUT_EMPTY_JS, input_field, timeout=1000, replaces=0.5
+                )
+                
+                # Check if field is truly cleared now - try both methods
                 existing_text = ""
                 try:
+                    # Try input value
                     existing_text = await input_field.input_value()
                 except:
                     try:
+                        # Try inner text
                         existing_text = await input_field.evaluate('el => el.innerText')
                     except:
+                        # Last resort - innerHTML
                         existing_text = await input_field.evaluate('el => el.innerHTML')
                 
-                if existing_text and existing_text.strip():
-                    console.print(f"[bold red]Failed to clear input field after multiple attempts. Text remains: '{existing_text[:30]}...'[/bold red]")
-                    return False
+                if not existing_text or not existing_text.strip():
+                    console.print("[green]Successfully cleared input field![/green]")
+                    break
+                
+                # If on the last attempt and text still exists, try a last resort approach
+                if attempt == max_clear_attempts - 1:
+                    # Force navigate back to project URL as a last resort
+                    console.print("[yellow]Text clearing failed. Force navigating to fresh project URL...[/yellow]")
+                    # Use the claude_url since project_id might not be available
+                    await self.page.goto(self.claude_url, wait_until="domcontentloaded")
+                    await self._wait_for_page_ready("project_ready", replaces=3)
+                    
+                    # Find the input field again
+                    input_field = await self.selectors.query(self.page, "input")
+                    
+                    if not input_field:
+                        console.print("[bold red]Could not find input field after direct navigation[/bold red]")
+                        return None
             except Exception as e:
-                console.print(f"[red]Error checking if field is cleared: {e}[/red]")
-                # Continue anyway and hope for the best
-            
-            # Click on the input field to focus it
-            await input_field.click()
-            await input_field.focus()
-            
-            # Type the prompt
-            await input_field.type(prompt)
-            
-            # Take a screenshot before submission
-            await self.take_screenshot("before_submission")
-            
-            # Submit the prompt (press Enter)
-            await self.page.keyboard.press("Enter")
-            
-            # Take a screenshot after submission
-            await self.take_screenshot("prompt_submitted")
+                console.print(f"[red]Error during text clearing attempt {attempt+1}: {e}[/red]")
+                # Continue to next attempt
+        
+        # Verify the field is actually empty now
+        try:
+            existing_text = ""
+            try:
+                existing_text = await input_field.input_value()
+            except:
+                try:
+                    existing_text = await input_field.evaluate('el => el.innerText')
+                except:
+                    existing_text = await input_field.evaluate('el => el.innerHTML')
             
-            # Wait for the response to start generating
-            await self.page.wait_for_timeout(2000)
+            if existing_text and existing_text.strip():
+                console.print(f"[bold red]Failed to clear input field after multiple attempts. Text remains: '{existing_text[:30]}...'[/bold red]")
+                return None
+        except Exception as e:
+            console.print(f"[red]Error checking if field is cleared: {e}[/red]")
+            # Continue anyway and hope for the best
+        
+        # Insert the prompt in one step, typing it only as a last resort
+        return await self._insert_prompt(input_field, prompt)
+    
+    async def _install_response_watcher(self, resume: bool = False) -> bool:
+        """
+        Expose the event binding (once per page) and (re)arm the in-page watcher.
+        
+        Args:
+            resume (bool): Treat text already on the page as part of the answer
             
-            console.print("[green]Prompt submitted successfully![/green]")
-            return True
+        Returns:
+            bool: True if the watcher is running in the page
+        """
+        try:
+            if not self._response_binding_installed:
+                await self.page.expose_binding(RESPONSE_EVENT_BINDING, self._on_response_event)
+                self._response_binding_installed = True
+            return bool(await self.page.evaluate(RESPONSE_WATCHER_JS, {"resume": resume}))
+        except Exception as e:
+            console.print(f"[yellow]Could not install response watcher: {str(e)}[/yellow]")
+            return False
+    
+    def _on_response_event(self, source, event):
+        """Receive an event pushed by the in-page response watcher."""
+        if self._response_events is not None and isinstance(event, dict):
+            self._response_events.put_nowait(event)
+    
+    async def get_response_text(self) -> str:
+        """Read the text of the newest non-empty response element."""
+        try:
+            return (await call_helper(self.page, "lastAssistantMessage"))["text"]
+        except Exception as e:
+            console.print(f"[yellow]Could not read response text: {str(e)}[/yellow]")
+            return ""
+    
+    async def is_generation_finished(self, min_length: int = 0) -> bool:
+        """
+        Check that the newest answer was fully generated, not just stopped changing.
+        
+        Args:
+            min_length (int): Characters the answer had already reached (e.g. a
+                checkpoint's partial article); a shorter answer is not the same one
             
+        Returns:
+            bool: True if no Stop button or streaming flag is left and a Copy button is shown
+        """
+        try:
+            message = await call_helper(self.page, "lastAssistantMessage", False)
+            if message["scope"] == "none" or message["streaming"] or message["length"] < min_length:
+                return False
+            if await call_helper(self.page, "isGenerating"):
+                return False
+            # The action bar with the Copy button is only rendered under a finished answer
+            return await self.selectors.query(self.page, "copy_button") is not None
         except Exception as e:
-            console.print(f"[red]Error submitting prompt: {e}[/red]")
-            await self.take_screenshot("prompt_submission_error")
+            console.print(f"[yellow]Could not check whether generation finished: {str(e)}[/yellow]")
+            return False
+    
+    async def get_conversation_url(self, timeout=10000):
+        """
+        Return the URL of the current conversation once the page has moved to it.
+        
+        Args:
+            timeout (int): Milliseconds to wait for the /chat/ URL after submission
             
-            # Try refreshing as a last resort if there was an error
-            console.print("[yellow]Error occurred. Trying to refresh the page...[/yellow]")
-            await self.refresh_page()
+        Returns:
+            str: Conversation URL, or None if the page never left the project page
+        """
+        try:
+            await self.page.wait_for_url("**/chat/**", timeout=timeout)
+            return self.page.url
+        except Exception:
+            console.print(f"[yellow]No conversation URL yet (current: {self.page.url})[/yellow]")
+            return None
+    
+    async def open_conversation(self, conversation_url: str) -> bool:
+        """
+        Reattach to an existing conversation to harvest its answer.
+        
+        Args:
+            conversation_url (str): URL recorded when the prompt was submitted
             
+        Returns:
+            bool: True if the conversation page loaded
+        """
+        try:
+            console.print(f"[yellow]Reopening conversation: {conversation_url}[/yellow]")
+            await self.page.goto(conversation_url, wait_until="domcontentloaded", timeout=60000)
+            await self.waits.until(self.page, "response_attached", RESPONSE_ATTACHED_JS, timeout=30000, replaces=5)
+            # The conversation already has an answer; nothing will be streamed for capture
+            if self.stream_capture:
+                self.stream_capture.disarm()
+            self.on_fresh_chat = False
+            return "/chat/" in self.page.url
+        except Exception as e:
+            console.print(f"[bold red]Could not open conversation: {str(e)}[/bold red]")
+            await self.take_screenshot("open_conversation_error", error=True)
             return False
     
-    async def wait_for_response_completion(self, max_wait_time=900):
+    def _on_stream_complete(self, text: str):
+        """Treat a closed completion stream as the end of generation."""
+        self._on_response_event(None, {"type": "finished", "length": len(text), "source": "network"})
+    
+    async def _read_input_text(self, input_field) -> str:
+        """Read the current text of a textarea or contenteditable input."""
+        try:
+            return await input_field.input_value()
+        except Exception:
+            return await input_field.evaluate('el => el.innerText')
+    
+    def _prompt_matches(self, expected: str, actual: str) -> bool:
+        """Compare prompt text ignoring the whitespace the editor adds between paragraphs."""
+        return " ".join(expected.split()) == " ".join((actual or "").split())
+    
+    async def _clear_input(self, input_field):
+        """Select everything in the focused input and delete it."""
+        await input_field.focus()
+        await self.page.keyboard.press("Control+A")
+        await self.page.keyboard.press("Delete")
+    
+    async def _insert_prompt(self, input_field, prompt: str):
+        """
+        Put the prompt into the input field using the fastest method that works.
+        
+        Tries a single insertText input event, then a synthetic paste event that
+        the contenteditable editor handles like a real paste, and only then falls
+        back to typing character by character. Each method is verified by reading
+        the editor contents back.
+        
+        Args:
+            input_field: Element handle of the prompt input
+            prompt (str): Prompt text to insert
+            
+        Returns:
+            str: Name of the method that worked, or None if all failed
+        """
+        await input_field.click()
+        await input_field.focus()
+        
+        insert_methods = [
+            ("insert_text", lambda: self.page.keyboard.insert_text(prompt)),
+            ("paste_event", lambda: input_field.evaluate(
+                """(el, text) => {
+                    const data = new DataTransfer();
+                    data.setData('text/plain', text);
+                    el.dispatchEvent(new ClipboardEvent('paste', { clipboardData: data, bubbles: true, cancelable: true }));
+                }""",
+                prompt,
+            )),
+            ("type", lambda: input_field.type(prompt)),
+        ]
+        
+        for method_name, insert in insert_methods:
+            try:
+                await insert()
+                if self._prompt_matches(prompt, await self._read_input_text(input_field)):
+                    return method_name
+                console.print(f"[yellow]Prompt insertion via {method_name} could not be verified, trying next method...[/yellow]")
+            except Exception as e:
+                console.print(f"[yellow]Prompt insertion via {method_name} failed: {str(e)}[/yellow]")
+            await self._clear_input(input_field)
+        
+        return None
+    
+    async def wait_for_response_completion(self, max_wait_time=900, on_progress=None,
+                                           progress_interval=15, resume=False):
         """
         Wait for Claude to complete its response.
         
+        Completion is pushed from the page by a MutationObserver, so only small
+        events cross CDP while Claude is writing. A quiet page only counts as
+        finished once is_generation_finished() agrees. Falls back to polling if
+        the watcher cannot be installed.
+        
         Args:
             max_wait_time (int): Maximum time to wait in seconds (default: 15 minutes)
+            on_progress (callable, optional): Called with the partial response text
+                at most every progress_interval seconds while the text changes
+            progress_interval (float): Minimum seconds between on_progress calls
+            resume (bool): Reattaching to an existing conversation, so text that is
+                already on the page counts as the answer
             
         Returns:
             bool: True if response generation completed successfully, False otherwise
         """
+        console.print("[yellow]Waiting for response generation to complete...[/yellow]")
+        self._response_events = asyncio.Queue()
         try:
-            console.print("[yellow]Waiting for response generation to complete...[/yellow]")
+            if not await self._install_response_watcher(resume=resume):
+                console.print("[yellow]Falling back to polling for completion...[/yellow]")
+                return await self._poll_for_response_completion(max_wait_time)
             
             start_time = time.time()
-            last_content = ""
+            last_event_time = start_time
+            last_progress_time = start_time
+            response_length = 0
+            # Set when the page went quiet but did not look finished yet (no Copy
+            # button, or still streaming); the page is checked again until it does
+            awaiting_confirmation = False
+            last_confirm_check = start_time
+            # Time to first token is measured from pressing Enter in submit_prompt()
+            submitted_at = None if resume else self.last_submission_metrics.get("submitted_at")
+            spinner_chars = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
+            spinner_idx = 0
+            
+            while time.time() - start_time < max_wait_time:
+                try:
+                    event = await asyncio.wait_for(self._response_events.get(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    event = None
+                
+                now = time.time()
+                elapsed = now - start_time
+                if self.show_spinner:
+                    spinner = spinner_chars[spinner_idx % len(spinner_chars)]
+                    console.print(f"\r{spinner} Waiting for Claude to generate content... ({int(elapsed)}s elapsed, {response_length} chars)", end="")
+                    spinner_idx += 1
+                
+                if event is None:
+                    if awaiting_confirmation and now - last_confirm_check >= 2:
+                        last_confirm_check = now
+                        if await self.is_generation_finished():
+                            console.print("\n[green]Response generation completed![/green]")
+                            console.print(f"[blue]Total generation time: {int(elapsed)} seconds[/blue]")
+                            return True
+                    # A full navigation drops the observer; re-arm it if the page went quiet.
+                    # The answer may have finished while it was detached, so the text on the
+                    # page counts as the answer and the finished check below decides
+                    if now - last_event_time >= 30:
+                        await self._install_response_watcher(resume=True)
+                        last_event_time = now
+                    continue
+                
+                last_event_time = now
+                response_length = event.get("length", response_length)
+                if submitted_at and response_length > 0:
+                    self.last_submission_metrics["ttft_seconds"] = now - submitted_at
+                    tracer.record("ttft", now - submitted_at, start=submitted_at)
+                    submitted_at = None
+                if (on_progress and event.get("type") == "changed"
+                        and now - last_progress_time >= progress_interval):
+                    last_progress_time = now
+                    on_progress(await self.get_response_text())
+                if event.get("type") == "changed":
+                    awaiting_confirmation = False
+                if event.get("type") == "finished":
+                    # A closed completion stream is final; a quiet DOM may only be a pause
+                    # mid-stream or a generating indicator the watcher no longer recognizes
+                    if event.get("source") != "network" and not await self.is_generation_finished():
+                        if not awaiting_confirmation:
+                            console.print("\n[yellow]Response stopped changing but is not finished yet, still waiting...[/yellow]")
+                        awaiting_confirmation = True
+                        last_confirm_check = now
+                        continue
+                    console.print("\n[green]Response generation completed![/green]")
+                    console.print(f"[blue]Total generation time: {int(elapsed)} seconds[/blue]")
+                    return True
+            
+            # If we get here, we've timed out
+            console.print("\n[bold red]Timed out waiting for response[/bold red]")
+            return False
+            
+        except Exception as e:
+            console.print(f"\n[bold red]Error in wait_for_response_completion: {str(e)}[/bold red]")
+            return False
+        finally:
+            self._response_events = None
+            try:
+                await self.page.evaluate("() => window.__blogAutomationWatcher && window.__blogAutomationWatcher.stop()")
+            except Exception:
+                pass
+    
+    async def _poll_for_response_completion(self, max_wait_time=900):
+        """Poll the page for completion; used when the event watcher is unavailable."""
+        try:
+            
+            start_time = time.time()
+            last_length = -1
             last_change_time = time.time()
             last_spinner_update = time.time()
             completion_check_count = 0
@@ -574,29 +1174,20 @@ class ClaudeClient:
                 elapsed = current_time - start_time
                 
                 # Update spinner animation
-                if current_time - last_spinner_update >= 0.3:
+                if self.show_spinner and current_time - last_spinner_update >= 0.3:
                     spinner = spinner_chars[spinner_idx % len(spinner_chars)]
                     console.print(f"\r{spinner} Waiting for Claude to generate content... ({int(elapsed)}s elapsed)", end="")
                     spinner_idx += 1
                     last_spinner_update = current_time
                 
-                # Get current content
+                # Get the response length and generating flag in one round trip
                 try:
-                    current_content = await self.page.evaluate('''
-                        () => {
-                            const elements = document.querySelectorAll('.prose, .message-content, .claude-response');
-                            for (const el of elements) {
-                                if (el.innerText && el.innerText.trim().length > 0) {
-                                    return el.innerText;
-                                }
-                            }
-                            return '';
-                        }
-                    ''')
+                    state = await self._page_state()
+                    current_length = state["responseLength"]
                     
                     # Check if content has changed
-                    if current_content != last_content:
-                        last_content = current_content
+                    if current_length != last_length:
+                        last_length = current_length
                         last_change_time = current_time
                         completion_check_count = 0  # Reset completion check count when content changes
                     else:
@@ -605,28 +1196,11 @@ class ClaudeClient:
                         if elapsed >= 120 and (current_time - last_change_time) >= 15:
                             try:
                                 # Look for signs that generation has stopped
-                                still_generating = await self.page.evaluate('''
-                                    () => {
-                                        // Check for loading indicators
-                                        const loadingElements = document.querySelectorAll(
-                                            '.loading, .generating, .typing-indicator, [role="progressbar"]'
-                                        );
-                                        for (const el of loadingElements) {
-                                            if (el.offsetParent !== null) return true;
-                                        }
-                                        
-                                        // Check for generation text
-                                        const statusTexts = ['generating', 'thinking', 'writing'];
-                                        const pageText = document.body.innerText.toLowerCase();
-                                        return statusTexts.some(text => pageText.includes(text));
-                                    }
-                                ''')
+                                still_generating = state["generating"]
                                 
                                 if not still_generating:
                                     # Check if download button is visible
-                                    download_button = await self.page.query_selector(
-                                        'xpath=/html/body/div[2]/div[2]/div/div[3]/div/div[2]/div[1]/div[1]/div[2]/div/button[2]'
-                                    )
+                                    download_button = await self.selectors.query(self.page, "download_button")
                                     
                                     if download_button and await download_button.is_visible():
                                         console.print("\n[green]Response generation completed![/green]")
@@ -665,24 +1239,44 @@ class ClaudeClient:
         try:
             console.print("[yellow]Attempting to download content as markdown...[/yellow]")
             
+            # The captured completion stream is the exact markdown, no DOM needed
+            if self.stream_capture and self.stream_capture.armed:
+                content = await self.stream_capture.wait(timeout=10)
+                if content:
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(output_path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                    console.print(f"[green]Content saved from the completion stream to: {output_path}[/green]")
+                    return True
+                console.print("[yellow]No completion stream captured, trying the copy button...[/yellow]")
+            
             # Try direct "Copy" button first since it's more reliable
             try:
                 console.print("[yellow]Trying to copy content...[/yellow]")
-                copy_button = await self.page.query_selector('button:has-text("Copy")')
+                copy_button = await self.selectors.query(self.page, "copy_button")
                 if copy_button:
-                    await copy_button.click()
-                    await asyncio.sleep(1)
-                    
-                    # Get content from clipboard via JavaScript
-                    content = await self.page.evaluate('''
-                        async () => {
-                            try {
-                                return await navigator.clipboard.readText();
-                            } catch (e) {
-                                return null;
-                            }
-                        }
-                    ''')
+                    # Other tabs must not copy between the clear and the read
+                    async with self.clipboard_lock:
+                        # Empty the clipboard first, so a stale copy is never taken for this article
+                        await self.page.evaluate("() => navigator.clipboard.writeText('').catch(() => {})")
+                        await copy_button.click()
+                        
+                        # Get content from clipboard via JavaScript as soon as the copy has landed
+                        content = None
+                        async with self.waits.track("clipboard", replaces=1):
+                            deadline = time.time() + 3
+                            while not content and time.time() < deadline:
+                                content = await self.page.evaluate('''
+                                    async () => {
+                                        try {
+                                            return await navigator.clipboard.readText();
+                                        } catch (e) {
+                                            return null;
+                                        }
+                                    }
+                                ''')
+                                if not content:
+                                    await asyncio.sleep(0.1)
                     
                     if content:
                         # Save content to file
@@ -714,7 +1308,7 @@ class ClaudeClient:
                 
         except Exception as e:
             console.print(f"[bold red]Error saving content: {str(e)}[/bold red]")
-            await self.take_screenshot("save_content_error")
+            await self.take_screenshot("save_content_error", error=True)
             return False
     
     async def refresh_page(self) -> bool:
@@ -726,18 +1320,14 @@ class ClaudeClient:
             current_url = self.page.url
             
             # Refresh the page
-            await self.page.reload()
-            
-            # Wait for navigation to complete
-            await self.page.wait_for_load_state("networkidle")
+            await self.page.reload(wait_until="domcontentloaded")
             
             # Navigate back to the original URL if needed
             if current_url and current_url != self.page.url:
-                await self.page.goto(current_url)
-                await self.page.wait_for_load_state("networkidle")
+                await self.page.goto(current_url, wait_until="domcontentloaded")
             
-            # Wait for the page to be fully interactive
-            await self.page.wait_for_timeout(2000)
+            # Wait for the page to be interactive
+            await self._wait_for_page_ready("refresh_ready", replaces=2)
             
             console.print("[green]Page refreshed successfully![/green]")
             return True
@@ -755,19 +1345,6 @@ class ClaudeClient:
             # Multiple strategies to identify and extract Claude's response with resilience
             console.print("[yellow]Attempting to extract response text...[/yellow]")
             
-            # Various selectors that might contain Claude's response
-            response_selectors = [
-                '.message.assistant',  # Common Claude response container
-                '.claude-response',
-                '.message-container.assistant',
-                '.message-content.assistant',
-                '.prose',  # Often contains the formatted text
-                '[data-message-author-role="assistant"]',  # Role-based selector
-                '[role="region"][aria-label*="message"]',  # Accessibility-based selector
-                '.anthropic-message',  # Anthropic specific class
-                '.assistant-message'
-            ]
-            
             # Try multiple extraction strategies with retries
             max_retries = 3
             for attempt in range(max_retries):
@@ -775,19 +1352,30 @@ class ClaudeClient:
                     # First try to get the latest/last assistant message
                     response_text = None
                     
+                    # Strategy 0: The newest assistant turn, found by its stable attributes,
+                    # converted from its HTML so headings, lists and tables survive
+                    try:
+                        message = await call_helper(self.page, "lastAssistantMessage", True, True)
+                        if message["scope"] == "turn" and message["text"] and message["text"].strip():
+                            response_text = html_to_markdown(message["html"], scoped=False) or message["text"]
+                            console.print("[green]Successfully extracted the newest assistant turn as Markdown[/green]")
+                    except Exception as helper_error:
+                        console.print(f"[yellow]Scoped extraction failed: {str(helper_error)}[/yellow]")
+                    
                     # Strategy 1: Look for specific response selectors
-                    for selector in response_selectors:
+                    if not response_text:
                         try:
-                            elements = await self.page.query_selector_all(selector)
-                            if elements and len(elements) > 0:
+                            elements = await self.selectors.query_all(self.page, "response")
+                            if elements:
                                 # Get the last/most recent assistant message
-                                last_element = elements[-1]
-                                response_text = await last_element.inner_text()
+                                response_text = await elements[-1].inner_text()
                                 if response_text and len(response_text.strip()) > 0:
-                                    console.print(f"[green]Successfully extracted response using selector: {selector}[/green]")
-                                    break
+                                    console.print(f"[green]Successfully extracted response using selector: {self.selectors.current('response')}[/green]")
+                                else:
+                                    # Matched an empty element; probe the full list next attempt
+                                    self.selectors.forget("response")
                         except Exception as selector_error:
-                            console.print(f"[yellow]Error with selector {selector}: {str(selector_error)}[/yellow]")
+                            console.print(f"[yellow]Error with response selectors: {str(selector_error)}[/yellow]")
                     
                     # Strategy 2: Try JavaScript evaluation if selectors failed
                     if not response_text or len(response_text.strip()) == 0:
@@ -839,14 +1427,9 @@ class ClaudeClient:
                             # Get entire page content and try to identify Claude's response
                             page_content = await self.page.content()
                             
-                            # Parse HTML content to find response
-                            from bs4 import BeautifulSoup
-                            soup = BeautifulSoup(page_content, 'html.parser')
-                            
-                            # Look for common response container patterns
-                            assistant_elements = soup.select('.message.assistant, .claude-response, .prose')
-                            if assistant_elements and len(assistant_elements) > 0:
-                                response_text = assistant_elements[-1].get_text(strip=True)
+                            # Convert the newest answer in the snapshot to Markdown offline
+                            response_text = html_to_markdown(page_content)
+                            if response_text:
                                 console.print("[green]Successfully extracted response using HTML parsing[/green]")
                         except Exception as content_error:
                             console.print(f"[yellow]Page content extraction failed: {str(content_error)}[/yellow]")
@@ -870,38 +1453,77 @@ class ClaudeClient:
                     console.print(f"[yellow]Attempt {attempt+1}/{max_retries} failed to extract response text.[/yellow]")
                     
                     # Take an additional screenshot to diagnose issues
-                    await self.take_screenshot(f"extraction_attempt_{attempt+1}_failed")
+                    await self.take_screenshot(f"extraction_attempt_{attempt+1}_failed", error=True)
                     
                     if attempt < max_retries - 1:
                         # Wait and try again if not last attempt
-                        console.print("[yellow]Waiting a moment before trying again...[/yellow]")
-                        await asyncio.sleep(5)  # Wait 5 seconds before retrying
+                        console.print("[yellow]Waiting for response text before trying again...[/yellow]")
+                        await self.waits.until(
+                            self.page, "response_attached", RESPONSE_ATTACHED_JS, timeout=5000, replaces=5
+                        )
                         
                         # Try refreshing the page for the next attempt if we're still not seeing content
                         if attempt == 1:  # Only try refreshing once
                             console.print("[yellow]Refreshing page for next extraction attempt...[/yellow]")
                             await self.refresh_page()
-                            await asyncio.sleep(3)
+                            await self.waits.until(
+                                self.page, "response_attached", RESPONSE_ATTACHED_JS, timeout=10000, replaces=3
+                            )
                 
                 except Exception as attempt_error:
                     console.print(f"[bold red]Error during extraction attempt {attempt+1}: {str(attempt_error)}[/bold red]")
-                    await self.take_screenshot(f"extraction_error_{attempt+1}")
+                    await self.take_screenshot(f"extraction_error_{attempt+1}", error=True)
                     
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(5)  # Wait before retry
+                        await self.waits.until(
+                            self.page, "response_attached", RESPONSE_ATTACHED_JS, timeout=5000, replaces=5
+                        )
             
             # If we got here, all extraction attempts failed
             console.print("[bold red]Could not extract response text[/bold red]")
-            await self.take_screenshot("empty_response")
+            await self.take_screenshot("empty_response", error=True)
             return None
             
         except Exception as e:
             console.print(f"[bold red]Failed to get response from Claude: {str(e)}[/bold red]")
-            await self.take_screenshot("extraction_critical_error")
+            await self.take_screenshot("extraction_critical_error", error=True)
             return None
     
     async def close(self):
         """Close the browser and clean up resources."""
+        if self.stream_capture:
+            self.stream_capture.detach()
+        # Workers only own their tab; the context belongs to the parent client
+        if self.is_worker:
+            await self.screenshots.flush()
+            try:
+                if self.page and not self.page.is_closed():
+                    await self.page.close()
+            except Exception as e:
+                console.print(f"[yellow]Error closing worker tab {self.name}: {str(e)}[/yellow]")
+            return
+        
+        for worker in self.workers:
+            await worker.close()
+        self.workers = []
+        await self.screenshots.flush()
+        if self.lean:
+            console.print(f"[dim]Lean mode blocked {self.blocked_requests} requests[/dim]")
+        
+        if self.using_existing_browser:
+            # The daemon's browser keeps running; only close this run's tab and disconnect
+            try:
+                if self.page and not self.page.is_closed():
+                    await self.page.close()
+                if self.cdp_browser:
+                    await self.cdp_browser.close()
+                if self.playwright:
+                    await self.playwright.stop()
+                console.print("[yellow]Detached from browser daemon.[/yellow]")
+            except Exception as e:
+                console.print(f"[yellow]Error detaching from browser daemon: {str(e)}[/yellow]")
+            return
+        
         try:
             # Special handling for persistent context
             if self.browser:
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Corpus rebuilder for the BlogAutomation2 project.
+Re-renders the PDFs of completed articles after a template or style change,
+skipping articles whose PDF is already up to date and rendering the rest in
+parallel on all CPU cores.
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional, Tuple
+from file_manager import FileManager, render_pdf_in_worker
+from job_checkpoint import JobCheckpoint
+from pdf_renderer import ChromiumPdfRenderer
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+from rich.table import Table
+
+console = Console()
+
+# An article to render: (markdown path, article directory, keyword)
+Article = Tuple[Path, Path, str]
+
+def find_article(article_dir: Path) -> Optional[Article]:
+    """
+    Locate the markdown file and keyword of one {index}_{keyword} directory.
+
+    The keyword comes from job.json when the article has one, otherwise it is
+    derived from the directory name.
+
+    Args:
+        article_dir (Path): Article directory
+
+    Returns:
+        Article: (markdown path, directory, keyword), or None if there is no finished markdown
+    """
+    checkpoint_path = article_dir / JobCheckpoint.FILE_NAME
+    if checkpoint_path.exists():
+        checkpoint = JobCheckpoint.load(checkpoint_path)
+        if checkpoint and checkpoint.state == "done" and checkpoint.markdown_path.exists():
+            return checkpoint.markdown_path, article_dir, checkpoint.keyword
+        if checkpoint and checkpoint.state != "done":
+            # Still being generated or failed; nothing final to render
+            return None
+
+    markdown_files = sorted(
+        path for path in article_dir.glob("*.md") if not path.name.endswith(".partial.md")
+    )
+    if not markdown_files:
+        return None
+    keyword = article_dir.name.split("_", 1)[-1].replace("_", " ")
+    return markdown_files[0], article_dir, keyword
+
+def find_articles(completed_dir: Path) -> List[Article]:
+    """Find every finished article below the completed content folder."""
+    articles = []
+    for article_dir in sorted(path for path in completed_dir.iterdir() if path.is_dir()):
+        article = find_article(article_dir)
+        if article:
+            articles.append(article)
+    return articles
+
+class CorpusRebuilder:
+    """Incrementally re-renders the PDFs of the completed article corpus."""
+
+    def __init__(self, file_manager: FileManager, workers: Optional[int] = None,
+                 backend: str = "pdfkit", force: bool = False):
+        """
+        Initialize the rebuilder.
+
+        Args:
+            file_manager (FileManager): File manager of the completed content folder
+            workers (int, optional): Render processes for wkhtmltopdf (default: CPU count)
+            backend (str): "pdfkit" or "chromium"
+            force (bool): Re-render every article, even if it is up to date
+        """
+        self.file_manager = file_manager
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.backend = backend
+        self.force = force
+        self.rendered = 0
+        self.up_to_date = 0
+        self.failed: List[Tuple[str, str]] = []
+
+    def stale_articles(self, articles: List[Article]) -> List[Article]:
+        """Drop articles whose PDF already matches their markdown, template and CSS."""
+        if self.force:
+            return list(articles)
+        stale = [
+            article for article in articles
+            if not self.file_manager.is_pdf_current(*article, backend=self.backend)
+        ]
+        self.up_to_date += len(articles) - len(stale)
+        return stale
+
+    def _record(self, article: Article, pdf_path: Optional[Path], error: Optional[str] = None):
+        """Count the outcome of one render."""
+        if pdf_path:
+            self.rendered += 1
+        else:
+            self.failed.append((str(article[1]), error or "rendering failed"))
+
+    def _render_with_processes(self, articles: List[Article], progress: Progress, task):
+        """Render with wkhtmltopdf in a process pool."""
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+            futures = {
+                executor.submit(
+                    render_pdf_in_worker, self.file_manager.output_dir, markdown_path,
+                    article_dir, keyword, True,
+                ): (markdown_path, article_dir, keyword)
+                for markdown_path, article_dir, keyword in articles
+            }
+            for future in as_completed(futures):
+                try:
+                    self._record(futures[future], future.result())
+                except Exception as e:
+                    self._record(futures[future], None, str(e))
+                progress.advance(task)
+
+    async def _render_with_chromium(self, articles: List[Article], progress: Progress, task):
+        """Render one after another in a single headless Chromium page."""
+        renderer = ChromiumPdfRenderer()
+        self.file_manager.pdf_renderer = renderer
+        try:
+            for markdown_path, article_dir, keyword in articles:
+                try:
+                    pdf_path = await self.file_manager.render_pdf(markdown_path, article_dir, keyword, force=True)
+                    self._record((markdown_path, article_dir, keyword), pdf_path)
+                except Exception as e:
+                    self._record((markdown_path, article_dir, keyword), None, str(e))
+                progress.advance(task)
+        finally:
+            await renderer.close()
+            self.file_manager.pdf_renderer = None
+
+    def rebuild(self) -> bool:
+        """
+        Re-render every stale article and print the totals.
+
+        Returns:
+            bool: True if no article failed
+        """
+        started_at = time.time()
+        articles = find_articles(self.file_manager.output_dir)
+        stale = self.stale_articles(articles)
+        console.print(
+            f"[blue]Articles: {len(articles)}, up to date: {self.up_to_date}, "
+            f"to render: {len(stale)}[/blue]"
+        )
+
+        if stale:
+            with Progress(
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TimeElapsedColumn(),
+                console=console,
+            ) as progress:
+                task = progress.add_task("[yellow]Rendering PDFs...", total=len(stale))
+                if self.backend == "chromium":
+                    asyncio.run(self._render_with_chromium(stale, progress, task))
+                else:
+                    self._render_with_processes(stale, progress, task)
+
+        self.print_summary(len(articles), time.time() - started_at)
+        return not self.failed
+
+    def print_summary(self, total: int, elapsed: float):
+        """Print the rebuild totals."""
+        table = Table(title="Corpus rebuild")
+        table.add_column("Articles", justify="right")
+        table.add_column("Up to date", justify="right")
+        table.add_column("Rendered", justify="right")
+        table.add_column("Failed", justify="right")
+        table.add_column("Time (s)", justify="right")
+        table.add_row(str(total), str(self.up_to_date), str(self.rendered), str(len(self.failed)), f"{elapsed:.1f}")
+        console.print(table)
+
+        for article_dir, error in self.failed:
+            console.print(f"[red]Failed: {article_dir}: {error}[/red]")
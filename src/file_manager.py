@@ -2,24 +2,100 @@
 """
 File manager for handling file operations in the BlogAutomation2 project.
 """
+import json
 import os
 import shutil
 from pathlib import Path
+from typing import Optional
 import pdfkit
+from article_renderer import ArticleRenderer
+from index_allocator import IndexAllocator
+from job_checkpoint import write_atomic
+from pdf_renderer import ChromiumPdfRenderer
+from tracing import traced_methods
 from rich.console import Console
 
 console = Console()
 
+@traced_methods({
+    "save_as_markdown": "markdown_save",
+    "render_pdf": "pdf_render",
+    "build_html": "html_render",
+})
 class FileManager:
     """Manages file operations for blog automation."""
     
-    def __init__(self, output_dir: Path):
-        """Initialize the file manager with the path to the output directory."""
+    # Per-article record of the inputs its PDF was rendered from
+    RENDER_MANIFEST = "render.json"
+    
+    def __init__(self, output_dir: Path, pdf_renderer: ChromiumPdfRenderer = None,
+                 article_renderer: ArticleRenderer = None):
+        """
+        Initialize the file manager with the path to the output directory.
+        
+        Args:
+            output_dir (Path): Root folder for completed articles
+            pdf_renderer (ChromiumPdfRenderer, optional): Render PDFs with headless
+                Chromium instead of wkhtmltopdf
+            article_renderer (ArticleRenderer, optional): Markdown to HTML renderer
+                (default: content/templates with the cache in cache/render)
+        """
         self.output_dir = output_dir
+        self.pdf_renderer = pdf_renderer
+        self.article_renderer = article_renderer or ArticleRenderer()
         
         # Create output directory if it doesn't exist
         if not self.output_dir.exists():
             self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        self.index_allocator = IndexAllocator(self.output_dir)
+    
+    def _safe_keyword(self, keyword: str) -> str:
+        """Sanitize a keyword for use in directory and file names."""
+        safe_keyword = "".join(c if c.isalnum() or c in [' ', '-'] else '_' for c in keyword)
+        return safe_keyword.replace(' ', '_').lower()
+    
+    def markdown_path(self, output_dir: Path, keyword: str) -> Path:
+        """Path of a keyword's markdown article inside its directory."""
+        return output_dir / f"{self._safe_keyword(keyword)}.md"
+    
+    def allocate_completed_content_structure(self, keyword: str) -> Path:
+        """
+        Reserve the next index and create its {index}_{keyword} directory.
+        
+        Safe to call from several processes at once; every call gets its own
+        index and a directory that did not exist before.
+        
+        Args:
+            keyword (str): The keyword for the content
+            
+        Returns:
+            Path: Path to the created directory
+        """
+        index, dir_path = self.index_allocator.allocate(self._safe_keyword(keyword))
+        console.print(f"[green]Created directory structure: {dir_path}[/green]")
+        return dir_path
+    
+    def find_completed_content_structure(self, keyword: str) -> Optional[Path]:
+        """
+        Find the newest existing {index}_{keyword} directory of a keyword.
+        
+        This scans the output directory, so it is meant for occasional lookups
+        (e.g. reusing an article's folder), not for every new article.
+        
+        Args:
+            keyword (str): The keyword for the content
+            
+        Returns:
+            Path: The directory with the highest index, or None if there is none
+        """
+        suffix = f"_{self._safe_keyword(keyword)}"
+        newest, newest_index = None, -1
+        for entry in os.scandir(self.output_dir):
+            index_str = entry.name[:-len(suffix)] if entry.name.endswith(suffix) else ""
+            if index_str.isdigit() and int(index_str) > newest_index and entry.is_dir():
+                newest, newest_index = Path(entry.path), int(index_str)
+        return newest
     
     def create_completed_content_structure(self, index: int, keyword: str) -> Path:
         """
@@ -32,49 +108,34 @@ class FileManager:
         Returns:
             Path: Path to the created directory
         """
-        # Sanitize keyword for use in directory name
-        safe_keyword = "".join(c if c.isalnum() or c in [' ', '-'] else '_' for c in keyword)
-        safe_keyword = safe_keyword.replace(' ', '_').lower()
-        
         # Create directory path with format: {index}_{keyword}
-        dir_name = f"{index}_{safe_keyword}"
+        dir_name = f"{index}_{self._safe_keyword(keyword)}"
         dir_path = self.output_dir / dir_name
         
         # Create directory if it doesn't exist
+        if dir_path.exists():
+            console.print(f"[yellow]Reusing existing directory: {dir_path}[/yellow]")
         dir_path.mkdir(parents=True, exist_ok=True)
         console.print(f"[green]Created directory structure: {dir_path}[/green]")
         
         return dir_path
     
     def get_next_index(self) -> int:
-        """Get the next available index number for content folders."""
+        """
+        Get the next available index number for content folders.
+        
+        This only peeks at the counter; use allocate_completed_content_structure()
+        to actually reserve an index.
+        """
         try:
-            # List all directories in the output directory
-            existing_dirs = [d for d in self.output_dir.iterdir() if d.is_dir()]
-            
-            # Extract indices from directory names
-            indices = []
-            for dir_path in existing_dirs:
-                try:
-                    # Try to get the index from the directory name (format: {index}_{keyword})
-                    index_str = dir_path.name.split('_')[0]
-                    if index_str.isdigit():
-                        indices.append(int(index_str))
-                except (IndexError, ValueError):
-                    continue
-            
-            # Return next available index (max + 1), or 1 if no directories exist
-            return max(indices, default=0) + 1
-            
+            return self.index_allocator.peek()
         except Exception as e:
             console.print(f"[yellow]Error getting next index: {str(e)}. Using 1.[/yellow]")
             return 1
     
     def create_output_dir(self, keyword: str) -> Path:
         """Create a directory for the output files based on the keyword."""
-        # Sanitize keyword for use in directory name
-        safe_keyword = "".join(c if c.isalnum() or c in [' ', '-'] else '_' for c in keyword)
-        safe_keyword = safe_keyword.replace(' ', '_').lower()
+        safe_keyword = self._safe_keyword(keyword)
         
         # Create directory path
         dir_path = self.output_dir / f"01_{safe_keyword}"
@@ -86,12 +147,7 @@ class FileManager:
     
     def save_as_markdown(self, content: str, output_dir: Path, keyword: str) -> Path:
         """Save content as markdown file."""
-        # Sanitize keyword for use in filename
-        safe_keyword = "".join(c if c.isalnum() or c in [' ', '-'] else '_' for c in keyword)
-        safe_keyword = safe_keyword.replace(' ', '_').lower()
-        
-        # Create file path
-        file_path = output_dir / f"{safe_keyword}.md"
+        file_path = self.markdown_path(output_dir, keyword)
         
         # Save content to file
         try:
@@ -103,52 +159,79 @@ class FileManager:
             console.print(f"[bold red]Error saving markdown file: {str(e)}[/bold red]")
             return None
     
-    def save_as_pdf(self, markdown_path: Path, output_dir: Path, keyword: str) -> Path:
-        """Convert markdown to PDF and save."""
+    def build_html(self, markdown_content: str, keyword: str) -> str:
+        """Render article markdown to the HTML page used for PDF rendering."""
+        return self.article_renderer.render_html(markdown_content, keyword)
+    
+    def _pdf_backend(self) -> str:
+        """Name of the backend render_pdf() will use."""
+        return "chromium" if self.pdf_renderer else "pdfkit"
+    
+    def _is_render_current(self, output_dir: Path, pdf_path: Path, render_key: str, backend: str) -> bool:
+        """Check whether the PDF was already rendered from exactly these inputs."""
+        if not pdf_path.exists():
+            return False
+        try:
+            with open(output_dir / self.RENDER_MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return False
+        return manifest.get("render_key") == render_key and manifest.get("backend") == backend
+    
+    def is_pdf_current(self, markdown_path: Path, output_dir: Path, keyword: str, backend: str = "pdfkit") -> bool:
+        """
+        Check whether the article's PDF is up to date with its markdown, template and CSS.
+        
+        Args:
+            markdown_path (Path): Markdown file of the article
+            output_dir (Path): Article directory holding the PDF and render.json
+            keyword (str): Keyword used for the title and file name
+            backend (str): PDF backend the PDF must have been rendered with
+            
+        Returns:
+            bool: True if rendering again would produce the same PDF
+        """
+        try:
+            with open(markdown_path, "r", encoding="utf-8") as f:
+                markdown_content = f.read()
+        except OSError:
+            return False
+        pdf_path = output_dir / f"{self._safe_keyword(keyword)}.pdf"
+        render_key = self.article_renderer.render_key(markdown_content, keyword)
+        return self._is_render_current(output_dir, pdf_path, render_key, backend)
+    
+    def _record_render(self, output_dir: Path, pdf_path: Path, render_key: str, backend: str):
+        """Remember which inputs the PDF in output_dir was rendered from."""
+        manifest = {"pdf": pdf_path.name, "render_key": render_key, "backend": backend}
+        write_atomic(output_dir / self.RENDER_MANIFEST, json.dumps(manifest, indent=2))
+    
+    def _read_markdown(self, markdown_path: Path):
+        """Read a markdown file, or return None if it is missing."""
         if not markdown_path or not markdown_path.exists():
             console.print("[bold red]Markdown file not found.[/bold red]")
             return None
+        with open(markdown_path, "r", encoding="utf-8") as f:
+            return f.read()
+    
+    def save_as_pdf(self, markdown_path: Path, output_dir: Path, keyword: str, force: bool = False) -> Path:
+        """
+        Convert markdown to PDF with wkhtmltopdf and save.
         
-        # Sanitize keyword for use in filename
-        safe_keyword = "".join(c if c.isalnum() or c in [' ', '-'] else '_' for c in keyword)
-        safe_keyword = safe_keyword.replace(' ', '_').lower()
-        
+        Skipped if the PDF was already rendered from the same markdown, template
+        and CSS, unless force is set.
+        """
         # Create file path
-        pdf_path = output_dir / f"{safe_keyword}.pdf"
+        pdf_path = output_dir / f"{self._safe_keyword(keyword)}.pdf"
         
         try:
-            # Read markdown content
-            with open(markdown_path, "r", encoding="utf-8") as f:
-                markdown_content = f.read()
-            
-            # Convert markdown to HTML
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <title>{keyword}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }}
-                    h1 {{ font-size: 24px; margin-top: 24px; }}
-                    h2 {{ font-size: 20px; margin-top: 20px; }}
-                    h3 {{ font-size: 16px; margin-top: 16px; }}
-                    p {{ margin: 16px 0; }}
-                    table {{ border-collapse: collapse; width: 100%; }}
-                    th, td {{ border: 1px solid #ddd; padding: 8px; }}
-                    th {{ padding-top: 12px; padding-bottom: 12px; text-align: left; background-color: #f2f2f2; }}
-                </style>
-            </head>
-            <body>
-                {markdown_content}
-            </body>
-            </html>
-            """
-            
-            # Save HTML to temporary file
-            html_path = output_dir / f"{safe_keyword}_temp.html"
-            with open(html_path, "w", encoding="utf-8") as f:
-                f.write(html_content)
+            markdown_content = self._read_markdown(markdown_path)
+            if markdown_content is None:
+                return None
+            render_key = self.article_renderer.render_key(markdown_content, keyword)
+            if not force and self._is_render_current(output_dir, pdf_path, render_key, "pdfkit"):
+                console.print(f"[blue]PDF is up to date: {pdf_path}[/blue]")
+                return pdf_path
+            html_content = self.build_html(markdown_content, keyword)
             
             # Convert HTML to PDF
             options = {
@@ -160,10 +243,9 @@ class FileManager:
                 'encoding': 'UTF-8',
             }
             
-            pdfkit.from_file(str(html_path), str(pdf_path), options=options)
-            
-            # Remove temporary HTML file
-            html_path.unlink()
+            # Pass the HTML in memory so no temporary file can be left behind
+            pdfkit.from_string(html_content, str(pdf_path), options=options)
+            self._record_render(output_dir, pdf_path, render_key, "pdfkit")
             
             console.print(f"[green]Content saved as PDF: {pdf_path}[/green]")
             return pdf_path
@@ -171,4 +253,66 @@ class FileManager:
         except Exception as e:
             console.print(f"[bold red]Error saving PDF file: {str(e)}[/bold red]")
             console.print("[yellow]Note: PDF conversion requires wkhtmltopdf to be installed.[/yellow]")
-            return None
\ No newline at end of file
+            return None
+    
+    async def render_pdf(self, markdown_path: Path, output_dir: Path, keyword: str, force: bool = False) -> Path:
+        """
+        Convert markdown to PDF with the configured backend.
+        
+        Uses the long-lived headless Chromium page if a renderer was given,
+        otherwise wkhtmltopdf via save_as_pdf(). PDFs already rendered from the
+        same inputs are kept as they are.
+        
+        Args:
+            markdown_path (Path): Markdown file to render
+            output_dir (Path): Directory for the PDF
+            keyword (str): Keyword used for the title and file name
+            force (bool): Render even if the PDF is up to date
+            
+        Returns:
+            Path: Path to the PDF, or None if rendering failed
+        """
+        if not self.pdf_renderer:
+            return self.save_as_pdf(markdown_path, output_dir, keyword, force=force)
+        
+        markdown_content = self._read_markdown(markdown_path)
+        if markdown_content is None:
+            return None
+        
+        pdf_path = output_dir / f"{self._safe_keyword(keyword)}.pdf"
+        render_key = self.article_renderer.render_key(markdown_content, keyword)
+        if not force and self._is_render_current(output_dir, pdf_path, render_key, "chromium"):
+            console.print(f"[blue]PDF is up to date: {pdf_path}[/blue]")
+            return pdf_path
+        
+        pdf_path = await self.pdf_renderer.render(self.build_html(markdown_content, keyword), pdf_path)
+        if pdf_path:
+            self._record_render(output_dir, pdf_path, render_key, "chromium")
+            console.print(f"[green]Content saved as PDF: {pdf_path}[/green]")
+        return pdf_path
+
+# FileManager of a render worker process, created on its first job
+_worker_file_manager = None
+
+def render_pdf_in_worker(output_root: Path, markdown_path: Path, output_dir: Path, keyword: str,
+                         force: bool = False):
+    """
+    Render one PDF with wkhtmltopdf inside a ProcessPoolExecutor worker.
+    
+    Module-level so it can be pickled; each worker process keeps its own
+    FileManager (and render cache handle) between jobs.
+    
+    Args:
+        output_root (Path): Root folder for completed articles
+        markdown_path (Path): Markdown file to render
+        output_dir (Path): Directory for the PDF
+        keyword (str): Keyword used for the title and file name
+        force (bool): Render even if the PDF is up to date
+        
+    Returns:
+        Path: Path to the PDF, or None if rendering failed
+    """
+    global _worker_file_manager
+    if _worker_file_manager is None or _worker_file_manager.output_dir != output_root:
+        _worker_file_manager = FileManager(output_root)
+    return _worker_file_manager.save_as_pdf(markdown_path, output_dir, keyword, force=force)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Generation cache for the BlogAutomation2 project.
+Keeps generated article markdown keyed by keyword, prompt template and Claude
+project, so a re-queued keyword does not pay for another generation.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from job_checkpoint import write_atomic
+from keyword_manager import normalize_keyword
+from rich.console import Console
+
+console = Console()
+
+class GenerationCache:
+    """Content-addressed store of generated articles with size-based eviction."""
+
+    def __init__(self, cache_dir: Path = Path("cache/generations"), max_bytes: int = 500 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (Path): Folder holding <key>.md articles and <key>.json metadata
+            max_bytes (int): Size limit; least recently used entries are evicted above it
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(keyword: str, template_hash: str, project: str) -> str:
+        """Hash the normalized keyword, prompt template hash and Claude project into a cache key."""
+        digest = hashlib.sha256()
+        for part in (normalize_keyword(keyword), template_hash or "", project or ""):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _paths(self, key: str):
+        """Markdown and metadata paths of a cache entry."""
+        entry_dir = self.cache_dir / key[:2]
+        return entry_dir / f"{key}.md", entry_dir / f"{key}.json"
+
+    def get(self, keyword: str, template_hash: str, project: str) -> Optional[str]:
+        """
+        Look up a generated article.
+
+        Returns:
+            str: The cached markdown, or None on a miss
+        """
+        markdown_path, _ = self._paths(self.key(keyword, template_hash, project))
+        try:
+            with open(markdown_path, "r", encoding="utf-8") as f:
+                markdown = f.read()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        # The modification time doubles as the last-use time for eviction
+        os.utime(markdown_path)
+        self.hits += 1
+        return markdown
+
+    def put(self, keyword: str, template_hash: str, project: str, markdown: str, **metadata):
+        """
+        Store a generated article and evict old entries if the cache is too large.
+
+        Args:
+            keyword (str): Keyword the article was generated for
+            template_hash (str): Hash of the prompt template
+            project (str): Claude project URL the article was generated in
+            markdown (str): Article markdown
+            **metadata: Extra fields for the metadata file (e.g. conversation_url)
+        """
+        if not markdown:
+            return
+        key = self.key(keyword, template_hash, project)
+        markdown_path, metadata_path = self._paths(key)
+        if markdown_path.exists():
+            # Same key, same article (e.g. one restored from the cache)
+            os.utime(markdown_path)
+            return
+        try:
+            markdown_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(markdown_path, markdown)
+            write_atomic(metadata_path, json.dumps({
+                "keyword": keyword,
+                "template_hash": template_hash,
+                "project": project,
+                "chars": len(markdown),
+                "created_at": time.time(),
+                **metadata,
+            }, ensure_ascii=False, indent=2))
+        except OSError as e:
+            console.print(f"[yellow]Could not cache generated article: {str(e)}[/yellow]")
+            return
+        self.evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        """All cached markdown files."""
+        if not self.cache_dir.exists():
+            return []
+        entries = []
+        for shard in os.scandir(self.cache_dir):
+            if shard.is_dir():
+                entries.extend(entry for entry in os.scandir(shard.path) if entry.name.endswith(".md"))
+        return entries
+
+    def _remove(self, markdown_path: Path):
+        """Delete one entry (markdown and metadata)."""
+        for path in (markdown_path, markdown_path.with_suffix(".json")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits into max_bytes.
+
+        Returns:
+            int: Number of removed entries
+        """
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, Path(entry.path)) for entry in self._entries()]
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def invalidate(self, keywords: Iterable[str] = (), template_hash: Optional[str] = None) -> int:
+        """
+        Remove entries for the given keywords and/or template hash.
+
+        Args:
+            keywords (Iterable[str]): Keywords whose entries are removed (any template)
+            template_hash (str, optional): Remove every entry generated with this template
+
+        Returns:
+            int: Number of removed entries
+        """
+        keyword_keys = {normalize_keyword(keyword) for keyword in keywords}
+        removed = 0
+        for entry in self._entries():
+            markdown_path = Path(entry.path)
+            try:
+                with open(markdown_path.with_suffix(".json"), "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+            except (OSError, ValueError):
+                metadata = {}
+            if (normalize_keyword(metadata.get("keyword", "")) in keyword_keys
+                    or (template_hash and metadata.get("template_hash") == template_hash)):
+                self._remove(markdown_path)
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry and return how many there were."""
+        entries = self._entries()
+        for entry in entries:
+            self._remove(Path(entry.path))
+        return len(entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of entries and their total size."""
+        entries = self._entries()
+        return {"entries": len(entries), "bytes": sum(entry.stat().st_size for entry in entries)}
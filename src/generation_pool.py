@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Generation pool for the BlogAutomation2 project.
+Runs several keyword jobs in parallel on tabs of one persistent browser context.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, List
+from claude_client import ClaudeClient
+from rich.console import Console
+
+console = Console()
+
+class GenerationPool:
+    """Hands out idle browser tabs to keyword jobs with a concurrency limit."""
+
+    def __init__(self, client: ClaudeClient, concurrency: int = 2):
+        """
+        Initialize the pool.
+
+        Args:
+            client (ClaudeClient): Started client whose context the tabs share
+            concurrency (int): Maximum number of jobs (tabs) running at once
+        """
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.idle_workers: asyncio.Queue = asyncio.Queue()
+        self.workers: List[ClaudeClient] = []
+
+    async def start(self):
+        """Open the worker tabs; the main client's tab is reused as the first worker."""
+        self.workers = [self.client]
+        for _ in range(self.concurrency - 1):
+            try:
+                self.workers.append(await self.client.spawn_worker())
+            except Exception as e:
+                # Run with fewer tabs rather than not at all
+                console.print(f"[yellow]Could not open worker tab: {str(e)}[/yellow]")
+                break
+
+        if len(self.workers) > 1:
+            # Interleaved spinners from several tabs are unreadable
+            self.client.show_spinner = False
+        for worker in self.workers:
+            self.idle_workers.put_nowait(worker)
+        console.print(f"[green]Generation pool ready with {len(self.workers)} tab(s)[/green]")
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        job: Callable[[ClaudeClient, Any], Awaitable[Any]],
+    ) -> List[Any]:
+        """
+        Run a job for every item, each on its own idle tab.
+
+        Args:
+            items (Iterable): Work items, e.g. keywords
+            job (Callable): Coroutine function called as job(worker, item)
+
+        Returns:
+            List: Job results in item order; a failed job yields its exception
+        """
+        tasks = [asyncio.create_task(self._run_one(item, job)) for item in items]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_one(self, item: Any, job: Callable[[ClaudeClient, Any], Awaitable[Any]]) -> Any:
+        """Wait for an idle tab, run the job on it and hand the tab back."""
+        worker = await self.idle_workers.get()
+        try:
+            return await job(worker, item)
+        finally:
+            self.idle_workers.put_nowait(worker)
+
+    async def close(self):
+        """Close the worker tabs; the main client is closed by its owner."""
+        for worker in self.workers:
+            if worker is not self.client:
+                await worker.close()
+                if worker in self.client.workers:
+                    self.client.workers.remove(worker)
+        self.workers = []
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+HTML-to-Markdown converter for the BlogAutomation2 project.
+Turns a snapshot of Claude's rendered answer (the newest assistant turn, or a
+whole page.content() snapshot) back into Markdown offline, keeping headings,
+lists, tables, code and emphasis that innerText loses. The tree is walked
+once; lxml is used to parse when it is installed.
+"""
+import re
+from typing import List
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, PreformattedString
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Same turn and answer selectors as the page helpers (page_helpers.PAGE_HELPERS_JS)
+TURN_SELECTOR = '[data-is-streaming], [data-message-author-role="assistant"], [data-testid="assistant-message"]'
+CONTENT_SELECTORS = [".font-claude-message", ".prose", ".message-content"]
+RESPONSE_SELECTOR = ".prose, .message-content, .claude-response"
+
+# Elements that never hold answer text
+SKIP_TAGS = {"head", "script", "style", "noscript", "template", "button", "svg", "input", "textarea", "select"}
+
+# Elements that start a new Markdown block; anything else is inline
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "html", "li", "main", "nav", "ol", "p", "pre", "section", "summary",
+    "table", "ul",
+}
+
+HEADING_LEVELS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+INLINE_MARKS = {"strong": "**", "b": "**", "em": "*", "i": "*", "del": "~~", "s": "~~", "strike": "~~"}
+
+WHITESPACE = re.compile(r"\s+")
+
+# Characters in answer text that Markdown would read as markup
+INLINE_SPECIAL = re.compile(r"([\\`*_\[\]])")
+
+# Text at the start of a line that Markdown would read as a heading, quote,
+# list item, rule or setext underline; ordered markers are escaped at the dot
+BLOCK_MARKER = re.compile(r"(#{1,6}(\s|$)|>|[-+](\s|$)|[-=]+\s*$)")
+ORDERED_MARKER = re.compile(r"(\d+)([.)]\s)")
+
+def escape_text(text: str) -> str:
+    """Escape the inline Markdown characters of a text node, collapsing whitespace."""
+    return INLINE_SPECIAL.sub(r"\\\1", WHITESPACE.sub(" ", text))
+
+def escape_line_start(line: str) -> str:
+    """Escape text at the start of a paragraph line that would start a Markdown block."""
+    match = ORDERED_MARKER.match(line)
+    if match:
+        return f"{match.group(1)}\\{line[len(match.group(1)):]}"
+    if BLOCK_MARKER.match(line):
+        return "\\" + line
+    return line
+
+def find_answer(soup):
+    """
+    Locate the newest assistant answer in a parsed snapshot.
+
+    Args:
+        soup: Parsed page or message snapshot
+
+    Returns:
+        The answer element, or None if the snapshot has none
+    """
+    turns = soup.select(TURN_SELECTOR)
+    if turns:
+        turn = turns[-1]
+        for selector in CONTENT_SELECTORS:
+            content = turn.select_one(selector)
+            if content:
+                return content
+        return turn
+    for element in reversed(soup.select(RESPONSE_SELECTOR)):
+        if element.get_text(strip=True):
+            return element
+    return None
+
+def html_to_markdown(html: str, scoped: bool = True) -> str:
+    """
+    Convert an HTML snapshot of Claude's answer to Markdown.
+
+    Args:
+        html (str): page.content() of the chat page, or the outerHTML of one answer
+        scoped (bool): Convert only the newest assistant answer in the snapshot
+
+    Returns:
+        str: The answer as Markdown (empty if there is no answer)
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    root = find_answer(soup) if scoped else soup
+    if root is None:
+        return ""
+    return MarkdownConverter().convert(root)
+
+class MarkdownConverter:
+    """Single-pass converter from a BeautifulSoup tree to Markdown."""
+
+    def convert(self, root) -> str:
+        """
+        Convert an element and everything below it.
+
+        Args:
+            root: BeautifulSoup element (or the soup itself)
+
+        Returns:
+            str: Markdown text
+        """
+        blocks = self._block(root) if root.name in BLOCK_TAGS else self._blocks(root)
+        markdown = "\n\n".join(block for block in blocks if block.strip())
+        return markdown + "\n" if markdown else ""
+
+    def _blocks(self, node, escape_markers: bool = True) -> List[str]:
+        """
+        Markdown blocks of a container's children; runs of inline content become paragraphs.
+
+        Args:
+            node: Container element
+            escape_markers (bool): Escape text that would start a Markdown block at the
+                start of a line (not needed in headings and table cells)
+        """
+        blocks: List[str] = []
+        inline: List[str] = []
+        for child in node.children:
+            if isinstance(child, NavigableString):
+                if not isinstance(child, PreformattedString):
+                    inline.append(escape_text(child))
+            elif child.name in SKIP_TAGS:
+                continue
+            elif child.name in BLOCK_TAGS:
+                self._flush(inline, blocks, escape_markers)
+                blocks.extend(self._block(child))
+            else:
+                inline.append(self._inline(child))
+        self._flush(inline, blocks, escape_markers)
+        return blocks
+
+    def _flush(self, inline: List[str], blocks: List[str], escape_markers: bool = True):
+        """Turn the pending inline pieces into a paragraph (line breaks from <br> kept)."""
+        if not inline:
+            return
+        lines = [re.sub(" {2,}", " ", line).strip() for line in "".join(inline).split("\n")]
+        if escape_markers:
+            lines = [escape_line_start(line) for line in lines]
+        inline.clear()
+        paragraph = "  \n".join(line for line in lines if line)
+        if paragraph:
+            blocks.append(paragraph)
+
+    def _block(self, element) -> List[str]:
+        """Markdown blocks of one block-level element."""
+        name = element.name
+        if name in HEADING_LEVELS:
+            text = " ".join(self._blocks(element, escape_markers=False)).replace("\n", " ")
+            return [f"{'#' * HEADING_LEVELS[name]} {text}"] if text else []
+        if name in ("ul", "ol"):
+            return [self._list(element)]
+        if name == "table":
+            return [self._table(element)]
+        if name == "pre":
+            return [self._code_block(element)]
+        if name == "hr":
+            return ["---"]
+        if name == "blockquote":
+            quoted = "\n\n".join(self._blocks(element))
+            return ["\n".join(f"> {line}" if line else ">" for line in quoted.split("\n"))]
+        return self._blocks(element)
+
+    def _list(self, element) -> str:
+        """An ordered or unordered list, nested lists indented under their item."""
+        ordered = element.name == "ol"
+        try:
+            number = int(element.get("start", 1))
+        except ValueError:
+            number = 1
+        items = element.find_all("li", recursive=False)
+        # Items holding paragraphs were a loose list (blank lines between items)
+        loose = any(item.find("p", recursive=False) for item in items)
+        rendered = []
+        for item in items:
+            marker = f"{number}." if ordered else "-"
+            number += 1
+            body = ("\n\n" if loose else "\n").join(self._blocks(item))
+            indent = " " * (len(marker) + 1)
+            lines = body.split("\n")
+            rendered.append(
+                f"{marker} {lines[0]}" + "".join(f"\n{indent}{line}" if line else "\n" for line in lines[1:])
+            )
+        return ("\n\n" if loose else "\n").join(rendered)
+
+    def _table(self, element) -> str:
+        """A pipe table; the first row is the header."""
+        rows = []
+        for part in element.children:
+            if part.name in ("thead", "tbody", "tfoot"):
+                rows.extend(part.find_all("tr", recursive=False))
+            elif part.name == "tr":
+                rows.append(part)
+        if not rows:
+            return ""
+        cells = [row.find_all(["th", "td"], recursive=False) for row in rows]
+        width = max(len(row) for row in cells)
+        if not width:
+            return ""
+        text = [[self._cell(cell) for cell in row] + [""] * (width - len(row)) for row in cells]
+        header = cells[0] + [None] * (width - len(cells[0]))
+        lines = [self._row(text[0]), self._row([self._alignment(cell) for cell in header])]
+        lines.extend(self._row(row) for row in text[1:])
+        return "\n".join(lines)
+
+    def _cell(self, cell) -> str:
+        """Text of a table cell on one line, with pipes escaped."""
+        return " ".join(self._blocks(cell, escape_markers=False)).replace("\n", " ").replace("|", "\\|")
+
+    def _row(self, cells: List[str]) -> str:
+        """One table row."""
+        return "| " + " | ".join(cells) + " |"
+
+    def _alignment(self, cell) -> str:
+        """Separator of a header cell, keeping its column alignment."""
+        align = ""
+        if cell is not None:
+            align = cell.get("align", "")
+            style = cell.get("style", "").replace(" ", "")
+            if "text-align:" in style:
+                align = style.split("text-align:", 1)[1].split(";", 1)[0]
+        return {"left": ":---", "center": ":---:", "right": "---:"}.get(align, "---")
+
+    def _code_block(self, element) -> str:
+        """A fenced code block, with the language taken from a language-* class."""
+        code = element.find("code") or element
+        language = ""
+        for css_class in code.get("class", []):
+            if css_class.startswith("language-"):
+                language = css_class[len("language-"):]
+                break
+        text = code.get_text().rstrip("\n")
+        fence = "```"
+        while fence in text:
+            fence += "`"
+        return f"{fence}{language}\n{text}\n{fence}"
+
+    def _inline(self, element) -> str:
+        """Inline Markdown of one element and its children."""
+        name = element.name
+        if name in SKIP_TAGS:
+            return ""
+        if name == "br":
+            return "\n"
+        if name == "img":
+            src = element.get("src")
+            return f"![{element.get('alt', '')}]({src})" if src else ""
+        if name == "code":
+            text = element.get_text()
+            ticks = "`"
+            while ticks in text:
+                ticks += "`"
+            padding = " " if text.startswith("`") or text.endswith("`") else ""
+            return f"{ticks}{padding}{text}{padding}{ticks}"
+
+        parts = []
+        for child in element.children:
+            if isinstance(child, NavigableString):
+                if not isinstance(child, PreformattedString):
+                    parts.append(escape_text(child))
+            else:
+                parts.append(self._inline(child))
+        inner = "".join(parts)
+
+        if name in INLINE_MARKS:
+            return self._wrap(inner, INLINE_MARKS[name])
+        if name == "a":
+            href = element.get("href")
+            if href and inner.strip():
+                return self._wrap(inner, "[", f"]({href})")
+        if name in BLOCK_TAGS:
+            # A block nested in inline content still needs to be kept apart from its neighbours
+            return f" {inner} "
+        return inner
+
+    def _wrap(self, inner: str, opening: str, closing: str = None) -> str:
+        """Wrap inline text in markers, keeping surrounding spaces outside them."""
+        text = inner.strip()
+        if not text:
+            return inner
+        leading = " " if inner[:1].isspace() else ""
+        trailing = " " if inner[-1:].isspace() else ""
+        return f"{leading}{opening}{text}{closing if closing is not None else opening}{trailing}"
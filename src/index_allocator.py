@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Output index allocator for the BlogAutomation2 project.
+Hands out {index}_{keyword} folder numbers from a lock-protected counter file,
+so allocation takes constant time and is safe across processes.
+"""
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Tuple
+from rich.console import Console
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+console = Console()
+
+class IndexAllocator:
+    """Allocates unique, increasing folder indices under an output directory."""
+
+    COUNTER_NAME = ".next_index"
+
+    def __init__(self, root: Path):
+        """
+        Initialize the allocator.
+
+        Args:
+            root (Path): Directory that holds the {index}_{keyword} folders
+        """
+        self.root = root
+        self.counter_path = root / self.COUNTER_NAME
+        self.lock_path = root / f"{self.COUNTER_NAME}.lock"
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive inter-process lock on the counter."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "a+b") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _scan_max_index(self) -> int:
+        """Find the highest existing folder index (only needed to seed the counter)."""
+        highest = 0
+        for entry in os.scandir(self.root):
+            index_str = entry.name.split("_", 1)[0]
+            if entry.is_dir() and index_str.isdigit():
+                highest = max(highest, int(index_str))
+        return highest
+
+    def _read_counter(self) -> int:
+        """Read the next index, seeding it from the existing folders on first use."""
+        try:
+            return int(self.counter_path.read_text(encoding="utf-8").strip())
+        except (FileNotFoundError, ValueError):
+            return self._scan_max_index() + 1
+
+    def _write_counter(self, value: int):
+        """Persist the next index atomically."""
+        tmp_path = self.counter_path.with_name(f"{self.COUNTER_NAME}.tmp")
+        tmp_path.write_text(str(value), encoding="utf-8")
+        os.replace(tmp_path, self.counter_path)
+
+    def peek(self) -> int:
+        """Return the index the next allocation will most likely get, without reserving it."""
+        with self._locked():
+            return self._read_counter()
+
+    def allocate(self, suffix: str) -> Tuple[int, Path]:
+        """
+        Reserve the next index and claim its folder.
+
+        The folder is created with exist_ok=False, so a folder with the same
+        name created outside the allocator is skipped rather than reused. A
+        folder created outside it with the same index but another suffix
+        (e.g. 5_other) is not detected: finding it would mean scanning the
+        directory on every allocation.
+
+        Args:
+            suffix (str): Folder name part after the index, e.g. a sanitized keyword
+
+        Returns:
+            Tuple[int, Path]: The index and the newly created folder
+        """
+        with self._locked():
+            index = self._read_counter()
+            while True:
+                dir_path = self.root / f"{index}_{suffix}"
+                try:
+                    dir_path.mkdir()
+                    break
+                except FileExistsError:
+                    index += 1
+            self._write_counter(index + 1)
+        return index, dir_path
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Crash-safe job checkpoints for the BlogAutomation2 project.
+Records the state of an in-progress article next to its output files so an
+interrupted run can reattach to the conversation instead of generating again.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+from rich.console import Console
+
+console = Console()
+
+# States after which the article can still be harvested from the conversation
+RESUMABLE_STATES = ("submitted", "generating")
+
+def write_atomic(path: Path, content: str):
+    """Write a text file so readers never see a half-written version."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class JobCheckpoint:
+    """State file and partial article for one keyword's output directory."""
+
+    FILE_NAME = "job.json"
+
+    def __init__(self, output_dir: Path, keyword: str, markdown_path: Path):
+        """
+        Initialize a checkpoint for a new job.
+
+        Args:
+            output_dir (Path): The {index}_{keyword} directory of the article
+            keyword (str): Keyword the article is written for
+            markdown_path (Path): Final markdown path; the partial file sits next to it
+        """
+        self.output_dir = output_dir
+        self.keyword = keyword
+        self.markdown_path = markdown_path
+        self.state = "created"
+        self.conversation_url: Optional[str] = None
+        self.error: Optional[str] = None
+        self.partial_chars = 0
+        self.template_name: Optional[str] = None
+        self.template_hash: Optional[str] = None
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+
+    @property
+    def path(self) -> Path:
+        """Location of the job state file."""
+        return self.output_dir / self.FILE_NAME
+
+    @property
+    def partial_path(self) -> Path:
+        """Location of the in-progress article text."""
+        return self.markdown_path.with_name(f"{self.markdown_path.stem}.partial.md")
+
+    def to_dict(self) -> dict:
+        """Serialize the checkpoint for the state file."""
+        return {
+            "keyword": self.keyword,
+            "markdown_path": self.markdown_path.name,
+            "state": self.state,
+            "conversation_url": self.conversation_url,
+            "error": self.error,
+            "partial_chars": self.partial_chars,
+            "template_name": self.template_name,
+            "template_hash": self.template_hash,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+        }
+
+    def save(self):
+        """Persist the current state, never raising into the generation flow."""
+        self.updated_at = time.time()
+        try:
+            write_atomic(self.path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2))
+        except OSError as e:
+            console.print(f"[yellow]Could not write job checkpoint: {str(e)}[/yellow]")
+
+    def update(self, state: str, **fields):
+        """
+        Move the job to a new state and persist it.
+
+        Args:
+            state (str): New job state
+            **fields: Other checkpoint attributes to set (e.g. conversation_url)
+        """
+        self.state = state
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self.save()
+
+    def write_partial(self, text: str):
+        """Store the article text generated so far."""
+        if not text:
+            return
+        try:
+            write_atomic(self.partial_path, text)
+            self.partial_chars = len(text)
+            self.save()
+        except OSError as e:
+            console.print(f"[yellow]Could not write partial article: {str(e)}[/yellow]")
+
+    def complete(self):
+        """Mark the job done and drop the partial file."""
+        if self.partial_path.exists():
+            self.partial_path.unlink()
+        self.update("done", error=None)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["JobCheckpoint"]:
+        """Read a checkpoint from a job.json file, or None if it is unreadable."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            console.print(f"[yellow]Skipping unreadable checkpoint {path}: {str(e)}[/yellow]")
+            return None
+
+        checkpoint = cls(path.parent, data["keyword"], path.parent / data["markdown_path"])
+        checkpoint.state = data.get("state", "created")
+        checkpoint.conversation_url = data.get("conversation_url")
+        checkpoint.error = data.get("error")
+        checkpoint.partial_chars = data.get("partial_chars", 0)
+        checkpoint.template_name = data.get("template_name")
+        checkpoint.template_hash = data.get("template_hash")
+        checkpoint.started_at = data.get("started_at", checkpoint.started_at)
+        checkpoint.updated_at = data.get("updated_at", checkpoint.updated_at)
+        return checkpoint
+
+    @classmethod
+    def find_resumable(cls, completed_dir: Path) -> List["JobCheckpoint"]:
+        """
+        Find interrupted jobs whose conversation can still be harvested.
+
+        Args:
+            completed_dir (Path): Root folder of the article directories
+
+        Returns:
+            List[JobCheckpoint]: Jobs that were submitted but never finished
+        """
+        resumable = []
+        for path in sorted(completed_dir.glob(f"*/{cls.FILE_NAME}")):
+            checkpoint = cls.load(path)
+            if checkpoint and checkpoint.state in RESUMABLE_STATES and checkpoint.conversation_url:
+                resumable.append(checkpoint)
+        return resumable
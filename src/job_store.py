@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+SQLite job store for the BlogAutomation2 project.
+Tracks every keyword as a job with a state, lease, retry count and priority,
+so several worker processes can pull keywords without picking the same one.
+"""
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from rich.console import Console
+
+console = Console()
+
+# Life cycle of a job: pending -> leased -> generating -> downloaded -> rendered -> done,
+# with failed as the terminal state once the retries are used up
+JOB_STATES = ("pending", "leased", "generating", "downloaded", "rendered", "failed", "done")
+
+# States in which a worker holds the job and its lease must stay fresh
+ACTIVE_STATES = ("leased", "generating", "downloaded", "rendered")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    keyword TEXT NOT NULL,
+    keyword_key TEXT NOT NULL UNIQUE,
+    state TEXT NOT NULL DEFAULT 'pending',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    template_hash TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_pick ON jobs (state, priority DESC, id);
+"""
+
+class LeaseLostError(RuntimeError):
+    """The job's lease expired and the job was reclaimed, so this worker must stop working on it."""
+
+def default_worker_id() -> str:
+    """Identify this process as host:pid for lease ownership."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def owner_alive(owner: str) -> bool:
+    """
+    Check whether a lease owner (host:pid) may still be running.
+
+    Owners on other hosts cannot be checked and are assumed alive.
+    """
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit() or os.name == "nt":
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class JobStore:
+    """Durable job queue with leases, retries with backoff, and priorities."""
+
+    def __init__(self, db_path: Path, lease_seconds: float = 1800, max_attempts: int = 3,
+                 backoff_seconds: float = 300, worker_id: Optional[str] = None):
+        """
+        Open (and create if needed) the job database.
+
+        Args:
+            db_path (Path): SQLite database file
+            lease_seconds (float): How long a worker may hold a job without updating it
+            max_attempts (int): Failed attempts before a job is marked failed
+            backoff_seconds (float): Delay before the first retry; doubles per attempt
+            worker_id (str, optional): Lease owner name (default: host:pid)
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.worker_id = worker_id or default_worker_id()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self.connection = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add columns introduced after a database was created."""
+        columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+        if "template_hash" not in columns:
+            self._write(lambda cursor: cursor.execute("ALTER TABLE jobs ADD COLUMN template_hash TEXT"))
+
+    def _write(self, statements):
+        """Run statements in one write transaction that other processes wait for."""
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            result = statements(cursor)
+            cursor.execute("COMMIT")
+            return result
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, keywords: Iterable[str], keyword_key, priority: int = 0, state: str = "pending") -> int:
+        """
+        Add keywords that are not in the store yet.
+
+        Args:
+            keywords (Iterable[str]): Keywords to add
+            keyword_key (callable): Normalizes a keyword into its unique key
+            priority (int): Higher priorities are leased first
+            state (str): Initial state (e.g. "done" when importing history)
+
+        Returns:
+            int: Number of newly added jobs
+        """
+        now = time.time()
+        rows = [(keyword, keyword_key(keyword), state, priority, now, now) for keyword in keywords]
+
+        def insert(cursor):
+            before = self.connection.total_changes
+            cursor.executemany(
+                "INSERT OR IGNORE INTO jobs (keyword, keyword_key, state, priority, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self.connection.total_changes - before
+        return self._write(insert)
+
+    def _reclaim_expired(self, cursor, now: float):
+        """Count expired leases as failed attempts and put them back in the queue."""
+        expired = cursor.execute(
+            f"SELECT id FROM jobs WHERE state IN ({','.join('?' * len(ACTIVE_STATES))}) AND lease_expires < ?",
+            (*ACTIVE_STATES, now),
+        ).fetchall()
+        for row in expired:
+            self._record_failure(cursor, row["id"], "lease expired", now)
+
+    def _owned_update(self, cursor, job_id: int, assignments: str, params: tuple):
+        """Update a job only while this worker holds its lease."""
+        cursor.execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ? AND lease_owner = ?",
+            (*params, job_id, self.worker_id),
+        )
+        if cursor.rowcount == 0:
+            raise LeaseLostError(f"Job {job_id} is no longer leased by {self.worker_id}")
+
+    def _record_failure(self, cursor, job_id: int, error: str, now: float, owner: Optional[str] = None):
+        """Increase the attempt count and schedule a retry or give up."""
+        query = "SELECT attempts FROM jobs WHERE id = ?"
+        params = [job_id]
+        if owner:
+            query += " AND lease_owner = ?"
+            params.append(owner)
+        row = cursor.execute(query, params).fetchone()
+        if row is None:
+            if owner:
+                raise LeaseLostError(f"Job {job_id} is no longer leased by {owner}")
+            return
+        attempts = row["attempts"] + 1
+        if attempts >= self.max_attempts:
+            state, available_at = "failed", now
+        else:
+            state, available_at = "pending", now + self.backoff_seconds * 2 ** (attempts - 1)
+        cursor.execute(
+            "UPDATE jobs SET state = ?, attempts = ?, available_at = ?, last_error = ?, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE id = ?",
+            (state, attempts, available_at, error, now, job_id),
+        )
+
+    def lease(self, limit: Optional[int] = 1, exclude_keys: Iterable[str] = ()) -> List[sqlite3.Row]:
+        """
+        Atomically take the next available jobs for this worker.
+
+        Args:
+            limit (int, optional): Maximum number of jobs (None for all available)
+            exclude_keys (Iterable[str]): Keyword keys that must not be leased
+
+        Returns:
+            List[sqlite3.Row]: The leased jobs, highest priority first
+        """
+        exclude_keys = list(exclude_keys)
+
+        def take(cursor):
+            now = time.time()
+            self._reclaim_expired(cursor, now)
+            query = "SELECT id FROM jobs WHERE state = 'pending' AND available_at <= ?"
+            params = [now]
+            if exclude_keys:
+                query += f" AND keyword_key NOT IN ({','.join('?' * len(exclude_keys))})"
+                params.extend(exclude_keys)
+            query += " ORDER BY priority DESC, id"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            ids = [row["id"] for row in cursor.execute(query, params).fetchall()]
+            cursor.executemany(
+                "UPDATE jobs SET state = 'leased', lease_owner = ?, lease_expires = ?, updated_at = ? WHERE id = ?",
+                [(self.worker_id, now + self.lease_seconds, now, job_id) for job_id in ids],
+            )
+            if not ids:
+                return []
+            return cursor.execute(
+                f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(ids))}) ORDER BY priority DESC, id", ids
+            ).fetchall()
+        return self._write(take)
+
+    def claim(self, keyword_key: str) -> Optional[sqlite3.Row]:
+        """
+        Lease one specific job, e.g. an interrupted job this process resumes.
+
+        The job is taken unless it is finished or another worker that is still
+        running holds an unexpired lease on it.
+
+        Args:
+            keyword_key (str): Keyword key of the job
+
+        Returns:
+            sqlite3.Row: The claimed job, or None if it cannot be taken
+        """
+        def take(cursor):
+            now = time.time()
+            job = cursor.execute("SELECT * FROM jobs WHERE keyword_key = ?", (keyword_key,)).fetchone()
+            if job is None or job["state"] in ("done", "failed"):
+                return None
+            owner = job["lease_owner"]
+            if (owner and owner != self.worker_id and job["lease_expires"] is not None
+                    and job["lease_expires"] >= now and owner_alive(owner)):
+                return None
+            cursor.execute(
+                "UPDATE jobs SET state = 'generating', lease_owner = ?, lease_expires = ?, updated_at = ? "
+                "WHERE id = ?",
+                (self.worker_id, now + self.lease_seconds, now, job["id"]),
+            )
+            return cursor.execute("SELECT * FROM jobs WHERE id = ?", (job["id"],)).fetchone()
+        return self._write(take)
+
+    def renew(self, job_ids: Iterable[int]) -> List[int]:
+        """
+        Extend the leases this worker still holds.
+
+        Args:
+            job_ids (Iterable[int]): Jobs leased by this worker
+
+        Returns:
+            List[int]: The jobs whose lease was renewed; the others were lost
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return []
+
+        def extend(cursor):
+            now = time.time()
+            placeholders = ",".join("?" * len(job_ids))
+            owned = (f"id IN ({placeholders}) AND lease_owner = ? "
+                     f"AND state IN ({','.join('?' * len(ACTIVE_STATES))})")
+            params = (*job_ids, self.worker_id, *ACTIVE_STATES)
+            cursor.execute(f"UPDATE jobs SET lease_expires = ? WHERE {owned}", (now + self.lease_seconds, *params))
+            return [row["id"] for row in cursor.execute(f"SELECT id FROM jobs WHERE {owned}", params)]
+        return self._write(extend)
+
+    def set_state(self, job_id: int, state: str):
+        """
+        Move a job to a new state; active states also renew the lease.
+
+        Raises:
+            LeaseLostError: If this worker no longer holds the job's lease
+        """
+        if state not in JOB_STATES:
+            raise ValueError(f"Unknown job state '{state}'")
+        now = time.time()
+        lease_expires = now + self.lease_seconds if state in ACTIVE_STATES else None
+        self._write(lambda cursor: self._owned_update(
+            cursor, job_id, "state = ?, lease_expires = ?, updated_at = ?", (state, lease_expires, now)
+        ))
+
+    def set_template(self, job_id: int, template_hash: str):
+        """
+        Record the hash of the prompt template a job is generated with.
+
+        Raises:
+            LeaseLostError: If this worker no longer holds the job's lease
+        """
+        now = time.time()
+        self._write(lambda cursor: self._owned_update(
+            cursor, job_id, "template_hash = ?, updated_at = ?", (template_hash, now)
+        ))
+
+    def fail(self, job_id: int, error: str):
+        """
+        Record a failed attempt; the job is retried later or marked failed.
+
+        Raises:
+            LeaseLostError: If this worker no longer holds the job's lease
+        """
+        self._write(lambda cursor: self._record_failure(cursor, job_id, error, time.time(), owner=self.worker_id))
+
+    def complete(self, job_id: int):
+        """
+        Mark a job as done and release its lease.
+
+        Raises:
+            LeaseLostError: If this worker no longer holds the job's lease
+        """
+        now = time.time()
+        self._write(lambda cursor: self._owned_update(
+            cursor, job_id,
+            "state = 'done', lease_owner = NULL, lease_expires = NULL, last_error = NULL, updated_at = ?",
+            (now,),
+        ))
+
+    def find(self, keyword_key: str) -> Optional[sqlite3.Row]:
+        """Look up a job by its keyword key."""
+        return self.connection.execute("SELECT * FROM jobs WHERE keyword_key = ?", (keyword_key,)).fetchone()
+
+    def next_pending(self) -> Optional[sqlite3.Row]:
+        """Return the job that would be leased next, without leasing it."""
+        return self.connection.execute(
+            "SELECT * FROM jobs WHERE state = 'pending' AND available_at <= ? ORDER BY priority DESC, id LIMIT 1",
+            (time.time(),),
+        ).fetchone()
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+        rows = self.connection.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        return {row["state"]: row["n"] for row in rows}
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
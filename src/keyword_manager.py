@@ -3,70 +3,317 @@
 Keyword manager for handling keywords in the BlogAutomation2 project.
 """
 import os
+import unicodedata
 from pathlib import Path
-from typing import Optional, List
+from typing import Iterable, Optional, List, Set
+from job_store import JobStore, LeaseLostError
 from rich.console import Console
 
 console = Console()
 
+def normalize_keyword(keyword: str) -> str:
+    """Normalize a keyword for comparison (Unicode form, case and whitespace)."""
+    return " ".join(unicodedata.normalize("NFC", keyword).casefold().split())
+
 class KeywordManager:
     """Manages keywords for blog automation."""
-    
-    def __init__(self, keywords_file: Path):
-        """Initialize the keyword manager with the path to the keywords file."""
+
+    def __init__(self, keywords_file: Path, job_store: Optional[JobStore] = None):
+        """
+        Initialize the keyword manager with the path to the keywords file.
+
+        Args:
+            keywords_file (Path): Text file with one keyword per line
+            job_store (JobStore, optional): SQLite job store that tracks job states
+                and leases instead of the processed/unprocessed text files
+        """
         self.keywords_file = keywords_file
         self.processed_file = keywords_file.parent / "processed_keywords.txt"
-        
+        self.job_store = job_store
+
         # Create the processed keywords file if it doesn't exist
         if not self.processed_file.exists():
             self.processed_file.touch()
-    
-    def get_keywords(self) -> List[str]:
-        """Get all keywords from the keywords file."""
-        if not self.keywords_file.exists():
+
+        # In-memory index: keywords in file order, normalized processed keys,
+        # and a cursor before which every keyword is known to be processed
+        self._keywords: List[str] = []
+        self._keywords_mtime = None
+        self._processed: List[str] = []
+        self._processed_keys: Set[str] = set()
+        self._processed_offset = 0
+        # Set after the first read of the log; only then can a last line without newline be legacy
+        self._processed_loaded = False
+        self._cursor = 0
+        # Job ids of keywords leased from the job store by this process
+        self._leased_jobs = {}
+
+    def _refresh(self):
+        """Bring the in-memory index up to date with both files."""
+        self._refresh_keywords()
+        self._refresh_processed()
+
+    def _refresh_keywords(self):
+        """Reload the keywords file only when it changed on disk."""
+        try:
+            mtime = self.keywords_file.stat().st_mtime_ns
+        except FileNotFoundError:
             console.print(f"[bold red]Keywords file not found: {self.keywords_file}[/bold red]")
-            return []
-        
+            self._keywords, self._keywords_mtime, self._cursor = [], None, 0
+            return
+        if mtime == self._keywords_mtime:
+            return
+
         try:
             with open(self.keywords_file, "r", encoding="utf-8") as f:
-                keywords = [line.strip() for line in f.readlines() if line.strip()]
-            return keywords
+                lines = [line.strip() for line in f]
         except Exception as e:
             console.print(f"[bold red]Error reading keywords file: {str(e)}[/bold red]")
-            return []
-    
-    def get_processed_keywords(self) -> List[str]:
-        """Get list of already processed keywords."""
+            return
+
+        # Keep the first occurrence of each keyword
+        seen = set()
+        self._keywords = []
+        for keyword in lines:
+            key = normalize_keyword(keyword)
+            if key and key not in seen:
+                seen.add(key)
+                self._keywords.append(keyword)
+        self._keywords_mtime = mtime
+        self._cursor = 0
+        self._sync_job_store()
+
+    def _sync_job_store(self):
+        """Add keywords from the text files to the job store (existing jobs are kept)."""
+        if not self.job_store:
+            return
+        self._refresh_processed()
+        imported = self.job_store.enqueue(self._processed, normalize_keyword, state="done")
+        added = self.job_store.enqueue(self._keywords, normalize_keyword)
+        if imported or added:
+            console.print(f"[green]Job store: added {added} pending and {imported} done job(s)[/green]")
+
+    def _refresh_processed(self):
+        """Read entries appended to the processed log since the last refresh."""
+        try:
+            size = self.processed_file.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._processed_offset:
+            # The log was truncated or replaced (e.g. deleted to reprocess everything)
+            self._processed, self._processed_keys = [], set()
+            self._processed_offset = 0
+            self._cursor = 0
+        if size == self._processed_offset:
+            self._processed_loaded = True
+            return
+
         try:
-            with open(self.processed_file, "r", encoding="utf-8") as f:
-                processed = [line.strip() for line in f.readlines() if line.strip()]
-            return processed
+            with open(self.processed_file, "rb") as f:
+                f.seek(self._processed_offset)
+                data = f.read()
         except Exception:
-            return []
-    
+            return
+
+        # Only consume complete lines, except for a legacy last line without newline
+        # when the log is read for the first time; later it is still being written
+        end = data.rfind(b"\n") + 1
+        if not self._processed_loaded and end < len(data):
+            end = len(data)
+        self._processed_loaded = True
+        for line in data[:end].decode("utf-8", errors="replace").splitlines():
+            self._add_processed(line.strip())
+        self._processed_offset += end
+
+    def _add_processed(self, keyword: str):
+        """Add a keyword to the processed index."""
+        key = normalize_keyword(keyword)
+        if key and key not in self._processed_keys:
+            self._processed_keys.add(key)
+            self._processed.append(keyword)
+
+    def is_processed(self, keyword: str) -> bool:
+        """Check whether a keyword has been processed (normalized comparison)."""
+        self._refresh()
+        return normalize_keyword(keyword) in self._processed_keys
+
+    def get_keywords(self) -> List[str]:
+        """Get all keywords from the keywords file."""
+        self._refresh_keywords()
+        return list(self._keywords)
+
+    def get_processed_keywords(self) -> List[str]:
+        """Get list of already processed keywords."""
+        self._refresh_processed()
+        return list(self._processed)
+
     def get_next_keyword(self) -> Optional[str]:
         """Get the next unprocessed keyword."""
-        all_keywords = self.get_keywords()
-        if not all_keywords:
+        self._refresh()
+        if not self._keywords:
             return None
-            
-        processed_keywords = self.get_processed_keywords()
-        
-        # Find first keyword that hasn't been processed yet
-        for keyword in all_keywords:
-            if keyword not in processed_keywords:
+
+        if self.job_store:
+            job = self.job_store.next_pending()
+            if job is None:
+                console.print("[yellow]No pending jobs in the job store![/yellow]")
+                return None
+            return job["keyword"]
+
+        # Skip past processed keywords; the cursor never moves back, so
+        # repeated calls cost O(1) amortized
+        while self._cursor < len(self._keywords):
+            keyword = self._keywords[self._cursor]
+            if normalize_keyword(keyword) not in self._processed_keys:
                 return keyword
-                
+            self._cursor += 1
+
         console.print("[yellow]All keywords have been processed![/yellow]")
         return None
-    
+
+    def get_pending_keywords(self, limit: Optional[int] = None, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Get unprocessed keywords in file order.
+
+        With a job store the keywords are leased to this process, so concurrent
+        runs never receive the same keyword.
+
+        Args:
+            limit (int, optional): Maximum number of keywords to return (None for all)
+            exclude (Iterable[str]): Keywords to skip (e.g. jobs being resumed)
+
+        Returns:
+            List[str]: Keywords that have not been processed yet
+        """
+        excluded_keys = {normalize_keyword(keyword) for keyword in exclude}
+        if self.job_store:
+            self._refresh()
+            jobs = self.job_store.lease(limit, exclude_keys=excluded_keys)
+            for job in jobs:
+                self._leased_jobs[job["keyword_key"]] = job["id"]
+            return [job["keyword"] for job in jobs]
+
+        if self.get_next_keyword() is None:
+            return []
+        pending = []
+        for keyword in self._keywords[self._cursor:]:
+            key = normalize_keyword(keyword)
+            if key in self._processed_keys or key in excluded_keys:
+                continue
+            pending.append(keyword)
+            if limit is not None and len(pending) >= limit:
+                break
+        return pending
+
+    def claim(self, keyword: str) -> bool:
+        """
+        Lease the job of a keyword this process resumes (always True without a job store).
+
+        Returns:
+            bool: False if the job is finished or another running worker holds it
+        """
+        if not self.job_store:
+            return True
+        key = normalize_keyword(keyword)
+        if self.job_store.find(key) is None:
+            return True
+        job = self.job_store.claim(key)
+        if job is None:
+            return False
+        self._leased_jobs[key] = job["id"]
+        return True
+
+    def holds_lease(self, keyword: str) -> bool:
+        """Whether this process may still work on a keyword (always True without a job store)."""
+        return not self.job_store or normalize_keyword(keyword) in self._leased_jobs
+
+    def renew_leases(self) -> List[str]:
+        """
+        Renew the leases of every job this process holds, including keywords still queued.
+
+        Returns:
+            List[str]: Keyword keys whose lease was lost to another worker
+        """
+        if not self.job_store or not self._leased_jobs:
+            return []
+        renewed = set(self.job_store.renew(self._leased_jobs.values()))
+        lost = [key for key, job_id in self._leased_jobs.items() if job_id not in renewed]
+        for key in lost:
+            self._leased_jobs.pop(key)
+            console.print(f"[yellow]Lease of '{key}' was lost; another worker may have taken it[/yellow]")
+        return lost
+
+    def _job_id(self, keyword: str) -> Optional[int]:
+        """Find the job id of a keyword in the job store."""
+        key = normalize_keyword(keyword)
+        if key in self._leased_jobs:
+            return self._leased_jobs[key]
+        job = self.job_store.find(key)
+        return job["id"] if job else None
+
+    def mark_state(self, keyword: str, state: str):
+        """Record the job state of a keyword (only tracked with a job store)."""
+        if not self.job_store:
+            return
+        job_id = self._job_id(keyword)
+        if job_id is not None:
+            try:
+                self.job_store.set_state(job_id, state)
+            except LeaseLostError:
+                self._leased_jobs.pop(normalize_keyword(keyword), None)
+                raise
+
+    def record_template(self, keyword: str, template_hash: str):
+        """Store the prompt template hash of a keyword's job (only tracked with a job store)."""
+        if not self.job_store:
+            return
+        job_id = self._job_id(keyword)
+        if job_id is not None:
+            try:
+                self.job_store.set_template(job_id, template_hash)
+            except LeaseLostError:
+                self._leased_jobs.pop(normalize_keyword(keyword), None)
+                raise
+
+    def mark_failed(self, keyword: str, error: str):
+        """Record a failed attempt so the job store retries it later with backoff."""
+        if not self.job_store:
+            return
+        job_id = self._job_id(keyword)
+        if job_id is not None:
+            try:
+                self.job_store.fail(job_id, error)
+            except LeaseLostError:
+                # Another worker owns the job now; its attempts are not ours to count
+                console.print(f"[yellow]Not recording the failure of '{keyword}': its lease was lost[/yellow]")
+            self._leased_jobs.pop(normalize_keyword(keyword), None)
+
     def mark_processed(self, keyword: str):
         """Mark a keyword as processed."""
-        if not keyword or keyword in self.get_processed_keywords():
+        if keyword and self.job_store:
+            job_id = self._job_id(keyword)
+            try:
+                if job_id is not None:
+                    # Raises LeaseLostError if the job was reclaimed; it is then not ours to finish
+                    self.job_store.complete(job_id)
+            finally:
+                self._leased_jobs.pop(normalize_keyword(keyword), None)
+
+        if not keyword or self.is_processed(keyword):
             return
-            
+
         try:
-            with open(self.processed_file, "a", encoding="utf-8") as f:
-                f.write(f"{keyword}\n")
+            # Never glue the new entry onto a last line without newline
+            needs_newline = self.processed_file.stat().st_size > 0 and self._last_byte() != b"\n"
+            entry = ("\n" if needs_newline else "") + f"{keyword}\n"
+            with open(self.processed_file, "ab") as f:
+                f.write(entry.encode("utf-8"))
+            self._add_processed(keyword)
         except Exception as e:
-            console.print(f"[bold red]Error marking keyword as processed: {str(e)}[/bold red]")
\ No newline at end of file
+            console.print(f"[bold red]Error marking keyword as processed: {str(e)}[/bold red]")
+
+    def _last_byte(self) -> bytes:
+        """Return the last byte of the processed log."""
+        with open(self.processed_file, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
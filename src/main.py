@@ -4,41 +4,587 @@ Main script for BlogAutomation2 project.
 Automates blog writing using Claude.ai and Playwright.
 """
 import os
+import argparse
 import asyncio
 import sys
 import traceback
 from pathlib import Path
-from claude_client import ClaudeClient
+from typing import Optional
+from article_pipeline import ArticlePipeline
+from batch_stats import BatchStats
+from browser_daemon import DEFAULT_CDP_PORT, BrowserDaemon, send_command, start_detached, wait_until_healthy
+from claude_client import DEFAULT_CLAUDE_URL, ClaudeClient
+from corpus_rebuilder import CorpusRebuilder
 from keyword_manager import KeywordManager
 from file_manager import FileManager
+from generation_cache import GenerationCache
+from generation_pool import GenerationPool
+from job_checkpoint import RESUMABLE_STATES, JobCheckpoint, write_atomic
+from job_store import JobStore
+from pdf_renderer import ChromiumPdfRenderer
+from prompt_engine import PromptEngine, PromptError, RenderedPrompt
+from tracing import tracer
+from screenshot_service import SCREENSHOT_LEVELS
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 console = Console()
 
-async def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line options for the automation run."""
+    parser = argparse.ArgumentParser(description="Generate blog articles with Claude AI.")
+    batch_group = parser.add_mutually_exclusive_group()
+    batch_group.add_argument(
+        "--count", type=int, default=1,
+        help="Number of pending keywords to process in one browser session (default: 1)"
+    )
+    batch_group.add_argument(
+        "--all", action="store_true",
+        help="Process every pending keyword in one browser session"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1,
+        help="Number of browser tabs generating articles in parallel (default: 1)"
+    )
+    parser.add_argument(
+        "--capture-stream", action="store_true",
+        help="Rebuild articles from the completion network stream instead of the Copy button"
+    )
+    parser.add_argument(
+        "--screenshots", choices=SCREENSHOT_LEVELS, default="errors",
+        help="Debug screenshots to take: off, errors only, or every step (default: errors)"
+    )
+    parser.add_argument(
+        "--job-store", type=Path, metavar="PATH",
+        help="SQLite job store (e.g. content/keywords/jobs.sqlite3) for leases, retries "
+             "and job states; lets several runs work on the same keyword list safely"
+    )
+    parser.add_argument(
+        "--pdf-backend", choices=("pdfkit", "chromium"), default="pdfkit",
+        help="Render PDFs with wkhtmltopdf (pdfkit) or a long-lived headless Chromium page"
+    )
+    parser.add_argument(
+        "--no-generation-cache", action="store_true",
+        help="Generate every keyword even if an article for the same keyword, "
+             "template and project is cached"
+    )
+    parser.add_argument(
+        "--claude-url", default=DEFAULT_CLAUDE_URL, metavar="URL",
+        help="Claude project URL to generate in (default: the configured project)"
+    )
+    parser.add_argument(
+        "--headless", action="store_true",
+        help="Run the browser without a window (the login must already be stored)"
+    )
+    parser.add_argument(
+        "--lean", action="store_true",
+        help="Headless with images, fonts, media and analytics blocked and a small "
+             "viewport, for more tabs per machine (the login must already be stored)"
+    )
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="Launch a browser instead of attaching to the browser daemon "
+             "(the daemon must be stopped, since both use the browser_data profile)"
+    )
+    parser.add_argument(
+        "--trace-dir", type=Path, metavar="DIR",
+        help="Write timing spans to DIR/spans.jsonl and rolling p50/p95 metrics "
+             "to the Prometheus textfile DIR/blog_automation.prom"
+    )
+    parser.add_argument(
+        "--render-workers", type=int, metavar="N",
+        help="Worker processes rendering PDFs with wkhtmltopdf while generation "
+             "continues (default: number of CPU cores)"
+    )
+    parser.add_argument(
+        "--pipeline-queue", type=int, metavar="N",
+        help="Articles that may wait in each pipeline stage before generation "
+             "pauses (default: twice the render workers)"
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    subparsers.add_parser("generate", help="Generate articles for pending keywords (default)")
+    rebuild_parser = subparsers.add_parser(
+        "rebuild", help="Re-render the PDFs of completed articles that are out of date"
+    )
+    rebuild_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="Render processes (default: number of CPU cores)"
+    )
+    rebuild_parser.add_argument(
+        "--force", action="store_true",
+        help="Re-render every article, even if its PDF is up to date"
+    )
+    # Also accepted after "rebuild"; SUPPRESS keeps the subparser from resetting a
+    # --pdf-backend given before the command to its default
+    rebuild_parser.add_argument(
+        "--pdf-backend", choices=("pdfkit", "chromium"), default=argparse.SUPPRESS,
+        help="Render PDFs with wkhtmltopdf (pdfkit) or a headless Chromium page"
+    )
+    cache_parser = subparsers.add_parser(
+        "cache", help="Show or invalidate the cache of generated articles"
+    )
+    cache_parser.add_argument(
+        "--invalidate", nargs="+", metavar="KEYWORD", default=[],
+        help="Remove the cached articles of these keywords"
+    )
+    cache_parser.add_argument(
+        "--template-hash", metavar="HASH",
+        help="Remove every cached article generated with this template hash"
+    )
+    cache_parser.add_argument(
+        "--clear", action="store_true", help="Remove every cached article"
+    )
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Keep a logged-in browser running for later runs to attach to"
+    )
+    daemon_parser.add_argument(
+        "action", choices=("run", "start", "stop", "restart", "status"),
+        help="run in the foreground, start in the background, or control a running daemon"
+    )
+    daemon_parser.add_argument(
+        "--port", type=int, default=DEFAULT_CDP_PORT,
+        help=f"Local CDP port of the browser (default: {DEFAULT_CDP_PORT})"
+    )
+    daemon_parser.add_argument(
+        "--headed", action="store_true",
+        help="Show the browser window (e.g. to log in)"
+    )
+    daemon_parser.add_argument(
+        "--health-interval", type=float, default=10.0, metavar="SECONDS",
+        help="Seconds between health checks of the browser (default: 10)"
+    )
+    args = parser.parse_args(argv)
+    args.command = args.command or "generate"
+    return args
+
+def load_prompt_engine(templates_dir: Path, metadata_path: Path):
+    """Compile the prompt templates, returning None if one of them is invalid."""
+    try:
+        engine = PromptEngine(templates_dir, metadata_path)
+    except (OSError, PromptError) as e:
+        console.print(f"[bold red]Error loading prompt templates: {str(e)}[/bold red]")
+        return None
+    console.print(f"[green]Prompt templates loaded:[/green] {', '.join(engine.templates)}")
+    return engine
+
+async def harvest_article(
+    claude: ClaudeClient,
+    file_manager: FileManager,
+    pipeline: ArticlePipeline,
+    checkpoint: JobCheckpoint,
+    stats: BatchStats,
+) -> bool:
+    """
+    Save a finished answer from the current conversation and queue it for rendering.
+
+    Args:
+        claude (ClaudeClient): Client whose page shows the finished answer
+        file_manager (FileManager): Used to save files
+        pipeline (ArticlePipeline): Renders the PDF and marks the keyword as processed
+        checkpoint (JobCheckpoint): Checkpoint of the job being harvested
+        stats (BatchStats): Collector for per-phase timings
+
+    Returns:
+        bool: True if the article was saved and handed to the pipeline
+    """
+    keyword = checkpoint.keyword
+    output_dir = checkpoint.output_dir
+
+    # Download the content using the download button
+    markdown_path = checkpoint.markdown_path
+    with stats.phase("download"):
+        download_successful = await claude.download_content_as_markdown(markdown_path)
+
+    if download_successful:
+        console.print(f"[bold green]✓[/bold green] Content downloaded and saved to: {markdown_path}")
+    else:
+        console.print("[bold red]Failed to download content from Claude[/bold red]")
+
+        # Fallback to extracting content if download fails
+        console.print("[yellow]Attempting to extract content as fallback...[/yellow]")
+        with stats.phase("extraction"):
+            response = await claude.extract_response()
+
+        if not response or len(response) == 0:
+            console.print("[bold red]Failed to extract content as fallback[/bold red]")
+            console.print("[yellow]Check screenshots for details on what happened.[/yellow]")
+            checkpoint.update("failed", error="article could not be downloaded or extracted")
+            return False
+
+        # Save the extracted content
+        markdown_path = file_manager.save_as_markdown(response, output_dir, keyword)
+        if not markdown_path:
+            console.print("[bold red]Failed to save extracted content.[/bold red]")
+            checkpoint.update("failed", error="extracted article could not be saved")
+            return False
+        console.print(f"[bold green]✓[/bold green] Content extracted and saved as: {markdown_path}")
+
+    # Rendering and bookkeeping continue in the pipeline while this tab moves on
+    with stats.phase("pipeline_wait"):
+        await pipeline.submit(checkpoint, markdown_path)
+    return True
+
+def create_job_checkpoint(
+    keyword_manager: KeywordManager,
+    file_manager: FileManager,
+    prompt: RenderedPrompt,
+    checkpoint: Optional[JobCheckpoint] = None,
+) -> JobCheckpoint:
+    """Start the job checkpoint of a keyword, allocating its article folder unless one is reused."""
+    keyword = prompt.keyword
+    if checkpoint is None:
+        output_dir = file_manager.allocate_completed_content_structure(keyword)
+        checkpoint = JobCheckpoint(output_dir, keyword, file_manager.markdown_path(output_dir, keyword))
+    checkpoint.state = "created"
+    checkpoint.error = None
+    # Record the template so the article can be traced back to it
+    checkpoint.template_name = prompt.template_name
+    checkpoint.template_hash = prompt.template_hash
+    checkpoint.save()
+    keyword_manager.record_template(keyword, prompt.template_hash)
+    return checkpoint
+
+def find_article_checkpoint(file_manager: FileManager, prompt: RenderedPrompt) -> Optional[JobCheckpoint]:
+    """
+    Find the keyword's existing article folder (e.g. left by a failed PDF step) to reuse.
+
+    Folders written from another template, or of a job that may still be
+    resumed, are left alone.
+
+    Returns:
+        JobCheckpoint: Checkpoint of the folder, or None if a new folder is needed
+    """
+    output_dir = file_manager.find_completed_content_structure(prompt.keyword)
+    if output_dir is None:
+        return None
+    state_path = output_dir / JobCheckpoint.FILE_NAME
+    if not state_path.exists():
+        # Folder from before job checkpoints; its article is named like FileManager names it
+        return JobCheckpoint(output_dir, prompt.keyword, file_manager.markdown_path(output_dir, prompt.keyword))
+    checkpoint = JobCheckpoint.load(state_path)
+    if checkpoint is None or checkpoint.state in RESUMABLE_STATES:
+        return None
+    if checkpoint.template_hash and checkpoint.template_hash != prompt.template_hash:
+        return None
+    return checkpoint
+
+async def restore_cached_article(
+    keyword_manager: KeywordManager,
+    file_manager: FileManager,
+    pipeline: ArticlePipeline,
+    prompt: RenderedPrompt,
+    markdown: str,
+) -> bool:
+    """
+    Save a previously generated article for a keyword instead of generating it again.
+
+    Args:
+        keyword_manager (KeywordManager): Used to record the job state
+        file_manager (FileManager): Used to create the article folder
+        pipeline (ArticlePipeline): Renders the PDF and marks the keyword as processed
+        prompt (RenderedPrompt): Rendered prompt the cached article was generated from
+        markdown (str): Cached article markdown
+
+    Returns:
+        bool: True if the article was saved and handed to the pipeline
+    """
+    console.print(f"[green]Using cached article for:[/green] [bold]{prompt.keyword}[/bold]")
+    checkpoint = find_article_checkpoint(file_manager, prompt)
+    if checkpoint:
+        console.print(f"[green]Reusing article folder: {checkpoint.output_dir}[/green]")
+    checkpoint = create_job_checkpoint(keyword_manager, file_manager, prompt, checkpoint)
+    try:
+        # The article already in a reused folder is kept as it is
+        if not checkpoint.markdown_path.exists():
+            write_atomic(checkpoint.markdown_path, markdown)
+    except OSError as e:
+        console.print(f"[bold red]Error saving cached article: {str(e)}[/bold red]")
+        checkpoint.update("failed", error=str(e))
+        return False
+    await pipeline.submit(checkpoint, checkpoint.markdown_path)
+    return True
+
+async def process_keyword(
+    claude: ClaudeClient,
+    keyword_manager: KeywordManager,
+    file_manager: FileManager,
+    pipeline: ArticlePipeline,
+    prompt: RenderedPrompt,
+    stats: BatchStats,
+    show_progress: bool = True,
+) -> bool:
+    """
+    Generate and save the article for a single keyword and queue it for rendering.
+
+    Args:
+        claude (ClaudeClient): Started client positioned on a fresh chat
+        keyword_manager (KeywordManager): Used to record the job state
+        file_manager (FileManager): Used to create folders and save files
+        pipeline (ArticlePipeline): Renders the PDF and marks the keyword as processed
+        prompt (RenderedPrompt): Rendered prompt of the keyword to write about
+        stats (BatchStats): Collector for per-phase timings
+        show_progress (bool): Show the live spinner (only one can run at a time)
+
+    Returns:
+        bool: True if the article was saved and handed to the pipeline
+    """
+    keyword = prompt.keyword
+    console.print(f"[green]Processing keyword:[/green] [bold]{keyword}[/bold] [dim](template {prompt.template_name})[/dim]")
+
+    # Create directory structure before starting content generation
+    checkpoint = create_job_checkpoint(keyword_manager, file_manager, prompt)
+
+    # Submit prompt to Claude and get response
+    console.print("[yellow]Submitting prompt to Claude...[/yellow]")
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=False,
+        disable=not show_progress,
+    ) as progress:
+        task = progress.add_task("[yellow]Waiting for Claude to generate content...", total=None)
+
+        # Submit the prompt (returns True/False for success)
+        with stats.phase("submission"):
+            submission_successful = await claude.submit_prompt(prompt.text)
+        if "insert_seconds" in claude.last_submission_metrics:
+            stats.add_phase_time("prompt_insertion", claude.last_submission_metrics["insert_seconds"])
+
+        if not submission_successful:
+            progress.update(task, description="[red]Failed to submit prompt to Claude[/red]")
+            console.print("[bold red]Failed to submit prompt to Claude[/bold red]")
+            checkpoint.update("failed", error="prompt submission failed")
+            return False
+
+        # Record the conversation so a crashed run can harvest it later
+        checkpoint.update("generating", conversation_url=await claude.get_conversation_url())
+        keyword_manager.mark_state(keyword, "generating")
+
+        # Wait for response completion, checkpointing the partial article
+        with stats.phase("generation"):
+            completion_successful = await claude.wait_for_response_completion(
+                on_progress=checkpoint.write_partial
+            )
+
+        if not completion_successful:
+            progress.update(task, description="[red]Failed to complete response generation[/red]")
+            console.print("[bold red]Failed to complete response generation[/bold red]")
+            # Terminal, so later runs generate the keyword again instead of resuming it
+            checkpoint.update("failed", error="response generation did not complete")
+            return False
+
+        progress.update(task, completed=True)
+
+    return await harvest_article(claude, file_manager, pipeline, checkpoint, stats)
+
+async def resume_job(
+    claude: ClaudeClient,
+    file_manager: FileManager,
+    pipeline: ArticlePipeline,
+    checkpoint: JobCheckpoint,
+    stats: BatchStats,
+) -> bool:
+    """
+    Reattach to the conversation of an interrupted job and harvest its answer.
+
+    Args:
+        claude (ClaudeClient): Started client
+        file_manager (FileManager): Used to save files
+        pipeline (ArticlePipeline): Renders the PDF and marks the keyword as processed
+        checkpoint (JobCheckpoint): Checkpoint left behind by the interrupted run
+        stats (BatchStats): Collector for per-phase timings
+
+    Returns:
+        bool: True if the article was saved and handed to the pipeline
+    """
+    console.print(f"[green]Resuming interrupted job:[/green] [bold]{checkpoint.keyword}[/bold]")
+    with stats.phase("resume"):
+        if not await claude.open_conversation(checkpoint.conversation_url):
+            checkpoint.update("failed", error="conversation could not be reopened")
+            return False
+
+    with stats.phase("generation"):
+        completion_successful = await claude.wait_for_response_completion(
+            on_progress=checkpoint.write_partial, resume=True
+        )
+    if not completion_successful:
+        console.print("[bold red]Interrupted conversation did not complete[/bold red]")
+        checkpoint.update("failed", error="interrupted conversation did not complete")
+        return False
+
+    # Text that stopped changing is not enough: an answer cut off by the crash stops too
+    if not await claude.is_generation_finished(min_length=checkpoint.partial_chars):
+        console.print("[bold red]Interrupted answer is incomplete; the keyword will be generated again[/bold red]")
+        checkpoint.update("failed", error="interrupted answer is incomplete")
+        return False
+
+    return await harvest_article(claude, file_manager, pipeline, checkpoint, stats)
+
+async def renew_leases(keyword_manager: KeywordManager, interval: float):
+    """Renew this process's job leases until cancelled, so keywords still queued keep them."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            keyword_manager.renew_leases()
+        except Exception as e:
+            console.print(f"[yellow]Could not renew job leases: {str(e)}[/yellow]")
+
+async def main(args: argparse.Namespace = None):
     """Main automation process for blog writing."""
+    args = args or parse_args([])
     console.print("[bold blue]Starting Blog Automation with Claude AI[/bold blue]")
-    
+    if args.trace_dir:
+        tracer.configure(args.trace_dir)
+
+    # Chromium locks its profile, so while the daemon's control socket answers
+    # (even during a restart) no second browser may be launched on browser_data
+    daemon_status = send_command("status")
+    if daemon_status and args.no_daemon:
+        console.print("[bold red]The browser daemon is running and holds the browser_data profile.[/bold red]")
+        console.print("[yellow]Stop it with 'python src/main.py daemon stop' or run without --no-daemon.[/yellow]")
+        return
+    if daemon_status and not daemon_status.get("healthy"):
+        console.print("[yellow]Waiting for the browser daemon to become healthy...[/yellow]")
+        daemon_status = await asyncio.to_thread(wait_until_healthy)
+        if daemon_status and not daemon_status.get("healthy"):
+            console.print("[bold red]The browser daemon is not healthy and holds the browser_data profile.[/bold red]")
+            console.print("[yellow]Check 'python src/main.py daemon status' or stop the daemon.[/yellow]")
+            return
+
     # Initialize components
-    keyword_manager = KeywordManager(Path("content/keywords/keywords.txt"))
+    job_store = JobStore(args.job_store) if args.job_store else None
+    keyword_manager = KeywordManager(Path("content/keywords/keywords.txt"), job_store=job_store)
     file_manager = FileManager(Path("content/completed"))
-    
-    # Get next keyword to process
-    keyword = keyword_manager.get_next_keyword()
-    if not keyword:
-        console.print("[bold red]No keywords found in the keywords file.[/bold red]")
+
+    # Compile and validate the prompt templates once for the whole batch
+    prompt_engine = load_prompt_engine(
+        Path("content/prompts"), Path("content/keywords/keyword_metadata.csv")
+    )
+    if prompt_engine is None:
         return
-    
-    console.print(f"[green]Processing keyword:[/green] [bold]{keyword}[/bold]")
-    
-    # Create directory structure before starting content generation
-    next_index = file_manager.get_next_index()
-    output_dir = file_manager.create_completed_content_structure(next_index, keyword)
-    
+
+    # Interrupted jobs are harvested from their conversation instead of regenerated
+    resumable = JobCheckpoint.find_resumable(file_manager.output_dir)
+    resumed_keywords = {checkpoint.keyword for checkpoint in resumable}
+    # Another running worker may be resuming (or have finished) the same job
+    resumable = [checkpoint for checkpoint in resumable if keyword_manager.claim(checkpoint.keyword)]
+
+    # Pick the keywords for this session up front so a failed keyword
+    # is not handed out again within the same batch
+    keywords = keyword_manager.get_pending_keywords(
+        None if args.all else args.count, exclude=resumed_keywords
+    )
+    if not keywords and not resumable:
+        console.print("[bold red]No unprocessed keywords found in the keywords file.[/bold red]")
+        return
+
+    # Render all prompts in one pass so template problems show up before the browser starts
+    stats = BatchStats()
+    prompts, prompt_errors = prompt_engine.render_batch(keywords)
+    for keyword, error in prompt_errors.items():
+        console.print(f"[bold red]Skipping '{keyword}':[/bold red] {error}")
+        stats.record_result(keyword, False, error)
+        keyword_manager.mark_failed(keyword, error)
+    keywords = [keyword for keyword in keywords if keyword in prompts]
+    if not keywords and not resumable:
+        stats.print_summary()
+        return
+
+    console.print(f"[green]Keywords in this batch:[/green] {len(keywords)}")
+    if resumable:
+        console.print(f"[green]Interrupted jobs to resume:[/green] {len(resumable)}")
+
+    # Attach to the browser daemon when one is running; it keeps the login warm
+    cdp_endpoint = daemon_status["endpoint"] if daemon_status else None
+
     # Initialize Claude client
-    claude = ClaudeClient()
-    
+    claude = ClaudeClient(
+        capture_stream=args.capture_stream, screenshot_level=args.screenshots,
+        claude_url=args.claude_url, headless=args.headless, lean=args.lean,
+        cdp_endpoint=cdp_endpoint,
+    )
+
+    # Articles generated earlier with the same template and project are reused
+    generation_cache = None if args.no_generation_cache else GenerationCache()
+    cached = {}
+    if generation_cache:
+        for keyword in keywords:
+            markdown = generation_cache.get(keyword, prompts[keyword].template_hash, claude.claude_url)
+            if markdown:
+                cached[keyword] = markdown
+        keywords = [keyword for keyword in keywords if keyword not in cached]
+        if cached:
+            console.print(f"[green]Keywords served from the generation cache:[/green] {len(cached)}")
+    needs_browser = bool(keywords or resumable)
+
+    pool = GenerationPool(claude, min(args.concurrency, len(keywords) + len(resumable)))
+    pipeline = ArticlePipeline(
+        file_manager, keyword_manager, stats,
+        render_workers=args.render_workers, queue_size=args.pipeline_queue,
+        generation_cache=generation_cache, project=claude.claude_url,
+    )
+
+    async def run_keyword(worker: ClaudeClient, keyword: str) -> bool:
+        """Process one keyword on a worker tab, isolating any failure."""
+        console.print(f"\n[bold blue]Keyword:[/bold blue] {keyword} [dim]({worker.name})[/dim]")
+        if not keyword_manager.holds_lease(keyword):
+            console.print(f"[yellow]Skipping '{keyword}': its lease was lost to another worker[/yellow]")
+            stats.record_result(keyword, False, "lease lost")
+            return False
+        worker.job_name = keyword
+        with tracer.job(keyword):
+            try:
+                if not worker.on_fresh_chat:
+                    with stats.phase("new_chat"):
+                        if not await worker.create_new_chat():
+                            raise RuntimeError("Could not open a new chat")
+
+                success = await process_keyword(
+                    worker, keyword_manager, file_manager, pipeline, prompts[keyword], stats,
+                    show_progress=len(pool.workers) == 1,
+                )
+                stats.record_result(keyword, success, None if success else "see log output")
+                if not success:
+                    tracer.fail_job()
+                    keyword_manager.mark_failed(keyword, "generation or download failed")
+                return success
+            except Exception as e:
+                # Isolate failures so one broken keyword does not stop the batch
+                console.print(f"[bold red]Error processing '{keyword}':[/bold red] {str(e)}")
+                traceback.print_exc(file=sys.stderr)
+                await worker.take_screenshot("keyword_error", error=True)
+                tracer.fail_job()
+                stats.record_result(keyword, False, str(e))
+                keyword_manager.mark_failed(keyword, str(e))
+                return False
+
+    async def resume_checkpoint(worker: ClaudeClient, checkpoint: JobCheckpoint) -> bool:
+        """Harvest one interrupted job on a worker tab, isolating any failure."""
+        worker.job_name = checkpoint.keyword
+        with tracer.job(checkpoint.keyword):
+            try:
+                success = await resume_job(worker, file_manager, pipeline, checkpoint, stats)
+                stats.record_result(checkpoint.keyword, success, None if success else "resume failed")
+                if not success:
+                    tracer.fail_job()
+                    keyword_manager.mark_failed(checkpoint.keyword, checkpoint.error or "resume failed")
+                return success
+            except Exception as e:
+                console.print(f"[bold red]Error resuming '{checkpoint.keyword}':[/bold red] {str(e)}")
+                traceback.print_exc(file=sys.stderr)
+                await worker.take_screenshot("resume_error", error=True)
+                tracer.fail_job()
+                stats.record_result(checkpoint.keyword, False, str(e))
+                checkpoint.update("failed", error=str(e))
+                keyword_manager.mark_failed(checkpoint.keyword, str(e))
+                return False
+
+    # Leases of the whole batch are renewed while earlier keywords are still being processed
+    heartbeat = asyncio.create_task(
+        renew_leases(keyword_manager, job_store.lease_seconds / 3)
+    ) if job_store else None
+
     try:
         # Start Playwright browser and navigate to Claude
         with Progress(
@@ -47,127 +593,133 @@ async def main():
             transient=True,
         ) as progress:
             task = progress.add_task("[yellow]Starting browser and connecting to Claude...", total=None)
-            await claude.start()
+            if needs_browser:
+                with stats.phase("browser_start"):
+                    await claude.start()
             progress.update(task, completed=True)
-        
-        # Load prompt template and replace keyword
-        prompt_template_path = Path("content/prompts/prompt_template.txt")
-        if not prompt_template_path.exists():
-            console.print(f"[bold red]Error: Prompt template not found at {prompt_template_path}[/bold red]")
-            return
-            
-        try:
-            with open(prompt_template_path, "r", encoding="utf-8") as f:
-                prompt_template = f.read()
-        except Exception as e:
-            console.print(f"[bold red]Error reading prompt template: {str(e)}[/bold red]")
-            return
-        
-        # Replace keyword placeholder in prompt
-        prompt = prompt_template.replace("replace_with_keyword", keyword)
-        
-        # Submit prompt to Claude and get response
-        console.print("[yellow]Submitting prompt to Claude...[/yellow]")
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            transient=False,
-        ) as progress:
-            task = progress.add_task("[yellow]Waiting for Claude to generate content...", total=None)
-            
-            # Submit the prompt (returns True/False for success)
-            submission_successful = await claude.submit_prompt(prompt)
-            
-            if not submission_successful:
-                progress.update(task, description="[red]Failed to submit prompt to Claude[/red]")
-                console.print("[bold red]Failed to submit prompt to Claude[/bold red]")
-                return
-                
-            # Wait for response completion
-            completion_successful = await claude.wait_for_response_completion()
-            
-            if not completion_successful:
-                progress.update(task, description="[red]Failed to complete response generation[/red]")
-                console.print("[bold red]Failed to complete response generation[/bold red]")
-                return
-            
-            # Download the content using the download button
-            markdown_path = output_dir / f"{keyword.replace(' ', '_').lower()}.md"
-            download_successful = await claude.download_content_as_markdown(markdown_path)
-            
-            if download_successful:
-                progress.update(task, completed=True)
-                console.print(f"[bold green]✓[/bold green] Content downloaded and saved to: {markdown_path}")
-                
-                # Try to generate PDF from the downloaded markdown
-                try:
-                    pdf_path = file_manager.save_as_pdf(markdown_path, output_dir, keyword)
-                    if pdf_path:
-                        console.print(f"[bold green]✓[/bold green] PDF saved as: {pdf_path}")
-                    else:
-                        console.print("[yellow]PDF generation failed, but markdown was saved successfully.[/yellow]")
-                except Exception as e:
-                    console.print(f"[yellow]PDF generation error: {str(e)}. Markdown still saved successfully.[/yellow]")
-                
-                # Mark keyword as processed
-                keyword_manager.mark_processed(keyword)
-                console.print(f"[green]Marked keyword '[bold]{keyword}[/bold]' as processed.[/green]")
-            else:
-                progress.update(task, description="[red]Failed to download content[/red]")
-                console.print("[bold red]Failed to download content from Claude[/bold red]")
-                
-                # Fallback to extracting content if download fails
-                console.print("[yellow]Attempting to extract content as fallback...[/yellow]")
-                response = await claude.extract_response()
-                
-                if response and len(response) > 0:
-                    # Save the extracted content
-                    markdown_path = file_manager.save_as_markdown(response, output_dir, keyword)
-                    
-                    if markdown_path:
-                        console.print(f"[bold green]✓[/bold green] Content extracted and saved as: {markdown_path}")
-                        
-                        # Try to generate PDF from the extracted content
-                        try:
-                            pdf_path = file_manager.save_as_pdf(markdown_path, output_dir, keyword)
-                            if pdf_path:
-                                console.print(f"[bold green]✓[/bold green] PDF saved as: {pdf_path}")
-                            else:
-                                console.print("[yellow]PDF generation failed, but markdown was saved successfully.[/yellow]")
-                        except Exception as e:
-                            console.print(f"[yellow]PDF generation error: {str(e)}. Markdown still saved successfully.[/yellow]")
-                        
-                        # Mark keyword as processed
-                        keyword_manager.mark_processed(keyword)
-                        console.print(f"[green]Marked keyword '[bold]{keyword}[/bold]' as processed.[/green]")
-                    else:
-                        console.print("[bold red]Failed to save extracted content.[/bold red]")
-                else:
-                    console.print("[bold red]Failed to extract content as fallback[/bold red]")
-                    console.print("[yellow]Check screenshots for details on what happened.[/yellow]")
-    
+
+        if args.pdf_backend == "chromium":
+            file_manager.pdf_renderer = ChromiumPdfRenderer(claude.playwright if needs_browser else None)
+        pipeline.start()
+
+        for keyword, markdown in cached.items():
+            with tracer.job(keyword), stats.phase("cache_restore"):
+                success = await restore_cached_article(
+                    keyword_manager, file_manager, pipeline, prompts[keyword], markdown
+                )
+                if not success:
+                    tracer.fail_job()
+            stats.record_result(keyword, success, None if success else "cached article could not be saved")
+
+        if needs_browser:
+            with stats.phase("open_tabs"):
+                await pool.start()
+            if resumable:
+                await pool.run(resumable, resume_checkpoint)
+            await pool.run(keywords, run_keyword)
+
     except KeyboardInterrupt:
         console.print("\n[yellow]Process interrupted by user.[/yellow]")
-    
+
     except Exception as e:
         console.print(f"[bold red]Error occurred:[/bold red] {str(e)}")
         console.print("[red]Stack trace:[/red]")
         traceback.print_exc(file=sys.stderr)
-    
+
     finally:
         # Close browser
         console.print("[yellow]Cleaning up and closing browser...[/yellow]")
         try:
+            # Let queued articles finish rendering before the browser goes away
+            await pipeline.close()
+            if heartbeat:
+                heartbeat.cancel()
+            await pool.close()
+            if file_manager.pdf_renderer:
+                await file_manager.pdf_renderer.close()
             await claude.close()
             console.print("[blue]Blog automation completed.[/blue]")
         except Exception as e:
             console.print(f"[yellow]Error during cleanup: {str(e)}[/yellow]")
+        stats.print_summary()
+        tracer.print_summary()
+        tracer.close()
+        claude.selectors.print_stats()
+        claude.waits.print_stats()
+        if job_store:
+            console.print(f"[blue]Job store: {job_store.counts()}[/blue]")
+            job_store.close()
+
+def rebuild(args: argparse.Namespace) -> bool:
+    """Re-render the PDFs of the completed article corpus."""
+    console.print("[bold blue]Rebuilding completed articles[/bold blue]")
+    rebuilder = CorpusRebuilder(
+        FileManager(Path("content/completed")),
+        workers=args.workers, backend=args.pdf_backend, force=args.force,
+    )
+    return rebuilder.rebuild()
+
+def manage_cache(args: argparse.Namespace):
+    """Show the generation cache size or remove entries from it."""
+    generation_cache = GenerationCache()
+    if args.clear:
+        console.print(f"[green]Removed {generation_cache.clear()} cached article(s)[/green]")
+    elif args.invalidate or args.template_hash:
+        removed = generation_cache.invalidate(args.invalidate, args.template_hash)
+        console.print(f"[green]Removed {removed} cached article(s)[/green]")
+    stats = generation_cache.stats()
+    console.print(
+        f"[blue]Generation cache: {stats['entries']} article(s), "
+        f"{stats['bytes'] / 1024 / 1024:.1f} MB in {generation_cache.cache_dir}[/blue]"
+    )
+
+def manage_daemon(args: argparse.Namespace) -> bool:
+    """Run, start or control the browser daemon."""
+    if args.action == "run":
+        daemon = BrowserDaemon(
+            port=args.port, headless=not args.headed, start_url=args.claude_url,
+            health_interval=args.health_interval,
+        )
+        asyncio.run(daemon.run())
+        return True
+    if args.action == "start":
+        # Top-level options go before the subcommand
+        argv = ["--claude-url", args.claude_url, "daemon", "run",
+                "--port", str(args.port), "--health-interval", str(args.health_interval)]
+        if args.headed:
+            argv.append("--headed")
+        return start_detached(argv)
+
+    answer = send_command(args.action)
+    if answer is None:
+        console.print("[yellow]No browser daemon is running[/yellow]")
+        return args.action == "stop"
+    if "error" in answer:
+        console.print(f"[bold red]Browser daemon: {answer['error']}[/bold red]")
+        return False
+    if args.action == "status":
+        state = "[green]healthy[/green]" if answer["healthy"] else "[red]unhealthy[/red]"
+        console.print(
+            f"Browser daemon (pid {answer['daemon_pid']}): {state}, endpoint {answer['endpoint']}, "
+            f"browser pid {answer['pid']}, up {answer['browser_uptime']}s, {answer['restarts']} restart(s)"
+        )
+        return answer["healthy"]
+    console.print(f"[green]Browser daemon: {args.action} requested[/green]")
+    return True
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        args = parse_args()
+        if args.command == "rebuild":
+            sys.exit(0 if rebuild(args) else 1)
+        if args.command == "daemon":
+            sys.exit(0 if manage_daemon(args) else 1)
+        if args.command == "cache":
+            manage_cache(args)
+            sys.exit(0)
+        asyncio.run(main(args))
     except KeyboardInterrupt:
         console.print("\n[yellow]Process terminated by user.[/yellow]")
     except Exception as e:
         console.print(f"[bold red]Fatal error: {str(e)}[/bold red]")
-        traceback.print_exc(file=sys.stderr)
\ No newline at end of file
+        traceback.print_exc(file=sys.stderr)
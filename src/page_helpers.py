@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+In-page helper library for the BlogAutomation2 project.
+Injected once per page with add_init_script, so each high-level browser step
+(find the input, clear it and insert the prompt, read the newest answer,
+check the page state) is a single evaluate() round trip, with text matching
+done in the page instead of shipping page text to Python. The newest
+assistant turn is found by stable attributes and tracked as it is added, so
+reading it costs the same however long the conversation is.
+"""
+
+# Text that marks a login page or a security check, matched in the page
+LOGIN_TEXTS = ["log in", "sign in", "continue with", "log into"]
+VERIFICATION_TEXTS = [
+    "verify you are human",
+    "security verification",
+    "complete the action below",
+    "captcha",
+    "security check",
+    "cloudflare",
+]
+
+PAGE_HELPERS_JS = """
+(() => {
+    if (window.__blogAutomation) return;
+
+    const RESPONSE_SELECTOR = '.prose, .message-content, .claude-response';
+    // Stable attributes of an assistant turn, and the answer inside it (most specific first)
+    const TURN_SELECTOR = '[data-is-streaming], [data-message-author-role="assistant"], [data-testid="assistant-message"]';
+    const CONTENT_SELECTORS = ['.font-claude-message', '.prose', '.message-content'];
+    const GENERATING_SELECTOR = [
+        '[data-is-streaming="true"]',
+        'button[aria-label*="Stop"]',
+        '.loading', '.generating', '.typing-indicator', '[role="progressbar"]'
+    ].join(', ');
+
+    const isField = (el) => el.tagName === 'TEXTAREA' || el.tagName === 'INPUT';
+    const textOf = (el) => (isField(el) ? el.value : el.innerText) || '';
+    const normalize = (text) => text.split(/\\s+/).filter(Boolean).join(' ');
+
+    const find = (selector) => {
+        try {
+            return selector.startsWith('//')
+                ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+                : document.querySelector(selector);
+        } catch (e) {
+            return null;
+        }
+    };
+
+    const isEditable = (el) => !!el && el.isConnected && el.getClientRects().length > 0
+        && (el.isContentEditable || (isField(el) && !el.disabled && !el.readOnly));
+
+    const locateInput = (selectors) => {
+        for (const selector of selectors) {
+            const el = find(selector);
+            if (isEditable(el)) return { el, selector };
+        }
+        return null;
+    };
+
+    const clear = (el) => {
+        el.focus();
+        if (isField(el)) {
+            el.select();
+        } else {
+            const range = document.createRange();
+            range.selectNodeContents(el);
+            const selection = window.getSelection();
+            selection.removeAllRanges();
+            selection.addRange(range);
+        }
+        // execCommand goes through the editor's input handling, unlike setting the DOM
+        document.execCommand('delete');
+        if (isField(el) && el.value) {
+            el.value = '';
+            el.dispatchEvent(new Event('input', { bubbles: true }));
+        }
+        return !textOf(el).trim();
+    };
+
+    const insert = (el, text) => {
+        el.focus();
+        if (document.execCommand('insertText', false, text) && normalize(textOf(el)) === normalize(text)) {
+            return 'exec_insert_text';
+        }
+        clear(el);
+        const data = new DataTransfer();
+        data.setData('text/plain', text);
+        el.dispatchEvent(new ClipboardEvent('paste', { clipboardData: data, bubbles: true, cancelable: true }));
+        if (normalize(textOf(el)) === normalize(text)) return 'paste_event';
+        return null;
+    };
+
+    // The newest assistant turn is tracked from added nodes, so finding it does
+    // not get slower as the conversation grows; the page is only scanned when
+    // nothing is tracked yet (helpers installed after load) or the turn was removed
+    const tracker = { turn: null, scans: 0 };
+
+    const adopt = (el) => {
+        const current = tracker.turn;
+        if (!current || !current.isConnected
+                || (current.compareDocumentPosition(el) & Node.DOCUMENT_POSITION_FOLLOWING)) {
+            tracker.turn = el;
+        }
+    };
+
+    const onAdded = (node) => {
+        if (node.nodeType !== Node.ELEMENT_NODE) return;
+        if (node.matches(TURN_SELECTOR)) adopt(node);
+        const inner = node.querySelectorAll(TURN_SELECTOR);
+        if (inner.length) adopt(inner[inner.length - 1]);
+    };
+
+    new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) onAdded(node);
+        }
+    }).observe(document, { childList: true, subtree: true });
+
+    const newestTurn = () => {
+        if (tracker.turn && tracker.turn.isConnected) return tracker.turn;
+        tracker.scans += 1;
+        const turns = document.querySelectorAll(TURN_SELECTOR);
+        tracker.turn = turns.length ? turns[turns.length - 1] : null;
+        return tracker.turn;
+    };
+
+    const turnContent = (turn) => {
+        for (const selector of CONTENT_SELECTORS) {
+            const el = turn.querySelector(selector);
+            if (el) return el;
+        }
+        return turn;
+    };
+
+    const lastResponse = () => {
+        const elements = document.querySelectorAll(RESPONSE_SELECTOR);
+        for (let i = elements.length - 1; i >= 0; i--) {
+            if (elements[i].textContent.trim().length > 0) return elements[i];
+        }
+        return null;
+    };
+
+    const isGenerating = () => {
+        for (const el of document.querySelectorAll(GENERATING_SELECTOR)) {
+            if (el.matches('[data-is-streaming="true"]') || el.offsetParent !== null) return true;
+        }
+        return false;
+    };
+
+    const pageText = () => ((document.body && document.body.innerText) || '').toLowerCase();
+
+    window.__blogAutomation = {
+        findInput: (selectors) => {
+            const found = locateInput(selectors);
+            return found ? { selector: found.selector, text: textOf(found.el) } : null;
+        },
+
+        clearAndInsert: (selectors, text) => {
+            const found = locateInput(selectors);
+            if (!found) return { ok: false, reason: 'no input' };
+            if (!clear(found.el)) return { ok: false, reason: 'input not cleared', selector: found.selector };
+            const method = insert(found.el, text);
+            if (!method) {
+                clear(found.el);
+                return { ok: false, reason: 'prompt not inserted', selector: found.selector };
+            }
+            return { ok: true, method, selector: found.selector };
+        },
+
+        // Newest assistant turn by stable attributes; pages without them fall
+        // back to the last non-empty response element. includeHtml adds the
+        // answer's outerHTML for offline Markdown conversion
+        lastAssistantMessage: (includeText = true, includeHtml = false) => {
+            const turn = newestTurn();
+            const el = turn ? turnContent(turn) : lastResponse();
+            if (!el) return { scope: 'none', length: 0, text: '', streaming: false, scans: tracker.scans };
+            return {
+                scope: turn ? 'turn' : 'fallback',
+                length: el.textContent.length,
+                text: includeText ? el.innerText : null,
+                html: includeHtml ? el.outerHTML : null,
+                streaming: !!turn && turn.getAttribute('data-is-streaming') === 'true',
+                scans: tracker.scans,
+            };
+        },
+
+        isGenerating,
+
+        pageState: (options) => {
+            const text = (options.loginTexts.length || options.verificationTexts.length) ? pageText() : '';
+            const turn = newestTurn();
+            const response = turn ? turnContent(turn) : lastResponse();
+            return {
+                url: location.href,
+                inputReady: !!locateInput(options.inputSelectors),
+                loginText: options.loginTexts.some((marker) => text.includes(marker)),
+                verificationText: options.verificationTexts.some((marker) => text.includes(marker)),
+                generating: isGenerating(),
+                responseLength: response ? response.textContent.length : 0,
+            };
+        },
+    };
+})();
+"""
+
+# Calls a helper by name, or reports that the page has no helpers yet
+CALL_HELPER_JS = """
+([name, args]) => {
+    if (!window.__blogAutomation) return { __helpersMissing: true };
+    return window.__blogAutomation[name](...args);
+}
+"""
+
+async def install_page_helpers(page):
+    """Register the helpers for every document the page loads from now on."""
+    await page.add_init_script(PAGE_HELPERS_JS)
+
+async def call_helper(page, name: str, *args):
+    """
+    Run one helper in the page (one round trip once the helpers are installed).
+
+    Args:
+        page: Playwright page
+        name (str): Helper name, e.g. "pageState"
+        *args: JSON-serializable arguments
+
+    Returns:
+        The helper's result
+    """
+    result = await page.evaluate(CALL_HELPER_JS, [name, list(args)])
+    if isinstance(result, dict) and result.get("__helpersMissing"):
+        # The document was loaded before the init script was registered
+        await page.evaluate(PAGE_HELPERS_JS)
+        result = await page.evaluate(CALL_HELPER_JS, [name, list(args)])
+    return result
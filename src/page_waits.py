@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Readiness waits for the BlogAutomation2 project.
+Waits for explicit page conditions (input editable, project page hydrated,
+response container attached) instead of sleeping for a fixed time, and keeps
+per-wait timings next to the fixed sleeps they replaced, so the latency saved
+can be reported.
+"""
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, List
+from tracing import tracer
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Page condition: "ready" once a prompt input is visible and editable, "login"
+# once a login or verification page has loaded, null while neither. Takes the
+# pageState helper's options (inputSelectors, loginTexts, verificationTexts)
+# and only falls back to a bare input check where the helpers are missing
+PAGE_STATE_JS = """
+(options) => {
+    const path = location.pathname;
+    const loginPage = document.readyState === 'complete' && !path.includes('/project/') && !path.includes('/chat');
+    if (window.__blogAutomation) {
+        // Reading the page text is only worth it where a login page can appear
+        const state = window.__blogAutomation.pageState(
+            loginPage ? options : { ...options, loginTexts: [], verificationTexts: [] }
+        );
+        if (state.inputReady) return 'ready';
+        return state.loginText || state.verificationText ? 'login' : null;
+    }
+    for (const selector of options.inputSelectors) {
+        const el = selector.startsWith('//') ? null : document.querySelector(selector);
+        if (el && (el.isContentEditable || ((el.tagName === 'TEXTAREA' || el.tagName === 'INPUT') && !el.disabled))) {
+            return 'ready';
+        }
+    }
+    return null;
+}
+"""
+
+# Element condition: the input holds no text
+INPUT_EMPTY_JS = """
+(el) => !((el.value !== undefined ? el.value : el.innerText) || '').trim()
+"""
+
+# Page condition: the prompt was taken (conversation URL, a generating
+# indicator, or the input was emptied by the editor)
+SUBMISSION_ACCEPTED_JS = """
+(inputSelectors) => {
+    if (location.pathname.includes('/chat/')) return true;
+    if (document.querySelector('[data-is-streaming="true"], button[aria-label*="Stop"]')) return true;
+    for (const selector of inputSelectors) {
+        if (selector.startsWith('//')) continue;
+        const el = document.querySelector(selector);
+        if (el) return !((el.value !== undefined ? el.value : el.innerText) || '').trim();
+    }
+    return false;
+}
+"""
+
+# Page condition: a response container with text is attached
+RESPONSE_ATTACHED_JS = """
+() => {
+    if (window.__blogAutomation) return window.__blogAutomation.lastAssistantMessage(false).length > 0;
+    const elements = document.querySelectorAll('.prose, .message-content, .claude-response');
+    for (let i = elements.length - 1; i >= 0; i--) {
+        if (elements[i].textContent.trim().length > 0) return true;
+    }
+    return false;
+}
+"""
+
+class PageWaiter:
+    """Runs condition-based waits and collects their timings for this session."""
+
+    def __init__(self, polling_ms: int = 100):
+        """
+        Initialize the waiter.
+
+        Args:
+            polling_ms (int): How often the page re-evaluates a condition
+        """
+        self.polling_ms = polling_ms
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.timeouts: Dict[str, int] = defaultdict(int)
+        self.waited: Dict[str, List[float]] = defaultdict(list)
+        self.replaced: Dict[str, float] = defaultdict(float)
+
+    @asynccontextmanager
+    async def track(self, name: str, replaces: float = 0.0):
+        """
+        Time a wait done by other means (e.g. wait_for_url) under a name.
+
+        Args:
+            name (str): Wait name, e.g. "project_ready"
+            replaces (float): Seconds of the fixed sleep this wait replaced
+        """
+        start = time.time()
+        status = "ok"
+        try:
+            yield
+        except Exception as e:
+            # Playwright raises its own TimeoutError class
+            status = "timeout" if type(e).__name__ == "TimeoutError" else "error"
+            raise
+        finally:
+            seconds = time.time() - start
+            self.counts[name] += 1
+            self.waited[name].append(seconds)
+            self.replaced[name] += replaces
+            if status == "timeout":
+                self.timeouts[name] += 1
+            tracer.record(f"wait.{name}", seconds, start=start, status=status)
+
+    async def until(self, page, name: str, expression: str, arg=None, timeout: float = 15000,
+                    replaces: float = 0.0):
+        """
+        Wait until a JavaScript condition is truthy in the page.
+
+        Args:
+            page: Playwright page
+            name (str): Wait name used in the report
+            expression (str): Function evaluated in the page until it returns a truthy value
+            arg (optional): Argument passed to the function (e.g. an element handle)
+            timeout (float): Milliseconds before giving up
+            replaces (float): Seconds of the fixed sleep this wait replaced
+
+        Returns:
+            The condition's value, or None on timeout or error
+        """
+        try:
+            async with self.track(name, replaces):
+                handle = await page.wait_for_function(
+                    expression, arg=arg, timeout=timeout, polling=self.polling_ms
+                )
+            return await handle.json_value()
+        except Exception as e:
+            if type(e).__name__ == "TimeoutError":
+                console.print(f"[yellow]Timed out after {timeout / 1000:.0f}s waiting for {name}[/yellow]")
+            else:
+                console.print(f"[yellow]Wait for {name} failed: {str(e)}[/yellow]")
+            return None
+
+    def print_stats(self):
+        """Print the time spent per wait against the fixed sleeps it replaced."""
+        if not self.counts:
+            return
+        table = Table(title="Readiness waits")
+        table.add_column("Wait")
+        table.add_column("Count", justify="right")
+        table.add_column("Timeouts", justify="right")
+        table.add_column("Mean (s)", justify="right")
+        table.add_column("Max (s)", justify="right")
+        table.add_column("Total (s)", justify="right")
+        table.add_column("Fixed sleeps (s)", justify="right")
+        table.add_column("Saved (s)", justify="right")
+        total_saved = 0.0
+        for name in sorted(self.counts):
+            waited = self.waited[name]
+            saved = self.replaced[name] - sum(waited)
+            total_saved += saved
+            table.add_row(
+                name, str(self.counts[name]), str(self.timeouts[name]),
+                f"{sum(waited) / len(waited):.2f}", f"{max(waited):.2f}", f"{sum(waited):.1f}",
+                f"{self.replaced[name]:.1f}", f"{saved:.1f}",
+            )
+        console.print(table)
+        console.print(f"[blue]Time saved against the fixed sleeps: {total_saved:.1f}s[/blue]")
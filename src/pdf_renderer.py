@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Chromium PDF renderer for the BlogAutomation2 project.
+Renders article HTML to PDF in one long-lived headless Playwright page,
+straight from memory and without spawning a process per article.
+"""
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from playwright.async_api import async_playwright
+from rich.console import Console
+
+console = Console()
+
+# Same page setup as the wkhtmltopdf options in FileManager.save_as_pdf()
+PDF_OPTIONS = {
+    "format": "A4",
+    "margin": {"top": "20mm", "right": "20mm", "bottom": "20mm", "left": "20mm"},
+    "print_background": True,
+}
+
+class ChromiumPdfRenderer:
+    """Keeps a headless Chromium page open and prints HTML documents with it."""
+
+    def __init__(self, playwright=None):
+        """
+        Initialize the renderer.
+
+        Args:
+            playwright (optional): Running Playwright instance to reuse (e.g. the
+                one of ClaudeClient); a private one is started if omitted
+        """
+        self.playwright = playwright
+        self._owns_playwright = playwright is None
+        self.browser = None
+        self.page = None
+
+    async def start(self):
+        """Launch the headless browser and open the rendering page."""
+        if self.page:
+            return
+        if self._owns_playwright:
+            self.playwright = await async_playwright().start()
+        # page.pdf() only works in headless Chromium, so the headed Claude
+        # window cannot be used for printing
+        self.browser = await self.playwright.chromium.launch(headless=True)
+        self.page = await self.browser.new_page()
+        console.print("[green]Chromium PDF renderer started[/green]")
+
+    async def render(self, html: str, pdf_path: Path) -> Optional[Path]:
+        """
+        Render one HTML document to a PDF file.
+
+        Args:
+            html (str): Complete HTML document
+            pdf_path (Path): Where to write the PDF
+
+        Returns:
+            Path: The PDF path, or None if rendering failed
+        """
+        await self.start()
+        try:
+            await self.page.set_content(html, wait_until="load")
+            await self.page.pdf(path=str(pdf_path), **PDF_OPTIONS)
+            return pdf_path
+        except Exception as e:
+            console.print(f"[bold red]Error rendering PDF {pdf_path}: {str(e)}[/bold red]")
+            return None
+
+    async def render_many(self, documents: Iterable[Tuple[str, Path]]) -> List[Optional[Path]]:
+        """
+        Render several documents one after another in the same page.
+
+        Args:
+            documents (Iterable): (html, pdf_path) pairs
+
+        Returns:
+            List: PDF path (or None on failure) per document
+        """
+        return [await self.render(html, pdf_path) for html, pdf_path in documents]
+
+    async def close(self):
+        """Close the browser, and Playwright if the renderer started it."""
+        try:
+            if self.browser:
+                await self.browser.close()
+            if self._owns_playwright and self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            console.print(f"[yellow]Error closing PDF renderer: {str(e)}[/yellow]")
+        self.browser = None
+        self.page = None
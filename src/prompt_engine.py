@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Prompt engine for the BlogAutomation2 project.
+Loads and validates every prompt template once, picks a template per keyword
+category and fills in per-keyword variables (region, word count, audience,
+internal links) from an optional metadata CSV.
+"""
+import csv
+import hashlib
+from pathlib import Path
+from string import Template
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from keyword_manager import normalize_keyword
+from rich.console import Console
+
+console = Console()
+
+# Placeholder of the original single-variable templates, still accepted as ${keyword}
+LEGACY_KEYWORD_PLACEHOLDER = "replace_with_keyword"
+
+# Variables a template may use, with the value used when the metadata has none
+# (None: a template using it needs a value from the metadata CSV)
+TEMPLATE_VARIABLES = {
+    "keyword": None,
+    "category": "",
+    "region": None,
+    "word_count_min": "1500",
+    "word_count_max": "1600",
+    "audience": None,
+    "internal_links": None,
+}
+
+# Template used for keywords without a category (or with an unknown one)
+DEFAULT_TEMPLATE = "prompt_template"
+
+# Metadata row whose values apply to every keyword
+DEFAULTS_ROW = "*"
+
+class PromptError(ValueError):
+    """A template or a keyword's variables are invalid."""
+
+class RenderedPrompt(NamedTuple):
+    """A prompt ready to submit, with the template it was rendered from."""
+    keyword: str
+    text: str
+    template_name: str
+    template_hash: str
+
+class CompiledTemplate:
+    """One validated prompt template."""
+
+    def __init__(self, name: str, source: str):
+        """
+        Compile and validate a template.
+
+        Args:
+            name (str): Template name (file name without .txt)
+            source (str): Template text with ${variable} placeholders
+
+        Raises:
+            PromptError: On malformed or unknown placeholders
+        """
+        self.name = name
+        self.source = source.replace(LEGACY_KEYWORD_PLACEHOLDER, "${keyword}")
+        self.template = Template(self.source)
+        self.variables = self._placeholders()
+        self.hash = hashlib.sha256(self.source.encode("utf-8")).hexdigest()[:16]
+
+    def _placeholders(self) -> List[str]:
+        """List the placeholders of the template, rejecting invalid ones."""
+        names = []
+        for match in self.template.pattern.finditer(self.source):
+            if match.group("invalid") is not None:
+                line = self.source.count("\n", 0, match.start()) + 1
+                raise PromptError(f"Template '{self.name}': invalid placeholder on line {line} (use $$ for a literal $)")
+            name = match.group("named") or match.group("braced")
+            if name and name not in names:
+                names.append(name)
+        unknown = [name for name in names if name not in TEMPLATE_VARIABLES]
+        if unknown:
+            raise PromptError(f"Template '{self.name}': unknown placeholder(s) {', '.join(unknown)}")
+        if "keyword" not in names:
+            raise PromptError(f"Template '{self.name}': the keyword placeholder is missing")
+        return names
+
+    def render(self, variables: Dict[str, str]) -> str:
+        """Fill in the template; every placeholder must have a value."""
+        missing = [name for name in self.variables if variables.get(name) is None]
+        if missing:
+            raise PromptError(f"Template '{self.name}': no value for {', '.join(missing)}")
+        return self.template.substitute(variables)
+
+class PromptEngine:
+    """Renders prompts for a batch of keywords from precompiled templates."""
+
+    def __init__(self, templates_dir: Path, metadata_path: Optional[Path] = None):
+        """
+        Load and compile every template and the keyword metadata.
+
+        Args:
+            templates_dir (Path): Folder with one <category>.txt template per category;
+                prompt_template.txt is used for keywords without a category
+            metadata_path (Path, optional): CSV with a keyword column and any of
+                category, region, word_count_min, word_count_max, audience and
+                internal_links (links separated by |); a row with keyword "*"
+                sets defaults
+
+        Raises:
+            PromptError: If a template is invalid or the default template is missing
+        """
+        self.templates: Dict[str, CompiledTemplate] = {}
+        for path in sorted(templates_dir.glob("*.txt")):
+            self.templates[path.stem] = CompiledTemplate(path.stem, path.read_text(encoding="utf-8"))
+        if DEFAULT_TEMPLATE not in self.templates:
+            raise PromptError(f"Default template {templates_dir / (DEFAULT_TEMPLATE + '.txt')} not found")
+
+        self.defaults = {name: value for name, value in TEMPLATE_VARIABLES.items() if value is not None}
+        self.metadata: Dict[str, Dict[str, str]] = {}
+        if metadata_path and metadata_path.exists():
+            self._load_metadata(metadata_path)
+
+    def _load_metadata(self, metadata_path: Path):
+        """Read per-keyword variables from the metadata CSV."""
+        with open(metadata_path, "r", encoding="utf-8", newline="") as f:
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                keyword = (row.pop("keyword", None) or "").strip()
+                if not keyword:
+                    console.print(f"[yellow]{metadata_path}:{line_number}: row without keyword skipped[/yellow]")
+                    continue
+                values = {}
+                for name, value in row.items():
+                    if name not in TEMPLATE_VARIABLES or name == "keyword":
+                        raise PromptError(f"{metadata_path}: unknown column '{name}'")
+                    if value and value.strip():
+                        values[name] = value.strip()
+                if "internal_links" in values:
+                    links = [link.strip() for link in values["internal_links"].split("|") if link.strip()]
+                    values["internal_links"] = "\n".join(f"• {link}" for link in links)
+                if keyword == DEFAULTS_ROW:
+                    self.defaults.update(values)
+                else:
+                    self.metadata[normalize_keyword(keyword)] = values
+
+    def variables_for(self, keyword: str) -> Dict[str, str]:
+        """Collect the template variables of a keyword (defaults, then its metadata row)."""
+        variables = dict(self.defaults)
+        variables.update(self.metadata.get(normalize_keyword(keyword), {}))
+        variables["keyword"] = keyword
+        return variables
+
+    def template_for(self, variables: Dict[str, str]) -> CompiledTemplate:
+        """Pick the template of the keyword's category, falling back to the default template."""
+        return self.templates.get(variables.get("category") or DEFAULT_TEMPLATE, self.templates[DEFAULT_TEMPLATE])
+
+    def render(self, keyword: str) -> RenderedPrompt:
+        """
+        Render the prompt for one keyword.
+
+        Raises:
+            PromptError: If the template needs a variable the keyword has no value for
+        """
+        variables = self.variables_for(keyword)
+        template = self.template_for(variables)
+        return RenderedPrompt(keyword, template.render(variables), template.name, template.hash)
+
+    def render_batch(self, keywords: Iterable[str]) -> Tuple[Dict[str, RenderedPrompt], Dict[str, str]]:
+        """
+        Render the prompts of a whole batch before any generation starts.
+
+        Args:
+            keywords (Iterable[str]): Keywords of the batch
+
+        Returns:
+            Tuple: Prompts by keyword, and error messages by keyword for
+            keywords whose prompt could not be rendered
+        """
+        prompts, errors = {}, {}
+        for keyword in keywords:
+            try:
+                prompts[keyword] = self.render(keyword)
+            except PromptError as e:
+                errors[keyword] = str(e)
+        return prompts, errors
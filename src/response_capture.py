@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Network-level capture of Claude's completion stream for the BlogAutomation2 project.
+Rebuilds the markdown of a response from the server-sent events of the
+completion request, without reading the DOM or the clipboard.
+"""
+import asyncio
+import json
+import re
+from typing import Callable, Optional
+from rich.console import Console
+
+console = Console()
+
+# Streaming endpoints used by the chat UI for new and retried answers
+COMPLETION_URL_PATTERN = re.compile(r"/chat_conversations/[^/]+/(retry_)?completion")
+
+def parse_completion_stream(body: str) -> str:
+    """
+    Rebuild the response text from a server-sent event stream.
+
+    Handles both the message-style events (content_block_delta with text
+    deltas) and the older single-field "completion" events.
+
+    Args:
+        body (str): Raw text/event-stream body of the completion request
+
+    Returns:
+        str: Concatenated text deltas in stream order
+    """
+    parts = []
+    for line in body.splitlines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        try:
+            event = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+
+        event_type = event.get("type")
+        if event_type == "content_block_delta":
+            delta = event.get("delta") or {}
+            if delta.get("type") in (None, "text_delta") and "text" in delta:
+                parts.append(delta["text"])
+        elif event_type == "completion" and event.get("completion"):
+            parts.append(event["completion"])
+    return "".join(parts)
+
+class CompletionStreamCapture:
+    """Listens to a page's completion requests and keeps the last streamed answer."""
+
+    def __init__(self, on_complete: Optional[Callable[[str], None]] = None):
+        """
+        Initialize the capture.
+
+        Args:
+            on_complete (Callable, optional): Called with the text when a stream closes
+        """
+        self.on_complete = on_complete
+        self.page = None
+        self.text: Optional[str] = None
+        self.armed = False
+        self.completed = asyncio.Event()
+        self._tasks = set()
+
+    def attach(self, page):
+        """Start listening to responses of the given page."""
+        self.page = page
+        page.on("response", self._on_response)
+
+    def detach(self):
+        """Stop listening and cancel any stream that is still being read."""
+        if self.page:
+            try:
+                self.page.remove_listener("response", self._on_response)
+            except Exception:
+                pass
+        for task in list(self._tasks):
+            task.cancel()
+        self.page = None
+
+    def arm(self):
+        """Forget the previous answer before a new prompt is submitted."""
+        self.text = None
+        self.armed = True
+        self.completed.clear()
+
+    def disarm(self):
+        """Stop expecting a stream, e.g. when reopening a finished conversation."""
+        self.text = None
+        self.armed = False
+        self.completed.clear()
+
+    def _on_response(self, response):
+        """Pick out completion requests and read their stream in the background."""
+        if response.request.method != "POST" or not COMPLETION_URL_PATTERN.search(response.url):
+            return
+        task = asyncio.ensure_future(self._read_stream(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _read_stream(self, response):
+        """Wait for the stream to close and rebuild the markdown from its events."""
+        try:
+            # Resolves when the server closes the event stream, i.e. generation ended
+            body = await response.text()
+        except Exception as e:
+            console.print(f"[yellow]Could not read completion stream: {str(e)}[/yellow]")
+            return
+
+        text = parse_completion_stream(body)
+        if not text.strip():
+            return
+        self.text = text
+        self.completed.set()
+        console.print(f"[green]Captured {len(text)} characters from the completion stream[/green]")
+        if self.on_complete:
+            self.on_complete(text)
+
+    async def wait(self, timeout: float) -> Optional[str]:
+        """
+        Wait for a captured answer.
+
+        Args:
+            timeout (float): Seconds to wait
+
+        Returns:
+            str: The captured markdown, or None if no stream closed in time
+        """
+        try:
+            await asyncio.wait_for(self.completed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.text
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Screenshot service for the BlogAutomation2 project.
+Captures debug screenshots in the background at a configurable level and
+keeps a bounded history per job, so error screenshots are never overwritten.
+"""
+import asyncio
+import base64
+import re
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict
+from rich.console import Console
+
+console = Console()
+
+# off: never capture, errors: only failure screenshots, full: every step
+SCREENSHOT_LEVELS = ("off", "errors", "full")
+
+# <sequence>_<step>.jpg, with failure screenshots ending in .error.jpg
+SCREENSHOT_NAME = re.compile(r"^(\d+)_.+\.jpg$")
+ERROR_SUFFIX = ".error.jpg"
+
+class ScreenshotService:
+    """Takes screenshots without blocking the automation flow."""
+
+    def __init__(self, screenshot_dir: Path, level: str = "errors", ring_size: int = 10, quality: int = 60,
+                 scale: float = 0.5):
+        """
+        Initialize the service.
+
+        Args:
+            screenshot_dir (Path): Root folder; each job gets its own subfolder
+            level (str): One of SCREENSHOT_LEVELS
+            ring_size (int): Step screenshots kept per job; older ones are deleted
+            quality (int): JPEG quality (0-100)
+            scale (float): Size of the image relative to the viewport in CSS pixels
+        """
+        if level not in SCREENSHOT_LEVELS:
+            raise ValueError(f"Unknown screenshot level '{level}', expected one of {SCREENSHOT_LEVELS}")
+        self.screenshot_dir = screenshot_dir
+        self.level = level
+        self.ring_size = ring_size
+        self.quality = quality
+        self.scale = scale
+        self._rings: Dict[str, Deque[Path]] = {}
+        self._counters: Dict[str, int] = {}
+        self._pending = set()
+
+    def _job_dir_name(self, job: str) -> str:
+        """Turn a job name (e.g. a keyword) into a safe folder name."""
+        return re.sub(r"[^\w-]+", "_", job).strip("_").lower() or "job"
+
+    def _resume_job(self, job: str, job_dir: Path):
+        """Continue the numbering and step history after the files earlier runs left in the folder."""
+        sequence = 0
+        steps = []
+        try:
+            for entry in job_dir.iterdir():
+                match = SCREENSHOT_NAME.match(entry.name)
+                if not match:
+                    continue
+                number = int(match.group(1))
+                sequence = max(sequence, number)
+                if not entry.name.endswith(ERROR_SUFFIX):
+                    steps.append((number, entry))
+        except FileNotFoundError:
+            pass
+        self._counters[job] = sequence
+        self._rings[job] = deque(path for _, path in sorted(steps))
+
+    def capture(self, page, name: str, job: str, error: bool = False):
+        """
+        Schedule a screenshot of the page without waiting for it.
+
+        Args:
+            page: Playwright page to capture
+            name (str): Step name used in the file name
+            job (str): Job the screenshot belongs to
+            error (bool): Failure screenshots are kept even at level "errors"
+                and are never evicted from the job history
+        """
+        if self.level == "off" or (self.level == "errors" and not error):
+            return
+        if page is None or page.is_closed():
+            return
+
+        job_dir = self.screenshot_dir / self._job_dir_name(job)
+        if job not in self._counters:
+            self._resume_job(job, job_dir)
+        sequence = self._counters[job] + 1
+        self._counters[job] = sequence
+        path = job_dir / f"{sequence:04d}_{name}{ERROR_SUFFIX if error else '.jpg'}"
+
+        task = asyncio.ensure_future(self._write(page, path, job, error))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _capture_scaled(self, page, path: Path) -> bool:
+        """
+        Capture the viewport downscaled by Chromium before JPEG encoding.
+
+        Page.captureScreenshot with a scaled clip renders the image at the
+        smaller size, so even on a DPR-1 server it has self.scale of the
+        viewport's width and height.
+
+        Returns:
+            bool: False if the page is not Chromium or the capture failed
+        """
+        session = None
+        try:
+            session = await page.context.new_cdp_session(page)
+            # The clip is in page coordinates, so the visible area starts at the scroll offset
+            x, y, width, height = await page.evaluate(
+                "() => [window.scrollX, window.scrollY, window.innerWidth, window.innerHeight]"
+            )
+            result = await session.send("Page.captureScreenshot", {
+                "format": "jpeg",
+                "quality": self.quality,
+                "clip": {"x": x, "y": y, "width": width, "height": height, "scale": self.scale},
+            })
+            path.write_bytes(base64.b64decode(result["data"]))
+            return True
+        except Exception:
+            return False
+        finally:
+            if session:
+                try:
+                    await session.detach()
+                except Exception:
+                    pass
+
+    async def _write(self, page, path: Path, job: str, error: bool):
+        """Capture a compressed, downscaled screenshot and rotate the job history."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if not await self._capture_scaled(page, path):
+                # Without CDP the image is only reduced to CSS pixels, which is full size at DPR 1
+                await page.screenshot(path=str(path), type="jpeg", quality=self.quality, scale="css")
+        except Exception as e:
+            console.print(f"[yellow]Could not save screenshot: {str(e)}[/yellow]")
+            return
+
+        if error:
+            console.print(f"[green]Saved error screenshot to {path}[/green]")
+            return
+
+        ring = self._rings.setdefault(job, deque())
+        ring.append(path)
+        while len(ring) > self.ring_size:
+            evicted = ring.popleft()
+            try:
+                evicted.unlink()
+            except OSError:
+                pass
+
+    async def flush(self):
+        """Wait until all scheduled screenshots have been written."""
+        if self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Selector resolution cache for the BlogAutomation2 project.
+Remembers which selector matched each Claude UI element, so later lookups
+take one query instead of probing the whole candidate list.
+"""
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Candidate selectors for each UI element, in probing order. XPath
+# expressions start with '//' and are prefixed for Playwright when queried.
+SELECTOR_CANDIDATES: Dict[str, List[str]] = {
+    "input": [
+        "textarea",
+        "div[contenteditable='true']",
+        "//textarea",
+        "//div[@contenteditable='true']",
+        "div[role='textbox']",
+        "//div[@role='textbox']",
+        "[aria-label*='Message']",
+    ],
+    "response": [
+        '.message.assistant',  # Common Claude response container
+        '.claude-response',
+        '.message-container.assistant',
+        '.message-content.assistant',
+        '.prose',  # Often contains the formatted text
+        '[data-message-author-role="assistant"]',  # Role-based selector
+        '[role="region"][aria-label*="message"]',  # Accessibility-based selector
+        '.anthropic-message',  # Anthropic specific class
+        '.assistant-message',
+    ],
+    "download_button": [
+        'button[aria-label*="Download"]',
+        'button[data-testid*="download"]',
+        'xpath=/html/body/div[2]/div[2]/div/div[3]/div/div[2]/div[1]/div[1]/div[2]/div/button[2]',
+    ],
+    "copy_button": [
+        'button[data-testid="action-bar-copy"]',
+        'button[aria-label*="Copy"]',
+        'button:has-text("Copy")',
+    ],
+}
+
+def to_playwright_selector(selector: str) -> str:
+    """Prefix bare XPath expressions so Playwright treats them as XPath."""
+    if selector.startswith('//'):
+        return f"xpath={selector}"
+    return selector
+
+class SelectorResolver:
+    """Resolves named UI elements using a learned, persisted selector cache."""
+
+    def __init__(self, cache_path: Path, candidates: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize the resolver and load selectors learned in earlier runs.
+
+        Args:
+            cache_path (Path): JSON file that stores the learned selectors
+            candidates (dict, optional): Candidate selectors per element name
+        """
+        self.cache_path = cache_path
+        self.candidates = candidates or SELECTOR_CANDIDATES
+        self.cache: Dict[str, str] = self._load()
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self.probes: Dict[str, int] = defaultdict(int)
+
+    def _load(self) -> Dict[str, str]:
+        """Read the learned selectors, ignoring ones that are no longer candidates."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return {
+            name: selector for name, selector in cached.items()
+            if selector in self.candidates.get(name, [])
+        }
+
+    def _save(self):
+        """Persist the learned selectors for the next run."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f, indent=2)
+        except OSError as e:
+            console.print(f"[yellow]Could not save selector cache: {str(e)}[/yellow]")
+
+    def current(self, name: str) -> Optional[str]:
+        """Return the selector currently learned for an element, if any."""
+        return self.cache.get(name)
+
+    def learn(self, name: str, selector: str):
+        """Record a selector that matched outside query(), e.g. in an in-page helper."""
+        if selector not in self.candidates.get(name, []):
+            return
+        if self.cache.get(name) == selector:
+            self.hits[name] += 1
+            return
+        self.misses[name] += 1
+        self.cache[name] = selector
+        self._save()
+
+    def forget(self, name: str):
+        """Drop a learned selector, e.g. when it matched the wrong element."""
+        if self.cache.pop(name, None) is not None:
+            self._save()
+
+    async def _query(self, page, selector: str, find_all: bool):
+        """Run a single query, treating invalid selectors as no match."""
+        try:
+            if find_all:
+                return await page.query_selector_all(to_playwright_selector(selector))
+            return await page.query_selector(to_playwright_selector(selector))
+        except Exception:
+            return [] if find_all else None
+
+    async def _resolve(self, page, name: str, find_all: bool):
+        """Try the learned selector first, then probe the candidates in order."""
+        cached = self.cache.get(name)
+        if cached:
+            self.probes[name] += 1
+            result = await self._query(page, cached, find_all)
+            if result:
+                self.hits[name] += 1
+                return result
+        self.misses[name] += 1
+
+        for selector in self.candidates[name]:
+            if selector == cached:
+                continue
+            self.probes[name] += 1
+            result = await self._query(page, selector, find_all)
+            if result:
+                self.cache[name] = selector
+                self._save()
+                return result
+        return [] if find_all else None
+
+    async def query(self, page, name: str):
+        """
+        Find the first element for a named UI element.
+
+        Args:
+            page: Playwright page to search
+            name (str): Element name, e.g. "input"
+
+        Returns:
+            ElementHandle: The element, or None if no candidate matches
+        """
+        return await self._resolve(page, name, find_all=False)
+
+    async def query_all(self, page, name: str) -> list:
+        """Find all elements matched by the first working selector of a named UI element."""
+        return await self._resolve(page, name, find_all=True)
+
+    def print_stats(self):
+        """Print hit/miss statistics per element for this session."""
+        names = sorted(set(self.hits) | set(self.misses))
+        if not names:
+            return
+        table = Table(title="Selector cache")
+        table.add_column("Element")
+        table.add_column("Hits", justify="right")
+        table.add_column("Misses", justify="right")
+        table.add_column("Queries", justify="right")
+        table.add_column("Selector")
+        for name in names:
+            table.add_row(
+                name, str(self.hits[name]), str(self.misses[name]),
+                str(self.probes[name]), self.cache.get(name, "-")
+            )
+        console.print(table)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Tracing for the BlogAutomation2 project.
+Records timed spans of the browser, file and pipeline work, writes them to a
+JSONL file with one summary record per keyword, and exports rolling p50/p95
+figures as a Prometheus textfile.
+"""
+import functools
+import inspect
+import itertools
+import json
+import math
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Deque, Dict, Optional
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Keyword and innermost span of the code that is running; asyncio tasks each get their own copy
+_current_job: ContextVar[Optional[str]] = ContextVar("current_job", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("current_span", default=None)
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of a sequence of numbers."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+class Tracer:
+    """Collects spans and exports them; does nothing until configured."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize a disabled tracer.
+
+        Args:
+            window (int): Number of recent durations per span used for p50/p95
+        """
+        self.enabled = False
+        self.jsonl_path: Optional[Path] = None
+        self.prometheus_path: Optional[Path] = None
+        self.window = window
+        self._jsonl = None
+        self._ids = itertools.count(1)
+        self.recent: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self.totals: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.job_results: Dict[str, int] = defaultdict(int)
+        self._job_phases: Dict[str, Dict[str, float]] = {}
+        self._failed_jobs = set()
+
+    def configure(self, trace_dir: Path):
+        """
+        Start writing traces to trace_dir/spans.jsonl and trace_dir/blog_automation.prom.
+
+        Args:
+            trace_dir (Path): Output folder (e.g. a node_exporter textfile directory)
+        """
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        self.jsonl_path = trace_dir / "spans.jsonl"
+        self.prometheus_path = trace_dir / "blog_automation.prom"
+        self._jsonl = open(self.jsonl_path, "a", encoding="utf-8")
+        self.enabled = True
+        console.print(f"[green]Tracing to {trace_dir}[/green]")
+
+    def _write(self, record: dict):
+        """Append one record to the JSONL file."""
+        if self._jsonl:
+            self._jsonl.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._jsonl.flush()
+
+    def record(self, name: str, seconds: float, start: Optional[float] = None, status: str = "ok", **attributes):
+        """
+        Record a span whose duration was measured elsewhere (e.g. time to first token).
+
+        Args:
+            name (str): Span name
+            seconds (float): Duration
+            start (float, optional): Start timestamp (default: now minus the duration)
+            status (str): "ok" or "error"
+            **attributes: Extra fields for the JSONL record
+        """
+        if not self.enabled:
+            return
+        job = _current_job.get()
+        self.recent[name].append(seconds)
+        self.totals[name] += seconds
+        self.counts[name] += 1
+        if status != "ok":
+            self.errors[name] += 1
+        if job in self._job_phases:
+            phases = self._job_phases[job]
+            phases[name] = phases.get(name, 0.0) + seconds
+        self._write({
+            "type": "span",
+            "name": name,
+            "keyword": job,
+            "start": start if start is not None else time.time() - seconds,
+            "seconds": round(seconds, 6),
+            "status": status,
+            "parent": _current_span.get(),
+            **attributes,
+        })
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Time a block of work as a span nested in the current one.
+
+        Args:
+            name (str): Span name (e.g. "generation")
+            **attributes: Extra fields for the JSONL record
+        """
+        if not self.enabled:
+            yield
+            return
+        span_id = next(self._ids)
+        token = _current_span.set(span_id)
+        start = time.time()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.record(name, time.time() - start, start=start, status=status, id=span_id, **attributes)
+
+    @contextmanager
+    def job(self, keyword: str):
+        """
+        Attribute the spans of a block to a keyword and write a per-keyword summary.
+
+        Raising out of the block, or calling fail_job(), marks the keyword as failed.
+        """
+        if not self.enabled:
+            yield
+            return
+        token = _current_job.set(keyword)
+        self._job_phases[keyword] = {}
+        start = time.time()
+        status = "ok"
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            _current_job.reset(token)
+            phases = self._job_phases.pop(keyword, {})
+            if keyword in self._failed_jobs:
+                self._failed_jobs.discard(keyword)
+                status = "error"
+            self.job_results[status] += 1
+            self._write({
+                "type": "job",
+                "keyword": keyword,
+                "start": start,
+                "seconds": round(time.time() - start, 6),
+                "status": status,
+                "phases": {name: round(seconds, 6) for name, seconds in phases.items()},
+            })
+            self.write_prometheus()
+
+    def fail_job(self):
+        """Mark the keyword of the running job as failed without raising."""
+        job = _current_job.get()
+        if self.enabled and job in self._job_phases:
+            self._failed_jobs.add(job)
+
+    @contextmanager
+    def keyword(self, keyword: str):
+        """Attribute spans to a keyword outside its job block (e.g. in the render pipeline)."""
+        token = _current_job.set(keyword)
+        try:
+            yield
+        finally:
+            _current_job.reset(token)
+
+    def write_prometheus(self):
+        """Export span counts, totals and rolling p50/p95 as a Prometheus textfile."""
+        if not self.prometheus_path:
+            return
+        lines = [
+            "# HELP blog_automation_span_seconds Duration of traced work (rolling quantiles).",
+            "# TYPE blog_automation_span_seconds summary",
+        ]
+        for name in sorted(self.counts):
+            for quantile in (0.5, 0.95):
+                value = percentile(self.recent[name], quantile)
+                lines.append(f'blog_automation_span_seconds{{span="{name}",quantile="{quantile}"}} {value:.6f}')
+            lines.append(f'blog_automation_span_seconds_sum{{span="{name}"}} {self.totals[name]:.6f}')
+            lines.append(f'blog_automation_span_seconds_count{{span="{name}"}} {self.counts[name]}')
+        lines += [
+            "# HELP blog_automation_span_errors_total Traced work that raised.",
+            "# TYPE blog_automation_span_errors_total counter",
+        ]
+        for name in sorted(self.errors):
+            lines.append(f'blog_automation_span_errors_total{{span="{name}"}} {self.errors[name]}')
+        lines += [
+            "# HELP blog_automation_jobs_total Keywords processed, by outcome.",
+            "# TYPE blog_automation_jobs_total counter",
+        ]
+        for status in sorted(self.job_results):
+            lines.append(f'blog_automation_jobs_total{{status="{status}"}} {self.job_results[status]}')
+
+        # node_exporter may read the file at any time, so replace it atomically
+        tmp_path = self.prometheus_path.with_name(f"{self.prometheus_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(tmp_path, self.prometheus_path)
+
+    def print_summary(self):
+        """Print rolling p50/p95 per span."""
+        if not self.enabled or not self.counts:
+            return
+        table = Table(title=f"Span timings (last {self.window} per span)")
+        table.add_column("Span")
+        table.add_column("Count", justify="right")
+        table.add_column("p50 (s)", justify="right")
+        table.add_column("p95 (s)", justify="right")
+        table.add_column("Total (s)", justify="right")
+        for name in sorted(self.counts, key=lambda span: -self.totals[span]):
+            table.add_row(
+                name, str(self.counts[name]), f"{percentile(self.recent[name], 0.5):.2f}",
+                f"{percentile(self.recent[name], 0.95):.2f}", f"{self.totals[name]:.1f}",
+            )
+        console.print(table)
+
+    def close(self):
+        """Write the final Prometheus file and close the JSONL file."""
+        if not self.enabled:
+            return
+        self.write_prometheus()
+        if self._jsonl:
+            self._jsonl.close()
+            self._jsonl = None
+        self.enabled = False
+
+# Process-wide tracer used by the instrumented classes
+tracer = Tracer()
+
+def _wrap(function, name: str):
+    """Wrap a sync or async function in a tracer span."""
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def traced_async(*args, **kwargs):
+            if not tracer.enabled:
+                return await function(*args, **kwargs)
+            with tracer.span(name):
+                return await function(*args, **kwargs)
+        return traced_async
+
+    @functools.wraps(function)
+    def traced_sync(*args, **kwargs):
+        if not tracer.enabled:
+            return function(*args, **kwargs)
+        with tracer.span(name):
+            return function(*args, **kwargs)
+    return traced_sync
+
+def traced_methods(span_names: Optional[Dict[str, str]] = None):
+    """
+    Class decorator that traces every public method, plus the private ones named in span_names.
+
+    Args:
+        span_names (dict, optional): Method name -> span name for the phases that
+            get a short name (e.g. {"start": "browser_launch"}); other methods are
+            traced as "ClassName.method"
+    """
+    span_names = span_names or {}
+
+    def decorate(cls):
+        for attribute, value in list(vars(cls).items()):
+            if not inspect.isfunction(value) or attribute == "__init__":
+                continue
+            if attribute.startswith("_") and attribute not in span_names:
+                continue
+            setattr(cls, attribute, _wrap(value, span_names.get(attribute, f"{cls.__name__}.{attribute}")))
+        return cls
+    return decorate
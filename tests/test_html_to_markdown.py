@@ -0,0 +1,81 @@
+"""Tests for the offline HTML-to-Markdown converter."""
+import markdown
+import pytest
+
+from html_to_markdown import html_to_markdown
+
+def convert(html):
+    return html_to_markdown(html, scoped=False)
+
+def test_headings_paragraphs_and_inline_marks():
+    html = ("<h2>Title <em>now</em></h2><p>Some <strong> bold </strong>text<br>and a "
+            "<a href='/link'>link</a></p><hr><blockquote><p>one</p><p>two</p></blockquote>")
+
+    assert convert(html) == (
+        "## Title *now*\n\nSome **bold** text  \nand a [link](/link)\n\n---\n\n> one\n>\n> two\n"
+    )
+
+def test_nested_and_ordered_lists():
+    html = ("<ul><li>one</li><li>two<ul><li>nested</li></ul></li></ul>"
+            "<ol start='3'><li>third</li><li>fourth</li></ol>")
+
+    assert convert(html) == "- one\n- two\n  - nested\n\n3. third\n4. fourth\n"
+
+def test_loose_list_keeps_blank_lines_between_items():
+    html = "<ol><li><p>first</p><p>more</p></li><li><p>second</p></li></ol>"
+
+    assert convert(html) == "1. first\n\n   more\n\n2. second\n"
+
+def test_table_with_alignment_escaped_pipes_and_short_rows():
+    html = ("<table><thead><tr><th>Name</th><th style='text-align: right'>Preis</th></tr></thead>"
+            "<tbody><tr><td>a|b</td><td><b>2</b></td></tr><tr><td>c</td></tr></tbody></table>")
+
+    assert convert(html) == "| Name | Preis |\n| --- | ---: |\n| a\\|b | **2** |\n| c |  |\n"
+
+def test_code_blocks_and_inline_code_keep_their_text():
+    html = ("<pre><code class='language-python'>print('```')\nx = a * b_c\n</code></pre>"
+            "<p>Use <code>a`b</code>, <code>`x</code> and <code>*raw*</code></p>")
+
+    assert convert(html) == (
+        "````python\nprint('```')\nx = a * b_c\n````\n\nUse ``a`b``, `` `x `` and `*raw*`\n"
+    )
+
+def test_literal_markdown_characters_are_escaped():
+    html = r"<p>a *star* [x] snake_case \ `tick`</p>"
+
+    assert convert(html) == "a \\*star\\* \\[x\\] snake\\_case \\\\ \\`tick\\`\n"
+
+@pytest.mark.parametrize("text, expected", [
+    ("# not a heading", "\\# not a heading"),
+    ("- not a list", "\\- not a list"),
+    ("+ not a list", "\\+ not a list"),
+    ("2024. Jahr", "2024\\. Jahr"),
+    ("> not a quote", "\\> not a quote"),
+    ("---", "\\---"),
+    ("Haus - Wohnung", "Haus - Wohnung"),
+    ("#1 Tipp", "#1 Tipp"),
+])
+def test_text_that_looks_like_a_block_is_escaped(text, expected):
+    assert convert(f"<p>{text}</p>") == expected + "\n"
+
+def test_headings_and_table_cells_keep_numbering_unescaped():
+    assert convert("<h2>1. Einleitung</h2>") == "## 1. Einleitung\n"
+    assert convert("<table><tr><th>1. Rang</th></tr></table>") == "| 1. Rang |\n| --- |\n"
+
+def test_escaped_text_renders_back_to_the_same_text():
+    html = "<p>a *star* [x](y) snake_case `tick`</p><p># hash</p><p>1. one</p><p>- dash</p>"
+
+    rendered = markdown.markdown(convert(html))
+    assert rendered == ("<p>a *star* [x](y) snake_case `tick`</p>\n<p># hash</p>\n"
+                        "<p>1. one</p>\n<p>- dash</p>")
+
+def test_scoped_conversion_picks_the_newest_answer():
+    html = ("<div data-message-author-role='user'><p>question</p></div>"
+            "<div data-message-author-role='assistant'><div class='prose'><p>old</p></div></div>"
+            "<div data-is-streaming='false'><div class='font-claude-message'><p>new</p>"
+            "<button>Copy</button></div></div>")
+
+    assert html_to_markdown(html) == "new\n"
+
+def test_snapshot_without_an_answer_is_empty():
+    assert html_to_markdown("<html><body><p>no answer</p></body></html>") == ""
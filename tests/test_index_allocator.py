@@ -0,0 +1,55 @@
+"""Tests for the output index allocator, including allocation from several processes."""
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from index_allocator import IndexAllocator
+
+def allocate_many(root, suffix, count):
+    """Allocate `count` folders in a separate process and return their indices."""
+    allocator = IndexAllocator(root)
+    return [allocator.allocate(f"{suffix}_{n}")[0] for n in range(count)]
+
+def test_counter_is_seeded_from_existing_folders(tmp_path):
+    for name in ("3_haus_kaufen", "12_grundsteuer", "notes", "7_file.txt"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "40_not_a_folder").write_text("", encoding="utf-8")
+    allocator = IndexAllocator(tmp_path)
+
+    assert allocator.peek() == 13
+    index, path = allocator.allocate("wohnung_mieten")
+    assert (index, path) == (13, tmp_path / "13_wohnung_mieten")
+    assert path.is_dir()
+    assert allocator.allocate("wohnung_mieten")[0] == 14
+
+def test_existing_folder_with_the_same_name_is_skipped(tmp_path):
+    allocator = IndexAllocator(tmp_path)
+    allocator.allocate("a")
+    (tmp_path / "2_b").mkdir()
+
+    assert allocator.allocate("b") == (3, tmp_path / "3_b")
+
+def test_corrupt_counter_is_reseeded(tmp_path):
+    allocator = IndexAllocator(tmp_path)
+    allocator.allocate("a")
+    allocator.counter_path.write_text("garbage", encoding="utf-8")
+
+    assert allocator.allocate("b")[0] == 2
+
+def test_concurrent_threads_get_unique_indices(tmp_path):
+    def allocate(n):
+        return IndexAllocator(tmp_path).allocate(f"thread_{n}")[0]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        indices = list(pool.map(allocate, range(64)))
+
+    assert sorted(indices) == list(range(1, 65))
+
+def test_concurrent_processes_get_unique_indices(tmp_path):
+    workers, per_worker = 4, 25
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = pool.starmap(allocate_many, [(tmp_path, f"p{n}", per_worker) for n in range(workers)])
+
+    indices = [index for result in results for index in result]
+    assert sorted(indices) == list(range(1, workers * per_worker + 1))
+    assert len(list(tmp_path.glob("*_p*"))) == workers * per_worker
+    assert IndexAllocator(tmp_path).peek() == workers * per_worker + 1
@@ -0,0 +1,160 @@
+"""Tests for the SQLite job store: leases, reclaiming, backoff and state transitions."""
+from types import SimpleNamespace
+
+import pytest
+
+import job_store
+from job_store import JobStore, LeaseLostError
+from keyword_manager import normalize_keyword
+
+LEASE = 100
+BACKOFF = 10
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the job store's clock with one the test moves forward."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(job_store, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "jobs.sqlite3"
+
+def open_store(db_path, worker_id):
+    return JobStore(db_path, lease_seconds=LEASE, max_attempts=3, backoff_seconds=BACKOFF, worker_id=worker_id)
+
+@pytest.fixture
+def worker_a(db_path, clock):
+    store = open_store(db_path, "host-a:1")
+    yield store
+    store.close()
+
+@pytest.fixture
+def worker_b(db_path, clock):
+    store = open_store(db_path, "host-b:2")
+    yield store
+    store.close()
+
+def test_lease_takes_highest_priority_first_and_never_twice(worker_a, worker_b):
+    worker_a.enqueue(["low"], normalize_keyword)
+    worker_a.enqueue(["high"], normalize_keyword, priority=5)
+
+    assert [job["keyword"] for job in worker_a.lease(1)] == ["high"]
+    assert [job["keyword"] for job in worker_b.lease(None)] == ["low"]
+    assert worker_a.lease(None) == []
+
+def test_lease_skips_excluded_keys(worker_a):
+    worker_a.enqueue(["one", "two"], normalize_keyword)
+
+    assert [job["keyword"] for job in worker_a.lease(None, exclude_keys=["one"])] == ["two"]
+
+def test_expired_lease_is_reclaimed_after_backoff(worker_a, worker_b, clock):
+    worker_a.enqueue(["haus kaufen"], normalize_keyword)
+    [job] = worker_a.lease()
+
+    clock.now += LEASE + 1
+    # The expired lease counts as a failed attempt and waits out the backoff
+    assert worker_b.lease() == []
+    reclaimed = worker_b.find("haus kaufen")
+    assert reclaimed["state"] == "pending"
+    assert reclaimed["attempts"] == 1
+    assert reclaimed["last_error"] == "lease expired"
+    assert reclaimed["lease_owner"] is None
+
+    clock.now += BACKOFF
+    [job_b] = worker_b.lease()
+    assert job_b["id"] == job["id"]
+    assert job_b["lease_owner"] == "host-b:2"
+
+def test_reclaimed_job_rejects_updates_from_the_old_owner(worker_a, worker_b, clock):
+    worker_a.enqueue(["haus kaufen"], normalize_keyword)
+    [job] = worker_a.lease()
+    clock.now += LEASE + 1
+    worker_b.lease()
+    clock.now += BACKOFF
+    assert len(worker_b.lease()) == 1
+
+    assert worker_a.renew([job["id"]]) == []
+    for update in (lambda: worker_a.set_state(job["id"], "downloaded"),
+                   lambda: worker_a.set_template(job["id"], "abc"),
+                   lambda: worker_a.fail(job["id"], "boom"),
+                   lambda: worker_a.complete(job["id"])):
+        with pytest.raises(LeaseLostError):
+            update()
+
+    # The new owner's job is untouched by the failed updates
+    current = worker_b.find("haus kaufen")
+    assert current["state"] == "leased"
+    assert current["attempts"] == 1
+    worker_b.complete(job["id"])
+    assert worker_b.find("haus kaufen")["state"] == "done"
+
+def test_renewed_lease_is_not_reclaimed(worker_a, worker_b, clock):
+    worker_a.enqueue(["one", "two"], normalize_keyword)
+    jobs = worker_a.lease(None)
+
+    for _ in range(3):
+        clock.now += LEASE * 0.6
+        assert sorted(worker_a.renew(job["id"] for job in jobs)) == sorted(job["id"] for job in jobs)
+    clock.now += BACKOFF
+    assert worker_b.lease(None) == []
+
+def test_failures_back_off_exponentially_then_fail(worker_a, clock):
+    worker_a.enqueue(["haus kaufen"], normalize_keyword)
+
+    for attempt, delay in ((1, BACKOFF), (2, 2 * BACKOFF)):
+        [job] = worker_a.lease()
+        worker_a.fail(job["id"], f"error {attempt}")
+        current = worker_a.find("haus kaufen")
+        assert (current["state"], current["attempts"]) == ("pending", attempt)
+        assert current["available_at"] == clock.now + delay
+        clock.now += delay - 1
+        assert worker_a.lease() == []
+        clock.now += 1
+
+    [job] = worker_a.lease()
+    worker_a.fail(job["id"], "error 3")
+    current = worker_a.find("haus kaufen")
+    assert (current["state"], current["attempts"], current["last_error"]) == ("failed", 3, "error 3")
+    clock.now += 10 * BACKOFF
+    assert worker_a.lease() == []
+
+def test_state_transitions_renew_and_release_the_lease(worker_a, clock):
+    worker_a.enqueue(["haus kaufen"], normalize_keyword)
+    [job] = worker_a.lease()
+
+    for state in ("generating", "downloaded", "rendered"):
+        clock.now += 1
+        worker_a.set_state(job["id"], state)
+        current = worker_a.find("haus kaufen")
+        assert current["state"] == state
+        assert current["lease_expires"] == clock.now + LEASE
+
+    worker_a.complete(job["id"])
+    current = worker_a.find("haus kaufen")
+    assert current["state"] == "done"
+    assert current["lease_owner"] is None and current["lease_expires"] is None
+    assert worker_a.counts() == {"done": 1}
+
+    with pytest.raises(ValueError):
+        worker_a.set_state(job["id"], "paused")
+
+def test_claim_respects_live_leases_and_finished_jobs(worker_a, worker_b, clock):
+    worker_a.enqueue(["resumed", "finished"], normalize_keyword)
+    worker_a.enqueue(["history"], normalize_keyword, state="done")
+    jobs = {job["keyword"]: job for job in worker_a.lease(None)}
+    worker_a.complete(jobs["finished"]["id"])
+
+    assert worker_b.claim("history") is None
+    assert worker_b.claim("finished") is None
+    assert worker_b.claim("missing") is None
+    # Held by another worker that is assumed alive until its lease expires
+    assert worker_b.claim("resumed") is None
+
+    clock.now += LEASE + 1
+    claimed = worker_b.claim("resumed")
+    assert claimed["state"] == "generating"
+    assert claimed["lease_owner"] == "host-b:2"
+    with pytest.raises(LeaseLostError):
+        worker_a.set_state(jobs["resumed"]["id"], "downloaded")
@@ -0,0 +1,107 @@
+"""Tests for the keyword manager's processed log, cursor and job store leasing."""
+import os
+
+import pytest
+
+from job_store import JobStore
+from keyword_manager import KeywordManager, normalize_keyword
+
+@pytest.fixture
+def keywords_file(tmp_path):
+    path = tmp_path / "keywords.txt"
+    path.write_text("Haus kaufen\nWohnung mieten\nhaus  KAUFEN\nGrundsteuer\n\n", encoding="utf-8")
+    return path
+
+def processed_file(keywords_file):
+    return keywords_file.parent / "processed_keywords.txt"
+
+def test_normalize_keyword_ignores_case_whitespace_and_unicode_form():
+    assert normalize_keyword("  Haus   KAUFEN ") == "haus kaufen"
+    assert normalize_keyword("München") == normalize_keyword("München")
+
+def test_keywords_are_deduplicated_in_file_order(keywords_file):
+    manager = KeywordManager(keywords_file)
+
+    assert manager.get_keywords() == ["Haus kaufen", "Wohnung mieten", "Grundsteuer"]
+
+def test_cursor_skips_processed_keywords(keywords_file):
+    manager = KeywordManager(keywords_file)
+
+    assert manager.get_next_keyword() == "Haus kaufen"
+    manager.mark_processed("Haus kaufen")
+    assert manager.get_next_keyword() == "Wohnung mieten"
+    # Out-of-order completion is skipped once the cursor reaches it
+    manager.mark_processed("grundsteuer")
+    assert manager.get_pending_keywords() == ["Wohnung mieten"]
+    manager.mark_processed("Wohnung mieten")
+    assert manager.get_next_keyword() is None
+    assert manager.get_pending_keywords() == []
+
+def test_pending_keywords_honour_limit_and_exclude(keywords_file):
+    manager = KeywordManager(keywords_file)
+
+    assert manager.get_pending_keywords(limit=2) == ["Haus kaufen", "Wohnung mieten"]
+    assert manager.get_pending_keywords(exclude=["HAUS KAUFEN"]) == ["Wohnung mieten", "Grundsteuer"]
+
+def test_legacy_log_without_trailing_newline(keywords_file):
+    processed_file(keywords_file).write_bytes(b"Haus kaufen\nWohnung mieten")
+    manager = KeywordManager(keywords_file)
+
+    assert manager.is_processed("wohnung mieten")
+    manager.mark_processed("Grundsteuer")
+    # The new entry is not glued onto the last line
+    assert processed_file(keywords_file).read_bytes() == b"Haus kaufen\nWohnung mieten\nGrundsteuer\n"
+    assert manager.get_processed_keywords() == ["Haus kaufen", "Wohnung mieten", "Grundsteuer"]
+
+def test_incomplete_line_from_another_process_waits_for_its_newline(keywords_file):
+    manager = KeywordManager(keywords_file)
+    assert manager.get_next_keyword() == "Haus kaufen"
+
+    with open(processed_file(keywords_file), "ab") as f:
+        f.write(b"Haus kau")
+    assert not manager.is_processed("Haus kau")
+    assert not manager.is_processed("Haus kaufen")
+
+    with open(processed_file(keywords_file), "ab") as f:
+        f.write(b"fen\n")
+    assert manager.is_processed("Haus kaufen")
+    assert manager.get_next_keyword() == "Wohnung mieten"
+
+def test_truncated_log_resets_the_index_and_cursor(keywords_file):
+    manager = KeywordManager(keywords_file)
+    for keyword in ("Haus kaufen", "Wohnung mieten"):
+        manager.mark_processed(keyword)
+    assert manager.get_next_keyword() == "Grundsteuer"
+
+    processed_file(keywords_file).write_bytes(b"")
+    assert manager.get_processed_keywords() == []
+    assert manager.get_next_keyword() == "Haus kaufen"
+
+def test_changed_keywords_file_is_reloaded(keywords_file):
+    manager = KeywordManager(keywords_file)
+    manager.mark_processed("Haus kaufen")
+    assert manager.get_next_keyword() == "Wohnung mieten"
+
+    keywords_file.write_text("Haus kaufen\nBaufinanzierung\n", encoding="utf-8")
+    stat = keywords_file.stat()
+    os.utime(keywords_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert manager.get_keywords() == ["Haus kaufen", "Baufinanzierung"]
+    assert manager.get_next_keyword() == "Baufinanzierung"
+
+def test_job_store_leases_each_keyword_to_one_manager(keywords_file, tmp_path):
+    processed_file(keywords_file).write_text("Grundsteuer\n", encoding="utf-8")
+    stores = [JobStore(tmp_path / "jobs.sqlite3", worker_id=f"host:{n}") for n in (1, 2)]
+    try:
+        first, second = (KeywordManager(keywords_file, job_store=store) for store in stores)
+
+        assert first.get_pending_keywords(limit=1) == ["Haus kaufen"]
+        assert second.get_pending_keywords() == ["Wohnung mieten"]
+        assert first.holds_lease("haus kaufen") and not first.holds_lease("Wohnung mieten")
+
+        first.mark_processed("Haus kaufen")
+        assert stores[0].find("haus kaufen")["state"] == "done"
+        assert not first.holds_lease("Haus kaufen")
+        assert stores[0].counts() == {"done": 2, "leased": 1}
+    finally:
+        for store in stores:
+            store.close()